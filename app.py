@@ -1,25 +1,49 @@
 from flask import Flask, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 import base64
+import json
+import os
+import tempfile
 from io import BytesIO
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 from modules.continuous_allocation import ContinuousMemoryAllocator
+from modules.experiment_runner import AllocationExperimentRunner
 from modules.paging_segmentation import PagingSegmentation
 from modules.page_replacement import PageReplacementSimulator
 from modules.virtual_memory import VirtualMemorySimulator
+from modules.reverse_index import ReverseMapIndex
 from modules.visualizer import Visualizer
 
+class SimulatorJSONProvider(DefaultJSONProvider):
+    """Serialise lazy simulator views (to_json) and NumPy arrays (tolist) on demand"""
+    
+    @staticmethod
+    def default(o):
+        if hasattr(o, 'to_json'):
+            return o.to_json()
+        if hasattr(o, 'tolist'):
+            return o.tolist()
+        return DefaultJSONProvider.default(o)
+
 app = Flask(__name__)
+app.json = SimulatorJSONProvider(app)
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 
 # Initialize modules
 continuous_allocator = ContinuousMemoryAllocator()
+experiment_runner = AllocationExperimentRunner()
 paging_segmentation = PagingSegmentation()
 page_replacement = PageReplacementSimulator()
 virtual_memory = VirtualMemorySimulator()
 visualizer = Visualizer()
 
+# Per-page entries returned by /api/paging/simulate and /api/paging/compare
+# unless pageTableLimit asks for more; the rest are paged through
+# /api/paging/page-table
+PAGE_TABLE_SLICE = 100
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -44,12 +68,16 @@ def virtual_memory_view():
 @app.route('/api/continuous/simulate', methods=['POST'])
 def simulate_continuous():
     data = request.json
-    memory_size = data.get('memorySize', 1000)
+    # Block columns and the fragmentation histogram hold integer sizes
+    memory_size = int(data.get('memorySize', 1000))
     processes = data.get('processes', [])
     partition_type = data.get('partitionType', 'variable')
     algorithm = data.get('algorithm', 'first_fit')
+    partition_sizes = data.get('partitionSizes')
     
-    result = continuous_allocator.simulate(memory_size, processes, partition_type, algorithm)
+    result = continuous_allocator.simulate(memory_size, processes, partition_type, algorithm, partition_sizes)
+    if 'error' in result:
+        return jsonify(result), 400
     
     # Generate visualization
     fig = visualizer.plot_memory_allocation(result['memory_map'], memory_size)
@@ -66,11 +94,14 @@ def simulate_continuous():
 @app.route('/api/continuous/compare', methods=['POST'])
 def compare_continuous():
     data = request.json
-    memory_size = data.get('memorySize', 1000)
+    memory_size = int(data.get('memorySize', 1000))
     processes = data.get('processes', [])
     partition_type = data.get('partitionType', 'variable')
+    partition_sizes = data.get('partitionSizes')
     
-    results = continuous_allocator.compare_all(memory_size, processes, partition_type)
+    results = continuous_allocator.compare_all(memory_size, processes, partition_type, partition_sizes)
+    if 'error' in results:
+        return jsonify(results), 400
     
     # Generate comparison visualization
     fig = visualizer.plot_comparison_continuous(results)
@@ -85,6 +116,27 @@ def compare_continuous():
         'plot': f"data:image/png;base64,{plot_url}"
     })
 
+@app.route('/api/continuous/experiment', methods=['POST'])
+def experiment_continuous():
+    data = request.json
+    
+    result = experiment_runner.run(
+        int(data.get('memorySize', 1000)),
+        process_count=data.get('processCount', 20),
+        trials=data.get('trials', 1000),
+        distribution=data.get('distribution', 'uniform'),
+        distribution_params=data.get('distributionParams'),
+        partition_type=data.get('partitionType', 'variable'),
+        partition_sizes=data.get('partitionSizes'),
+        seed=data.get('seed', 0),
+        workers=data.get('workers'),
+        confidence=data.get('confidence', 0.95)
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    
+    return jsonify(result)
+
 # API Routes for Paging and Segmentation
 @app.route('/api/paging/simulate', methods=['POST'])
 def simulate_paging():
@@ -95,10 +147,20 @@ def simulate_paging():
     page_size = data.get('pageSize', 256)
     segments = data.get('segments', [])
     
+    page_table_limit = data.get('pageTableLimit', PAGE_TABLE_SLICE)
+    table_mode = data.get('tableMode')
+    
     if mode == 'paging':
-        result = paging_segmentation.simulate_paging(memory_size, process_size, page_size)
+        result = paging_segmentation.simulate_paging(
+            memory_size, process_size, page_size, table_mode, data.get('virtualAddressBits')
+        )
+        # page_table_ranges always describes the whole table
+        result['page_table'] = result['page_table'][:page_table_limit]
+        result['page_table_limit'] = page_table_limit
     else:
-        result = paging_segmentation.simulate_segmentation(memory_size, segments)
+        result = paging_segmentation.simulate_segmentation(
+            memory_size, segments, data.get('placement', 'first_fit'), data.get('operations')
+        )
     
     # Generate visualization
     fig = visualizer.plot_paging_segmentation(result, mode)
@@ -112,6 +174,176 @@ def simulate_paging():
     
     return jsonify(result)
 
+@app.route('/api/paging/page-table', methods=['POST'])
+def page_table_slice():
+    data = request.json
+    memory_size = data.get('memorySize', 4096)
+    process_size = data.get('processSize', 1024)
+    page_size = data.get('pageSize', 256)
+    offset = data.get('offset', 0)
+    limit = data.get('limit', 100)
+    
+    result = paging_segmentation.simulate_paging(memory_size, process_size, page_size)
+    
+    return jsonify({
+        'num_pages': result['num_pages'],
+        'offset': offset,
+        'limit': limit,
+        'page_table': result['page_table'][offset:offset + limit],
+        'page_table_ranges': result['page_table_ranges']
+    })
+
+@app.route('/api/paging/page-table-overhead', methods=['POST'])
+def page_table_overhead():
+    data = request.json
+    page_size = data.get('pageSize', 4096)
+    physical_size = data.get('physicalSize', 1 << 30)
+    regions = data.get('regions', [{'start': 0, 'size': data.get('processSize', 1024)}])
+    modes = data.get('modes', ['single', 'two_level', 'four_level', 'inverted'])
+    
+    results = {}
+    for mode in modes:
+        results[mode] = paging_segmentation.analyze_page_table(
+            mode, page_size, regions, physical_size,
+            data.get('virtualAddressBits'),
+            data.get('pteSize', 8),
+            data.get('memoryAccessTime', 100)
+        )
+    
+    return jsonify({'results': results})
+
+@app.route('/api/paging/translate-batch', methods=['POST'])
+def translate_batch():
+    data = request.json
+    mode = data.get('mode', 'paging')
+    memory_size = data.get('memorySize', 4096)
+    
+    if mode == 'paging':
+        page_size = data.get('pageSize', 256)
+        ranges = data.get('pageTableRanges')
+        if ranges is None:
+            ranges = paging_segmentation.simulate_paging(
+                memory_size, data.get('processSize', 1024), page_size
+            )['page_table_ranges']
+        result = paging_segmentation.translate_batch_paging(data.get('addresses', []), page_size, ranges)
+    else:
+        segment_table = data.get('segmentTable')
+        if segment_table is None:
+            segment_table = paging_segmentation.simulate_segmentation(
+                memory_size, data.get('segments', [])
+            )['segment_table']
+        pairs = data.get('pairs')
+        if pairs is not None:
+            segment_numbers = [pair[0] for pair in pairs]
+            offsets = [pair[1] for pair in pairs]
+        else:
+            segment_numbers = data.get('segmentNumbers', [])
+            offsets = data.get('offsets', [])
+        result = paging_segmentation.translate_batch_segmentation(segment_numbers, offsets, segment_table)
+        if 'error' in result:
+            return jsonify(result), 400
+    
+    result['mode'] = mode
+    return jsonify(result)
+
+@app.route('/api/paging/tlb', methods=['POST'])
+def simulate_tlb():
+    data = request.json
+    memory_size = data.get('memorySize', 4096)
+    page_size = data.get('pageSize', 256)
+    # The TLB needs a walk depth, so an explicit null still means 'single'
+    table_mode = data.get('tableMode') or 'single'
+    
+    paging_result = paging_segmentation.simulate_paging(
+        memory_size, data.get('processSize', 1024), page_size, table_mode, data.get('virtualAddressBits')
+    )
+    if 'error' in paging_result['page_table_model']:
+        return jsonify(paging_result['page_table_model']), 400
+    
+    result = paging_segmentation.simulate_tlb(
+        data.get('addresses', []), page_size, paging_result['page_table_ranges'],
+        data.get('tlb'), paging_result['page_table_model']['walk_depth'],
+        data.get('memoryAccessTime', 100), data.get('asids')
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    result['table_mode'] = table_mode
+    
+    return jsonify(result)
+
+@app.route('/api/paging/reverse-lookup', methods=['POST'])
+def reverse_lookup():
+    data = request.json
+    session_id = data.get('sessionId')
+    
+    if session_id is None:
+        # Build the index once; later requests pass the returned sessionId
+        mode = data.get('mode', 'paging')
+        memory_size = data.get('memorySize', 4096)
+        if mode == 'paging':
+            page_size = data.get('pageSize', 256)
+            ranges = data.get('pageTableRanges')
+            if ranges is None:
+                ranges = paging_segmentation.simulate_paging(
+                    memory_size, data.get('processSize', 1024), page_size
+                )['page_table_ranges']
+            index = ReverseMapIndex.from_page_ranges(ranges, page_size)
+        else:
+            segment_table = data.get('segmentTable')
+            if segment_table is None:
+                segment_table = paging_segmentation.simulate_segmentation(
+                    memory_size, data.get('segments', []),
+                    data.get('placement', 'first_fit'), data.get('operations')
+                )['segment_table']
+            index = ReverseMapIndex.from_segment_table(segment_table)
+        session_id = paging_segmentation.store_reverse_index(index)
+    
+    result = paging_segmentation.reverse_lookup(
+        session_id, data.get('physicalAddress', 0), data.get('physicalAddresses')
+    )
+    if 'error' in result and 'found' not in result:
+        return jsonify(result), 404
+    return jsonify(result)
+
+@app.route('/api/paging/sweep', methods=['POST'])
+def sweep_page_sizes():
+    data = request.json
+    memory_size = data.get('memorySize', 4096)
+    process_size = data.get('processSize', 1024)
+    page_sizes = data.get('pageSizes')
+    if page_sizes is None:
+        # Default to every power of two between the bounds
+        page_sizes = []
+        size = data.get('minPageSize', 256)
+        while size <= data.get('maxPageSize', 4096):
+            page_sizes.append(size)
+            size *= 2
+    
+    result = paging_segmentation.sweep_page_sizes(
+        memory_size, process_size, page_sizes, data.get('pageMixes'), data.get('pteSize', 8)
+    )
+    
+    return jsonify(result)
+
+@app.route('/api/paging/huge-pages', methods=['POST'])
+def simulate_huge_pages():
+    data = request.json
+    memory_size = data.get('memorySize', 1 << 32)
+    regions = data.get('regions', [{'start': 0, 'size': data.get('processSize', 1 << 30)}])
+    
+    result = paging_segmentation.simulate_huge_pages(
+        memory_size, regions,
+        data.get('pageSizes', [4096, 2 << 20, 1 << 30]),
+        data.get('policy', 'aligned'),
+        data.get('promotionThreshold', 0.5),
+        data.get('tlbEntries', 64),
+        data.get('pteSize', 8)
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    
+    return jsonify(result)
+
 @app.route('/api/paging/compare', methods=['POST'])
 def compare_paging():
     data = request.json
@@ -120,7 +352,12 @@ def compare_paging():
     page_size = data.get('pageSize', 256)
     segments = data.get('segments', [])
     
+    page_table_limit = data.get('pageTableLimit', PAGE_TABLE_SLICE)
+    
     paging_result = paging_segmentation.simulate_paging(memory_size, process_size, page_size)
+    # As in /api/paging/simulate: ranges for the whole table, a slice of entries
+    paging_result['page_table'] = paging_result['page_table'][:page_table_limit]
+    paging_result['page_table_limit'] = page_table_limit
     segmentation_result = paging_segmentation.simulate_segmentation(memory_size, segments)
     
     # Generate comparison visualization
@@ -180,6 +417,70 @@ def compare_page_replacement():
         'plot': f"data:image/png;base64,{plot_url}"
     })
 
+@app.route('/api/page-replacement/append', methods=['POST'])
+def append_page_replacement():
+    data = request.json
+    
+    result = page_replacement.append(data.get('sessionId'), data.get('referenceString', []))
+    if 'error' in result:
+        return jsonify(result), 404
+    
+    return jsonify(result)
+
+@app.route('/api/page-replacement/checkpoint', methods=['POST'])
+def checkpoint_page_replacement():
+    data = request.json
+    
+    result = page_replacement.checkpoint(data.get('sessionId'))
+    if 'error' in result:
+        return jsonify(result), 404
+    
+    return jsonify(result)
+
+@app.route('/api/page-replacement/mrc', methods=['POST'])
+def estimate_mrc():
+    # JSON with a referenceString, or a multipart trace upload with form fields
+    trace = request.files.get('trace')
+    if trace is None:
+        data = request.json
+        result = page_replacement.estimate_mrc(
+            data.get('referenceString', []), data.get('rate'), data.get('sampleSize'),
+            data.get('cacheSizes'), data.get('confidence', 0.95), data.get('adjust', True),
+            data.get('compareExact', False)
+        )
+    else:
+        form = request.form
+        with tempfile.NamedTemporaryFile(suffix='.trace', delete=False) as saved:
+            trace.save(saved)
+        try:
+            result = page_replacement.estimate_trace_mrc(
+                saved.name, form.get('format', 'lackey'), form.get('pageSize', 4096, type=int),
+                form.get('includeInstructions', 'true') != 'false', form.get('rate', type=float),
+                form.get('sampleSize', type=int),
+                json.loads(form['cacheSizes']) if form.get('cacheSizes') else None,
+                form.get('confidence', 0.95, type=float), form.get('adjust', 'true') != 'false',
+                form.get('compareExact', 'false') == 'true'
+            )
+        finally:
+            os.remove(saved.name)
+    if 'error' in result:
+        return jsonify(result), 400
+    
+    return jsonify(result)
+
+@app.route('/api/page-replacement/mrc-benchmark', methods=['POST'])
+def benchmark_mrc():
+    data = request.json or {}
+    
+    result = page_replacement.benchmark_mrc(
+        data.get('length', 200000), data.get('pages', 50000), data.get('rate', 0.01), data.get('sampleSize'),
+        data.get('confidence', 0.95), data.get('adjust', True), data.get('seed', 0), data.get('traces')
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    
+    return jsonify(result)
+
 # API Routes for Virtual Memory
 @app.route('/api/virtual-memory/simulate', methods=['POST'])
 def simulate_virtual_memory():
@@ -188,8 +489,15 @@ def simulate_virtual_memory():
     physical_size = data.get('physicalSize', 16384)
     page_size = data.get('pageSize', 4096)
     access_pattern = data.get('accessPattern', [])
+    tlb_config = data.get('tlb')
+    replacement = data.get('replacement', 'fifo')
+    working_set_config = data.get('workingSet')
     
-    result = virtual_memory.simulate(virtual_size, physical_size, page_size, access_pattern)
+    result = virtual_memory.simulate(virtual_size, physical_size, page_size, access_pattern, tlb_config, replacement,
+                                     working_set_config, data.get('log', 'full'), data.get('logOptions'),
+                                     data.get('prefetch'), data.get('latency'), data.get('resumable', False))
+    if 'error' in result:
+        return jsonify(result), 400
     
     # Generate visualization
     fig = visualizer.plot_virtual_memory(result)
@@ -203,13 +511,118 @@ def simulate_virtual_memory():
     
     return jsonify(result)
 
+@app.route('/api/virtual-memory/multiprocess', methods=['POST'])
+def simulate_multiprocess():
+    data = request.json
+
+    result = virtual_memory.simulate_multiprocess(
+        data.get('virtualSize', 65536), data.get('physicalSize', 16384), data.get('pageSize', 4096),
+        data.get('accessPattern', []), data.get('replacement', 'fifo'),
+        data.get('scope', 'global'), data.get('quotas')
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+
+    return jsonify(result)
+
+@app.route('/api/virtual-memory/trace', methods=['POST'])
+def simulate_trace():
+    # Multipart upload: the trace file plus form fields (tlb and workingSet as JSON)
+    trace = request.files.get('trace')
+    if trace is None:
+        return jsonify({'error': 'No trace file uploaded', 'success': False}), 400
+    form = request.form
+
+    with tempfile.NamedTemporaryFile(suffix='.trace', delete=False) as saved:
+        trace.save(saved)
+    try:
+        result = virtual_memory.simulate_trace(
+            saved.name, form.get('format', 'lackey'),
+            form.get('virtualSize', 1 << 48, type=int), form.get('physicalSize', 1 << 24, type=int),
+            form.get('pageSize', 4096, type=int), json.loads(form['tlb']) if form.get('tlb') else None,
+            form.get('replacement', 'fifo'),
+            json.loads(form['workingSet']) if form.get('workingSet') else None,
+            form.get('includeInstructions', 'true') != 'false', form.get('maxAccesses', type=int),
+            form.get('log', 'none'), json.loads(form['logOptions']) if form.get('logOptions') else None,
+            json.loads(form['prefetch']) if form.get('prefetch') else None,
+            json.loads(form['latency']) if form.get('latency') else None,
+            form.get('resumable', 'false') == 'true'
+        )
+    finally:
+        os.remove(saved.name)
+    if 'error' in result:
+        return jsonify(result), 400
+
+    return jsonify(result)
+
+@app.route('/api/virtual-memory/hierarchy', methods=['POST'])
+def simulate_hierarchy():
+    # JSON with an accessPattern, or a multipart trace upload with form fields
+    trace = request.files.get('trace')
+    if trace is None:
+        data = request.json
+        result = virtual_memory.simulate_hierarchy(
+            data.get('virtualSize', 65536), data.get('physicalSize', 16384), data.get('pageSize', 4096),
+            data.get('accessPattern', []), data.get('tiers')
+        )
+    else:
+        form = request.form
+        try:
+            tiers = json.loads(form['tiers']) if form.get('tiers') else None
+        except ValueError:
+            return jsonify({'tiers': form['tiers'], 'error': 'tiers must be a JSON list', 'success': False}), 400
+        with tempfile.NamedTemporaryFile(suffix='.trace', delete=False) as saved:
+            trace.save(saved)
+        try:
+            result = virtual_memory.simulate_hierarchy_trace(
+                saved.name, form.get('format', 'lackey'),
+                form.get('virtualSize', 1 << 48, type=int), form.get('physicalSize', 1 << 24, type=int),
+                form.get('pageSize', 4096, type=int), tiers,
+                form.get('includeInstructions', 'true') != 'false', form.get('maxAccesses', type=int)
+            )
+        finally:
+            os.remove(saved.name)
+    if 'error' in result:
+        return jsonify(result), 400
+    
+    return jsonify(result)
+
+@app.route('/api/virtual-memory/append', methods=['POST'])
+def append_virtual_memory():
+    data = request.json
+    
+    result = virtual_memory.append(data.get('sessionId'), data.get('accessPattern', []))
+    if 'error' in result:
+        # A session stored without resumable is there but cannot continue
+        return jsonify(result), 400 if result.get('resumable') is False else 404
+    
+    return jsonify(result)
+
+@app.route('/api/virtual-memory/checkpoint', methods=['POST'])
+def checkpoint_virtual_memory():
+    data = request.json
+    
+    result = virtual_memory.checkpoint(data.get('sessionId'))
+    if 'error' in result:
+        return jsonify(result), 400 if result.get('resumable') is False else 404
+    
+    return jsonify(result)
+
 @app.route('/api/virtual-memory/translate', methods=['POST'])
 def translate_address():
     data = request.json
     logical_address = data.get('logicalAddress', 0)
     page_size = data.get('pageSize', 4096)
-    page_table = data.get('pageTable', {})
+    session_id = data.get('sessionId')
+    
+    if session_id:
+        # Resolve against the page table kept server-side by simulate
+        result = virtual_memory.translate_session(session_id, logical_address)
+        if 'error' in result and 'page_number' not in result:
+            return jsonify(result), 404
+        return jsonify(result)
     
+    page_table = data.get('pageTable', {})
     result = virtual_memory.translate_address(logical_address, page_size, page_table)
     
     return jsonify(result)
@@ -0,0 +1,203 @@
+import base64
+import math
+import random
+from array import array
+from collections.abc import Sequence
+
+LOG_MODES = ['full', 'sampled', 'none']
+SAMPLE_METHODS = ['reservoir', 'every']
+LOG_FORMATS = ['rows', 'columns']
+
+# Bits of the flags column
+FLAG_WRITE = 1
+FLAG_PAGE_FAULT = 2
+FLAG_INVALID = 4
+FLAG_TLB_HIT = 8
+
+class AccessLog(Sequence):
+    """
+    Per-access log stored as typed array columns (page, offset, frame,
+    flags) instead of one dict per access. Modes:
+      full    - every access
+      sampled - a uniform reservoir of `size` accesses (Algorithm L, so the
+                random skip is drawn per replacement, not per access) or
+                every k-th access
+      none    - nothing; only the count of accesses seen
+    Indexing yields the familiar entry dicts, built on demand. JSON output
+    is the list of those dicts by default; format 'columns' gives the
+    column arrays instead (or base64 of the raw columns, which implies it).
+    """
+
+    def __init__(self, page_size, mode='full', options=None, tlb=False):
+        options = options or {}
+        self.page_size = page_size
+        self.mode = mode
+        self.method = options.get('method', 'reservoir')
+        self.size = max(options.get('size', 1000), 1)
+        self.every = max(options.get('every', 100), 1)
+        self.encoding = options.get('encoding', 'json')
+        self.format = options.get('format', 'columns' if self.encoding == 'base64' else 'rows')
+        self.tlb = tlb
+        self.enabled = mode != 'none'
+        self.seen = 0
+
+        # Sampled rows keep the index of the access they came from
+        self.indices = array('q')
+        self.pages = array('q')
+        self.offsets = array('q')
+        self.frames = array('q')
+        self.flags = array('B')
+        self._order_cache = (None, None)
+
+        if mode == 'sampled' and self.method == 'reservoir':
+            self._rng = random.Random(options.get('seed', 0))
+            self._weight = math.exp(math.log(self._uniform()) / self.size)
+            self._next_replacement = self.size - 1 + self._skip()
+
+    def _uniform(self):
+        """Uniform draw from the open interval (0, 1)"""
+        value = self._rng.random()
+        while value == 0:
+            value = self._rng.random()
+        return value
+
+    def _skip(self):
+        return math.floor(math.log(self._uniform()) / math.log(1 - self._weight)) + 1
+
+    def record(self, page_number, offset, frame_number, flags):
+        """Offer one access to the log (frame_number -1 when there is none)"""
+        index = self.seen
+        self.seen += 1
+
+        if self.mode == 'full':
+            self._append(index, page_number, offset, frame_number, flags)
+        elif self.method == 'every':
+            if index % self.every == 0:
+                self._append(index, page_number, offset, frame_number, flags)
+        elif index < self.size:
+            self._append(index, page_number, offset, frame_number, flags)
+        elif index == self._next_replacement:
+            slot = self._rng.randrange(self.size)
+            self.indices[slot] = index
+            self.pages[slot] = page_number
+            self.offsets[slot] = offset
+            self.frames[slot] = frame_number
+            self.flags[slot] = flags
+            self._weight *= math.exp(math.log(self._uniform()) / self.size)
+            self._next_replacement += self._skip()
+
+    def _append(self, index, page_number, offset, frame_number, flags):
+        if self.mode == 'sampled':
+            self.indices.append(index)
+        self.pages.append(page_number)
+        self.offsets.append(offset)
+        self.frames.append(frame_number)
+        self.flags.append(flags)
+
+    def _order(self):
+        """Row order by access index (reservoir rows are stored unordered)"""
+        if self.mode != 'sampled' or self.method != 'reservoir':
+            return None
+        if self._order_cache[0] != self.seen:
+            self._order_cache = (self.seen, sorted(range(len(self.pages)), key=self.indices.__getitem__))
+        return self._order_cache[1]
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        order = self._order()
+        row = order[index] if order else range(len(self))[index]
+
+        page_number = self.pages[row]
+        offset = self.offsets[row]
+        flags = self.flags[row]
+        entry = {
+            'address': page_number * self.page_size + offset,
+            'page_number': page_number,
+            'offset': offset
+        }
+        if not flags & FLAG_INVALID:
+            frame_number = self.frames[row]
+            entry['frame_number'] = frame_number
+            entry['physical_address'] = frame_number * self.page_size + offset
+        entry['type'] = 'write' if flags & FLAG_WRITE else 'read'
+        if flags & FLAG_INVALID:
+            entry['result'] = 'Invalid address'
+        else:
+            entry['result'] = 'Page Fault' if flags & FLAG_PAGE_FAULT else 'Hit'
+        entry['page_fault'] = bool(flags & FLAG_PAGE_FAULT)
+        if self.tlb and not flags & FLAG_INVALID:
+            entry['tlb_hit'] = bool(flags & FLAG_TLB_HIT)
+        return entry
+
+    def since(self, index):
+        """
+        Entry dicts of logged accesses from access `index` on, e.g. the
+        accesses appended to a resumed run. Sampled entries carry their index.
+        """
+        if self.mode == 'full':
+            return self[index:]
+        if self.mode == 'none':
+            return []
+        order = self._order() or range(len(self))
+        entries = []
+        for position, row in enumerate(order):
+            if self.indices[row] >= index:
+                entry = self[position]
+                entry['index'] = self.indices[row]
+                entries.append(entry)
+        return entries
+
+    def columns(self):
+        """Typed columns in access order; sampled logs add each row's access index"""
+        columns = {
+            'page_number': self.pages,
+            'offset': self.offsets,
+            'frame_number': self.frames,
+            'flags': self.flags
+        }
+        if self.mode == 'sampled':
+            columns = {'index': self.indices, **columns}
+        order = self._order()
+        if order:
+            columns = {
+                name: array(column.typecode, [column[i] for i in order])
+                for name, column in columns.items()
+            }
+        return columns
+
+    def to_json(self):
+        if self.format == 'rows':
+            return self.since(0)
+        columns = self.columns()
+        if self.encoding == 'base64':
+            encoded = {
+                name: {
+                    'typecode': column.typecode,
+                    'itemsize': column.itemsize,
+                    'data': base64.b64encode(column.tobytes()).decode()
+                }
+                for name, column in columns.items()
+            }
+        else:
+            encoded = {name: column.tolist() for name, column in columns.items()}
+
+        return {
+            'mode': self.mode,
+            'method': self.method if self.mode == 'sampled' else None,
+            'encoding': self.encoding,
+            'total_accesses': self.seen,
+            'count': len(self),
+            'page_size': self.page_size,
+            'flag_bits': {
+                'write': FLAG_WRITE,
+                'page_fault': FLAG_PAGE_FAULT,
+                'invalid': FLAG_INVALID,
+                'tlb_hit': FLAG_TLB_HIT
+            },
+            'tlb': self.tlb,
+            'columns': encoded
+        }
@@ -1,48 +1,77 @@
+import math
+from array import array
+from modules.memory_blocks import MemoryBlockStore
+from modules.partition_index import FreePartitionIndex
+from modules.fragmentation import FragmentationTracker
+
 class ContinuousMemoryAllocator:
     def __init__(self):
         self.memory = []
         self.processes = []
     
-    def simulate(self, memory_size, processes, partition_type, algorithm):
+    def simulate(self, memory_size, processes, partition_type, algorithm, partition_sizes=None):
         """
         Simulate continuous memory allocation
         """
+        error = self._check_processes(processes)
+        if error:
+            return error
+        processes = [{**process, 'size': math.ceil(process['size'])} for process in processes]
         if partition_type == 'fixed':
-            return self._fixed_partitioning(memory_size, processes, algorithm)
+            return self._fixed_partitioning(memory_size, processes, algorithm, partition_sizes)
         else:
             return self._variable_partitioning(memory_size, processes, algorithm)
     
-    def _fixed_partitioning(self, memory_size, processes, algorithm):
+    def _fixed_partitioning(self, memory_size, processes, algorithm, partition_sizes=None):
         """
-        Fixed partitioning with equal-sized partitions
+        Fixed partitioning over user-defined partition sizes, or equal-sized
+        partitions when none are given
         """
-        num_partitions = len(processes) + 2
-        partition_size = memory_size // num_partitions
-        partitions = [{'size': partition_size, 'allocated': None} for _ in range(num_partitions)]
+        partition_sizes = self._partition_layout(memory_size, len(processes), partition_sizes)
+        error = self._check_layout(partition_sizes)
+        if error:
+            return {
+                'algorithm': algorithm,
+                'partition_type': 'fixed',
+                'error': error,
+                'success': False
+            }
+        
+        partitions = MemoryBlockStore()
+        start = 0
+        for size in partition_sizes:
+            partitions.append(start, size)
+            start += size
+        free_partitions = FreePartitionIndex(partition_sizes)
+        fragmentation = FragmentationTracker(memory_size)
+        for size in partition_sizes:
+            fragmentation.add_hole(size)
         
         allocated_processes = []
         unallocated_processes = []
         internal_fragmentation = 0
         
         for process in processes:
-            allocated = False
-            for i, partition in enumerate(partitions):
-                if partition['allocated'] is None and partition['size'] >= process['size']:
-                    partition['allocated'] = process['id']
-                    allocated_processes.append({
-                        'id': process['id'],
-                        'size': process['size'],
-                        'partition': i,
-                        'partition_size': partition['size']
-                    })
-                    internal_fragmentation += (partition['size'] - process['size'])
-                    allocated = True
-                    break
+            i = self._place_fixed(free_partitions, process['size'], algorithm)
             
-            if not allocated:
+            if i is None:
                 unallocated_processes.append(process)
+                fragmentation.record(process['id'], False)
+                continue
+            
+            free_partitions.remove(i, partitions.sizes[i])
+            fragmentation.remove_hole(partitions.sizes[i])
+            fragmentation.record(process['id'], True)
+            partitions.assign(i, process['id'])
+            allocated_processes.append({
+                'id': process['id'],
+                'size': process['size'],
+                'partition': i,
+                'partition_size': partitions.sizes[i]
+            })
+            internal_fragmentation += (partitions.sizes[i] - process['size'])
         
-        memory_map = self._create_memory_map_fixed(partitions, partition_size)
+        memory_map = partitions.memory_map()
         total_allocated = sum(p['size'] for p in allocated_processes)
         memory_utilization = (total_allocated / memory_size) * 100 if memory_size > 0 else 0
         
@@ -55,6 +84,8 @@ class ContinuousMemoryAllocator:
             'external_fragmentation': 0,
             'memory_utilization': round(memory_utilization, 2),
             'memory_map': memory_map,
+            'partition_sizes': partition_sizes,
+            'fragmentation_timeline': fragmentation.summary(),
             'total_memory': memory_size
         }
     
@@ -62,52 +93,41 @@ class ContinuousMemoryAllocator:
         """
         Variable partitioning using First Fit, Best Fit, or Worst Fit
         """
-        memory_blocks = [{'start': 0, 'size': memory_size, 'allocated': None}]
+        memory_blocks = MemoryBlockStore(memory_size)
+        fragmentation = FragmentationTracker(memory_size)
+        fragmentation.add_hole(memory_size)
         allocated_processes = []
         unallocated_processes = []
         
         for process in processes:
-            block_index = None
-            
-            if algorithm == 'first_fit':
-                block_index = self._first_fit(memory_blocks, process['size'])
-            elif algorithm == 'best_fit':
-                block_index = self._best_fit(memory_blocks, process['size'])
-            elif algorithm == 'worst_fit':
-                block_index = self._worst_fit(memory_blocks, process['size'])
+            block_index = self._place_variable(memory_blocks, process['size'], algorithm)
             
             if block_index is not None:
-                block = memory_blocks[block_index]
+                start = memory_blocks.starts[block_index]
                 allocated_processes.append({
                     'id': process['id'],
                     'size': process['size'],
-                    'start': block['start'],
-                    'end': block['start'] + process['size']
+                    'start': start,
+                    'end': start + process['size']
                 })
                 
                 # Split the block
-                remaining_size = block['size'] - process['size']
-                memory_blocks[block_index] = {
-                    'start': block['start'],
-                    'size': process['size'],
-                    'allocated': process['id']
-                }
-                
-                if remaining_size > 0:
-                    memory_blocks.insert(block_index + 1, {
-                        'start': block['start'] + process['size'],
-                        'size': remaining_size,
-                        'allocated': None
-                    })
+                hole_size = memory_blocks.sizes[block_index]
+                memory_blocks.allocate(block_index, process['size'], process['id'])
+                fragmentation.remove_hole(hole_size)
+                fragmentation.add_hole(hole_size - process['size'])
+                fragmentation.record(process['id'], True)
             else:
                 unallocated_processes.append(process)
+                fragmentation.record(process['id'], False)
         
         # Calculate fragmentation
-        external_fragmentation = sum(block['size'] for block in memory_blocks if block['allocated'] is None)
+        external_fragmentation = memory_blocks.free_size()
         total_allocated = sum(p['size'] for p in allocated_processes)
         memory_utilization = (total_allocated / memory_size) * 100 if memory_size > 0 else 0
         
-        memory_map = self._create_memory_map_variable(memory_blocks, memory_size)
+        # Dict views are built lazily when the response is serialised
+        memory_map = memory_blocks.memory_map()
         
         return {
             'algorithm': algorithm,
@@ -118,14 +138,53 @@ class ContinuousMemoryAllocator:
             'external_fragmentation': external_fragmentation,
             'memory_utilization': round(memory_utilization, 2),
             'memory_map': memory_map,
-            'memory_blocks': memory_blocks,
+            'memory_blocks': memory_blocks.blocks(),
+            'fragmentation_timeline': fragmentation.summary(),
             'total_memory': memory_size
         }
     
+    def _partition_layout(self, memory_size, process_count, partition_sizes):
+        """Partition sizes to lay out, or None if they do not fit in memory"""
+        if partition_sizes:
+            partition_sizes = [int(size) for size in partition_sizes]
+            if sum(partition_sizes) > memory_size:
+                return None
+            return partition_sizes
+        
+        num_partitions = process_count + 2
+        return [memory_size // num_partitions] * num_partitions
+    
+    def _check_layout(self, layout):
+        """Error message for a partition layout, or None"""
+        if layout is None:
+            return 'Partition sizes exceed total memory'
+        # A size of 0 is the free-partition index's mark for a taken slot
+        if any(size <= 0 for size in layout):
+            return 'Partition sizes must be positive'
+        return None
+    
+    def _place_fixed(self, free_partitions, size, algorithm):
+        """Pick a free partition for a process of `size`"""
+        if algorithm == 'best_fit':
+            return free_partitions.best_fit(size)
+        elif algorithm == 'worst_fit':
+            return free_partitions.worst_fit(size)
+        return free_partitions.first_fit(size)
+    
+    def _place_variable(self, memory_blocks, size, algorithm):
+        """Pick a free block for a process of `size`"""
+        if algorithm == 'first_fit':
+            return self._first_fit(memory_blocks, size)
+        elif algorithm == 'best_fit':
+            return self._best_fit(memory_blocks, size)
+        elif algorithm == 'worst_fit':
+            return self._worst_fit(memory_blocks, size)
+        return None
+    
     def _first_fit(self, memory_blocks, size):
         """First Fit: Allocate the first block that is large enough"""
-        for i, block in enumerate(memory_blocks):
-            if block['allocated'] is None and block['size'] >= size:
+        for i, (block_size, owner) in enumerate(zip(memory_blocks.sizes, memory_blocks.owners)):
+            if owner == MemoryBlockStore.FREE and block_size >= size:
                 return i
         return None
     
@@ -134,10 +193,10 @@ class ContinuousMemoryAllocator:
         best_index = None
         best_size = float('inf')
         
-        for i, block in enumerate(memory_blocks):
-            if block['allocated'] is None and block['size'] >= size:
-                if block['size'] < best_size:
-                    best_size = block['size']
+        for i, (block_size, owner) in enumerate(zip(memory_blocks.sizes, memory_blocks.owners)):
+            if owner == MemoryBlockStore.FREE and block_size >= size:
+                if block_size < best_size:
+                    best_size = block_size
                     best_index = i
         
         return best_index
@@ -147,55 +206,109 @@ class ContinuousMemoryAllocator:
         worst_index = None
         worst_size = -1
         
-        for i, block in enumerate(memory_blocks):
-            if block['allocated'] is None and block['size'] >= size:
-                if block['size'] > worst_size:
-                    worst_size = block['size']
+        for i, (block_size, owner) in enumerate(zip(memory_blocks.sizes, memory_blocks.owners)):
+            if owner == MemoryBlockStore.FREE and block_size >= size:
+                if block_size > worst_size:
+                    worst_size = block_size
                     worst_index = i
         
         return worst_index
     
-    def _create_memory_map_fixed(self, partitions, partition_size):
-        """Create memory map for fixed partitioning"""
-        memory_map = []
-        for i, partition in enumerate(partitions):
-            memory_map.append({
-                'start': i * partition_size,
-                'end': (i + 1) * partition_size,
-                'size': partition_size,
-                'process': partition['allocated'],
-                'type': 'allocated' if partition['allocated'] else 'free'
-            })
-        return memory_map
+    def evaluate_metrics(self, memory_size, sizes, partition_type, algorithms, partition_sizes=None):
+        """
+        Metrics-only evaluation of several algorithms in a single pass over a
+        pre-validated array of process sizes. Only free space is tracked, so
+        no block list or memory map is built.
+        """
+        if partition_type == 'fixed':
+            layout = self._partition_layout(memory_size, len(sizes), partition_sizes)
+            error = self._check_layout(layout)
+            if error:
+                return {
+                    'partition_type': 'fixed',
+                    'error': error,
+                    'success': False
+                }
+            free_space = {algo: FreePartitionIndex(layout) for algo in algorithms}
+        else:
+            free_space = {algo: MemoryBlockStore(memory_size) for algo in algorithms}
+        
+        metrics = {
+            algo: {'allocated_size': 0, 'allocated_count': 0, 'internal_fragmentation': 0}
+            for algo in algorithms
+        }
+        
+        for size in sizes:
+            for algo in algorithms:
+                free = free_space[algo]
+                if partition_type == 'fixed':
+                    i = self._place_fixed(free, size, algo)
+                    if i is None:
+                        continue
+                    free.remove(i, layout[i])
+                    metrics[algo]['internal_fragmentation'] += layout[i] - size
+                else:
+                    i = self._place_variable(free, size, algo)
+                    if i is None:
+                        continue
+                    # Holes only: carve the allocation off the front of the hole
+                    free.carve(i, size)
+                metrics[algo]['allocated_size'] += size
+                metrics[algo]['allocated_count'] += 1
+        
+        for algo in algorithms:
+            if partition_type == 'fixed':
+                metrics[algo]['external_fragmentation'] = 0
+            else:
+                metrics[algo]['external_fragmentation'] = free_space[algo].free_size()
+        
+        return metrics
     
-    def _create_memory_map_variable(self, memory_blocks, total_memory):
-        """Create memory map for variable partitioning"""
-        memory_map = []
-        for block in memory_blocks:
-            memory_map.append({
-                'start': block['start'],
-                'end': block['start'] + block['size'],
-                'size': block['size'],
-                'process': block['allocated'],
-                'type': 'allocated' if block['allocated'] else 'free'
-            })
-        return memory_map
+    def _check_processes(self, processes):
+        """Error entry for the first process without a positive numeric size, or None"""
+        for process in processes:
+            size = process.get('size')
+            if isinstance(size, bool) or not isinstance(size, (int, float)) or not math.isfinite(size) or size <= 0:
+                return {'process': process.get('id'), 'error': f'Invalid process size: {size!r}', 'success': False}
+        return None
     
-    def compare_all(self, memory_size, processes, partition_type):
+    def _prepare_processes(self, processes):
+        """
+        Checked processes as a compact array of sizes. Blocks are whole
+        units, so a fractional size is rounded up, as in simulate().
+        """
+        return array('q', (math.ceil(process['size']) for process in processes))
+    
+    def compare_all(self, memory_size, processes, partition_type, partition_sizes=None, single_pass=True):
         """Compare all allocation algorithms"""
         algorithms = ['first_fit', 'best_fit', 'worst_fit']
         results = {}
+        error = self._check_processes(processes)
+        if error:
+            return error
+        sizes = self._prepare_processes(processes)
+        
+        if single_pass:
+            metrics = self.evaluate_metrics(memory_size, sizes, partition_type, algorithms, partition_sizes)
+        else:
+            metrics = {}
+            for algo in algorithms:
+                metrics.update(self.evaluate_metrics(memory_size, sizes, partition_type, [algo], partition_sizes))
+        
+        if 'error' in metrics:
+            return metrics
         
         for algo in algorithms:
-            result = self.simulate(memory_size, processes, partition_type, algo)
+            algo_metrics = metrics[algo]
+            memory_utilization = (algo_metrics['allocated_size'] / memory_size) * 100 if memory_size > 0 else 0
             results[algo] = {
                 'algorithm': algo,
-                'memory_utilization': result['memory_utilization'],
-                'internal_fragmentation': result['internal_fragmentation'],
-                'external_fragmentation': result['external_fragmentation'],
-                'allocated_count': len(result['allocated']),
-                'unallocated_count': len(result['unallocated']),
-                'total_fragmentation': result['internal_fragmentation'] + result['external_fragmentation']
+                'memory_utilization': round(memory_utilization, 2),
+                'internal_fragmentation': algo_metrics['internal_fragmentation'],
+                'external_fragmentation': algo_metrics['external_fragmentation'],
+                'allocated_count': algo_metrics['allocated_count'],
+                'unallocated_count': len(sizes) - algo_metrics['allocated_count'],
+                'total_fragmentation': algo_metrics['internal_fragmentation'] + algo_metrics['external_fragmentation']
             }
         
         # Find best algorithm (highest utilization, lowest fragmentation)
@@ -0,0 +1,152 @@
+import math
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from modules.continuous_allocation import ContinuousMemoryAllocator
+
+ALGORITHMS = ['first_fit', 'best_fit', 'worst_fit']
+METRICS = ['memory_utilization', 'internal_fragmentation', 'external_fragmentation', 'total_fragmentation']
+
+DEFAULT_DISTRIBUTION_PARAMS = {
+    'uniform': {'min_size': 50, 'max_size': 300},
+    'lognormal': {'mu': 4.5, 'sigma': 0.75},
+    'bimodal': {'small_mean': 60, 'large_mean': 350, 'spread': 0.2, 'large_fraction': 0.3}
+}
+# Trials one request may run; each is a full compare_all over a workload
+MAX_TRIALS = 100000
+
+def trial_seed(seed, trial):
+    """
+    Seed for one trial, derived only from the experiment seed and the trial
+    number so results do not depend on how trials are split across workers
+    """
+    return random.Random(f'{seed}:{trial}').getrandbits(64)
+
+def sample_size(rng, distribution, params):
+    """Draw one process size (>= 1) from the configured distribution"""
+    if distribution == 'lognormal':
+        size = rng.lognormvariate(params['mu'], params['sigma'])
+    elif distribution == 'bimodal':
+        mean = params['large_mean'] if rng.random() < params['large_fraction'] else params['small_mean']
+        size = rng.gauss(mean, mean * params['spread'])
+    else:
+        return rng.randint(params['min_size'], params['max_size'])
+    return max(1, int(round(size)))
+
+def generate_workload(seed, process_count, distribution, params):
+    """Reproducible list of processes for one trial"""
+    rng = random.Random(seed)
+    return [
+        {'id': f'P{i+1}', 'size': sample_size(rng, distribution, params)}
+        for i in range(process_count)
+    ]
+
+def _run_trial(task):
+    trial, seed, config = task
+    processes = generate_workload(seed, config['process_count'], config['distribution'], config['params'])
+    results = ContinuousMemoryAllocator().compare_all(
+        config['memory_size'], processes, config['partition_type'], config['partition_sizes']
+    )
+    return trial, results
+
+class AllocationExperimentRunner:
+    def __init__(self):
+        pass
+
+    def run(self, memory_size, process_count=20, trials=1000, distribution='uniform',
+            distribution_params=None, partition_type='variable', partition_sizes=None,
+            seed=0, workers=None, confidence=0.95):
+        """
+        Run compare_all on many seeded random workloads and aggregate
+        confidence intervals per allocation algorithm
+        """
+        if distribution not in DEFAULT_DISTRIBUTION_PARAMS:
+            return {
+                'error': f'Unknown distribution: {distribution}',
+                'success': False
+            }
+
+        if isinstance(trials, bool) or not isinstance(trials, int) or not 1 <= trials <= MAX_TRIALS:
+            return {'trials': trials, 'error': f'Trials must be 1 to {MAX_TRIALS}', 'success': False}
+        if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0 < confidence < 1:
+            return {'confidence': confidence, 'error': 'Confidence must be between 0 and 1', 'success': False}
+
+        params = {**DEFAULT_DISTRIBUTION_PARAMS[distribution], **(distribution_params or {})}
+        for name, value in params.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return {'distribution_params': params, 'error': f'{name} must be a number', 'success': False}
+        uniform_bounds = (params.get('min_size'), params.get('max_size'))
+        if distribution == 'uniform' and not (
+            all(isinstance(bound, int) for bound in uniform_bounds) and 1 <= uniform_bounds[0] <= uniform_bounds[1]
+        ):
+            return {
+                'distribution_params': params,
+                'error': 'Uniform sizes need integers 1 <= min_size <= max_size',
+                'success': False
+            }
+        config = {
+            'memory_size': memory_size,
+            'process_count': process_count,
+            'distribution': distribution,
+            'params': params,
+            'partition_type': partition_type,
+            'partition_sizes': partition_sizes
+        }
+        tasks = [(trial, trial_seed(seed, trial), config) for trial in range(trials)]
+
+        cpus = os.cpu_count() or 1
+        workers = min(max(workers or cpus, 1), cpus)
+        if workers == 1 or trials < 2:
+            trial_results = [_run_trial(task) for task in tasks]
+        else:
+            chunksize = max(1, trials // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                trial_results = list(executor.map(_run_trial, tasks, chunksize=chunksize))
+
+        # Aggregate in trial order so floating-point sums are reproducible
+        trial_results.sort(key=lambda item: item[0])
+        for _, results in trial_results:
+            if 'error' in results:
+                return results
+
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+        summary = {}
+        for algo in ALGORITHMS:
+            summary[algo] = {'algorithm': algo}
+            for metric in METRICS:
+                values = [results[algo][metric] for _, results in trial_results]
+                summary[algo][metric] = self._confidence_interval(values, z)
+            summary[algo]['wins'] = sum(1 for _, results in trial_results if results['best_algorithm'] == algo)
+
+        best_algo = max(ALGORITHMS, key=lambda k: (
+            summary[k]['memory_utilization']['mean'],
+            -summary[k]['total_fragmentation']['mean']
+        ))
+
+        return {
+            'memory_size': memory_size,
+            'process_count': process_count,
+            'trials': trials,
+            'distribution': distribution,
+            'distribution_params': params,
+            'partition_type': partition_type,
+            'seed': seed,
+            'confidence': confidence,
+            'results': summary,
+            'best_algorithm': best_algo
+        }
+
+    def _confidence_interval(self, values, z):
+        """Mean with a normal-approximation confidence interval"""
+        n = len(values)
+        mean = math.fsum(values) / n if n else 0
+        std = statistics.stdev(values) if n > 1 else 0
+        margin = z * std / math.sqrt(n) if n else 0
+        return {
+            'mean': round(mean, 4),
+            'std': round(std, 4),
+            'ci_low': round(mean - margin, 4),
+            'ci_high': round(mean + margin, 4)
+        }
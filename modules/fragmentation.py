@@ -0,0 +1,71 @@
+from bisect import bisect_left, insort
+
+class FragmentationTracker:
+    """
+    Incrementally maintained free-space metrics for contiguous allocation.
+    Holes are kept in a sorted multiset of sizes plus a power-of-two size
+    histogram, so each allocation event updates the metrics in O(log n)
+    without rescanning the memory map.
+    """
+
+    def __init__(self, memory_size):
+        self.memory_size = memory_size
+        self.free_memory = 0
+        self.hole_sizes = []
+        self.histogram = [0] * max(int(memory_size).bit_length(), 1)
+        self.timeline = {
+            'step': [],
+            'process': [],
+            'allocated': [],
+            'free_memory': [],
+            'largest_free_block': [],
+            'hole_count': [],
+            'fragmentation_index': [],
+            'hole_histogram': []
+        }
+
+    def add_hole(self, size):
+        if size <= 0:
+            return
+        insort(self.hole_sizes, size)
+        self.histogram[self._bucket(size)] += 1
+        self.free_memory += size
+
+    def remove_hole(self, size):
+        if size <= 0:
+            return
+        del self.hole_sizes[bisect_left(self.hole_sizes, size)]
+        self.histogram[self._bucket(size)] -= 1
+        self.free_memory -= size
+
+    def largest_free_block(self):
+        return self.hole_sizes[-1] if self.hole_sizes else 0
+
+    def fragmentation_index(self):
+        """1 - largest hole / free memory: 0 when all free memory is one hole"""
+        if self.free_memory == 0:
+            return 0
+        return 1 - self.largest_free_block() / self.free_memory
+
+    def record(self, process_id, allocated):
+        """Append the current metrics as one point of the time series"""
+        timeline = self.timeline
+        timeline['step'].append(len(timeline['step']) + 1)
+        timeline['process'].append(process_id)
+        timeline['allocated'].append(allocated)
+        timeline['free_memory'].append(self.free_memory)
+        timeline['largest_free_block'].append(self.largest_free_block())
+        timeline['hole_count'].append(len(self.hole_sizes))
+        timeline['fragmentation_index'].append(round(self.fragmentation_index(), 4))
+        timeline['hole_histogram'].append(self.histogram.copy())
+
+    def summary(self):
+        """Time series plus the histogram bucket bounds it is reported in"""
+        return {
+            'histogram_buckets': [[1 << i, (1 << (i + 1)) - 1] for i in range(len(self.histogram))],
+            **self.timeline
+        }
+
+    def _bucket(self, size):
+        # Bucket i holds holes of size [2^i, 2^(i+1))
+        return min(int(size).bit_length() - 1, len(self.histogram) - 1)
@@ -0,0 +1,172 @@
+import random
+from bisect import bisect_left, insort
+
+class _Node:
+    __slots__ = ('start', 'size', 'priority', 'left', 'right', 'max_size')
+
+    def __init__(self, start, size, priority):
+        self.start = start
+        self.size = size
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_size = size
+
+def _update(node):
+    node.max_size = node.size
+    if node.left and node.left.max_size > node.max_size:
+        node.max_size = node.left.max_size
+    if node.right and node.right.max_size > node.max_size:
+        node.max_size = node.right.max_size
+
+def _split(node, start):
+    """Split into (holes starting before `start`, holes starting at or after it)"""
+    if node is None:
+        return None, None
+    if node.start < start:
+        node.right, right = _split(node.right, start)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, start)
+    _update(node)
+    return left, node
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+class HoleIndex:
+    """
+    Interval index over free memory holes. Holes are kept in a treap ordered
+    by start address and augmented with the subtree's largest hole (first fit
+    and neighbour lookups), plus a sorted (size, start) list (best and worst
+    fit). Treap operations and fit lookups are O(log n) expected; adding or
+    removing a hole also shifts the sorted list, which is O(n) but a single
+    memmove. Holes are never empty: callers reject zero-size requests.
+    """
+
+    def __init__(self, memory_size=0, seed=0):
+        self._root = None
+        self._rng = random.Random(seed)
+        self.by_size = []
+        self.free_memory = 0
+        if memory_size > 0:
+            self.add(0, memory_size)
+
+    def __len__(self):
+        return len(self.by_size)
+
+    def add(self, start, size):
+        """Insert a hole (callers coalesce first, see release)"""
+        left, right = _split(self._root, start)
+        node = _Node(start, size, self._rng.random())
+        self._root = _merge(_merge(left, node), right)
+        insort(self.by_size, (size, start))
+        self.free_memory += size
+
+    def remove(self, start):
+        """Remove the hole starting at `start` and return its size"""
+        left, rest = _split(self._root, start)
+        node, right = _split(rest, start + 1)
+        self._root = _merge(left, right)
+        del self.by_size[bisect_left(self.by_size, (node.size, start))]
+        self.free_memory -= node.size
+        return node.size
+
+    def floor(self, address):
+        """(start, size) of the last hole starting at or before `address`"""
+        node, found = self._root, None
+        while node:
+            if node.start <= address:
+                found, node = node, node.right
+            else:
+                node = node.left
+        return (found.start, found.size) if found else None
+
+    def ceiling(self, address):
+        """(start, size) of the first hole starting at or after `address`"""
+        node, found = self._root, None
+        while node:
+            if node.start >= address:
+                found, node = node, node.left
+            else:
+                node = node.right
+        return (found.start, found.size) if found else None
+
+    def first_fit(self, size):
+        """Lowest-addressed hole of at least `size`"""
+        node = self._root
+        if node is None or node.max_size < size:
+            return None
+        while True:
+            if node.left and node.left.max_size >= size:
+                node = node.left
+            elif node.size >= size:
+                return node.start
+            else:
+                node = node.right
+
+    def best_fit(self, size):
+        """Smallest hole of at least `size` (lowest address on ties)"""
+        pos = bisect_left(self.by_size, (size, -1))
+        return self.by_size[pos][1] if pos < len(self.by_size) else None
+
+    def worst_fit(self, size):
+        """Largest hole if it holds `size` (lowest address on ties)"""
+        if not self.by_size or self.by_size[-1][0] < size:
+            return None
+        largest = self.by_size[-1][0]
+        return self.by_size[bisect_left(self.by_size, (largest, -1))][1]
+
+    def find(self, size, placement):
+        if placement == 'best_fit':
+            return self.best_fit(size)
+        elif placement == 'worst_fit':
+            return self.worst_fit(size)
+        return self.first_fit(size)
+
+    def take(self, start, size):
+        """Carve `size` units off the front of the hole starting at `start`"""
+        hole_size = self.remove(start)
+        if hole_size > size:
+            self.add(start + size, hole_size - size)
+
+    def take_at(self, address, size):
+        """
+        Claim [address, address + size) if it lies inside one hole.
+        Returns False when that range is not entirely free.
+        """
+        hole = self.floor(address)
+        if hole is None or hole[0] + hole[1] < address + size:
+            return False
+        start, hole_size = hole
+        self.remove(start)
+        if address > start:
+            self.add(start, address - start)
+        if start + hole_size > address + size:
+            self.add(address + size, start + hole_size - address - size)
+        return True
+
+    def release(self, start, size):
+        """Return [start, start + size) to the free set, merging neighbours"""
+        before = self.floor(start - 1)
+        if before and before[0] + before[1] == start:
+            self.remove(before[0])
+            start, size = before[0], before[1] + size
+        after = self.ceiling(start + size)
+        if after and after[0] == start + size:
+            self.remove(after[0])
+            size += after[1]
+        self.add(start, size)
+
+    def largest_hole(self):
+        return self.by_size[-1][0] if self.by_size else 0
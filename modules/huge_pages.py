@@ -0,0 +1,125 @@
+from modules.page_table_models import count_aligned_blocks
+
+PROMOTION_POLICIES = ['base', 'aligned', 'threshold']
+
+class MixedPageLayout:
+    """
+    Backs virtual regions with several page sizes under a promotion policy.
+    Every region is split with range arithmetic into aligned runs per size
+    class, so the work per region depends on the number of size classes,
+    not on the region's size.
+
+    Policies:
+      base      - smallest page size only
+      aligned   - a larger page backs every aligned block fully inside a region
+      threshold - like aligned, and partially covered blocks are promoted when
+                  at least `promotion_threshold` of the block is in use
+    """
+
+    def __init__(self, page_sizes, policy='aligned', promotion_threshold=0.5, pte_size=8):
+        self.page_sizes = sorted(set(page_sizes), reverse=True)
+        self.policy = policy
+        self.promotion_threshold = promotion_threshold
+        self.pte_size = pte_size
+        self.ranges = {size: [] for size in self.page_sizes}
+        self.used = {size: 0 for size in self.page_sizes}
+
+    def back(self, start, size):
+        """Back the virtual region [start, start + size)"""
+        if size <= 0:
+            return
+        first_level = len(self.page_sizes) - 1 if self.policy == 'base' else 0
+        self._back(start, start + size, first_level)
+
+    def _back(self, start, end, level):
+        page_size = self.page_sizes[level]
+
+        if level == len(self.page_sizes) - 1:
+            # Smallest class: round out to whole pages
+            first = (start // page_size) * page_size
+            last = -(-end // page_size) * page_size
+            self._record(page_size, first, last, end - start)
+            return
+
+        full_start = -(-start // page_size) * page_size
+        full_end = (end // page_size) * page_size
+
+        if full_start < full_end:
+            self._record(page_size, full_start, full_end, full_end - full_start)
+            partials = [(start, full_start), (full_end, end)]
+        else:
+            # No full block: at most two partial blocks around one boundary
+            boundary = full_start if start < full_start < end else None
+            partials = [(start, boundary), (boundary, end)] if boundary else [(start, end)]
+
+        for part_start, part_end in partials:
+            if part_end <= part_start:
+                continue
+            if self.policy == 'threshold' and (part_end - part_start) / page_size >= self.promotion_threshold:
+                block = (part_start // page_size) * page_size
+                self._record(page_size, block, block + page_size, part_end - part_start)
+            else:
+                self._back(part_start, part_end, level + 1)
+
+    def _record(self, page_size, start, end, used):
+        self.ranges[page_size].append((start, end - start))
+        self.used[page_size] += used
+
+    def report(self, memory_size, tlb_entries=64):
+        """
+        Per size class pages, internal fragmentation, page-table memory and
+        TLB reach, plus totals for the whole layout
+        """
+        entries_per_table = max(min(self.page_sizes) // self.pte_size, 2)
+        size_classes = []
+        remaining_entries = tlb_entries
+        total_pages = 0
+        total_backed = 0
+        total_used = 0
+        total_table_memory = 0
+        tlb_reach = 0
+
+        # Largest pages first: they claim TLB entries before the smaller ones
+        for page_size in self.page_sizes:
+            ranges = sorted(self.ranges[page_size])
+            backed = sum(length for _, length in ranges)
+            pages = backed // page_size
+            # Entries for this class live in tables that each span
+            # entries_per_table pages of this size
+            tables = count_aligned_blocks(ranges, page_size * entries_per_table)
+            table_memory = tables * entries_per_table * self.pte_size
+            cached_pages = min(remaining_entries, pages)
+            remaining_entries -= cached_pages
+
+            size_classes.append({
+                'page_size': page_size,
+                'pages': pages,
+                'ranges': len(ranges),
+                'bytes_backed': backed,
+                'bytes_used': self.used[page_size],
+                'internal_fragmentation': backed - self.used[page_size],
+                'page_tables': tables,
+                'page_table_memory': table_memory,
+                'tlb_reach': tlb_entries * page_size
+            })
+            total_pages += pages
+            total_backed += backed
+            total_used += self.used[page_size]
+            total_table_memory += table_memory
+            tlb_reach += cached_pages * page_size
+
+        return {
+            'policy': self.policy,
+            'page_sizes': self.page_sizes,
+            'size_classes': size_classes,
+            'total_pages': total_pages,
+            'bytes_backed': total_backed,
+            'bytes_used': total_used,
+            'internal_fragmentation': total_backed - total_used,
+            'page_table_memory': total_table_memory,
+            'tlb_entries': tlb_entries,
+            'tlb_reach': tlb_reach,
+            'tlb_coverage': round(min(tlb_reach / total_used, 1) * 100, 2) if total_used else 0,
+            'fits_in_memory': total_backed <= memory_size,
+            'memory_utilization': round(total_backed / memory_size * 100, 2) if memory_size > 0 else 0
+        }
@@ -0,0 +1,194 @@
+import math
+import random
+from array import array
+
+DISTRIBUTIONS = ['fixed', 'uniform', 'normal', 'exponential', 'lognormal']
+# Parameters each distribution needs; a fixed cost takes `value` (or `mean`)
+DISTRIBUTION_PARAMS = {
+    'fixed': [],
+    'uniform': ['low', 'high'],
+    'normal': ['mean', 'stddev'],
+    'exponential': ['mean'],
+    'lognormal': ['mu', 'sigma']
+}
+# Latency config keys holding a cost spec
+COST_FIELDS = ['memoryAccessTime', 'tlbAccessTime', 'pageWalkTime', 'pageFaultServiceTime', 'dirtyWritebackTime']
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def check_cost(spec):
+    """Error message for an invalid cost spec, or None"""
+    if not isinstance(spec, dict):
+        return None if _is_number(spec) else 'must be a number or a distribution spec'
+    distribution = spec.get('distribution', 'fixed')
+    if distribution not in DISTRIBUTIONS:
+        return f'unknown distribution: {distribution}'
+    names = DISTRIBUTION_PARAMS[distribution] or [name for name in ('value', 'mean') if name in spec]
+    for name in names:
+        if not _is_number(spec.get(name)):
+            return f'{distribution} needs a numeric {name}'
+    if distribution == 'uniform' and spec['low'] > spec['high']:
+        return 'uniform needs low <= high'
+    for name in ('stddev', 'sigma'):
+        if name in names and spec[name] < 0:
+            return f'{name} must not be negative'
+    return None
+
+class Cost:
+    """
+    One latency component in nanoseconds: a fixed number, or a distribution
+    spec such as {'distribution': 'normal', 'mean': 100, 'stddev': 10}.
+    Draws are clamped at zero.
+    """
+
+    def __init__(self, spec, rng):
+        if not isinstance(spec, dict):
+            spec = {'distribution': 'fixed', 'value': spec}
+        self.spec = spec
+        self.distribution = spec.get('distribution', 'fixed')
+        self._rng = rng
+
+        if self.distribution == 'uniform':
+            self.mean = (spec['low'] + spec['high']) / 2
+        elif self.distribution == 'lognormal':
+            self.mean = math.exp(spec['mu'] + spec['sigma'] ** 2 / 2)
+        elif self.distribution in ('normal', 'exponential'):
+            self.mean = spec['mean']
+        else:
+            self.mean = spec.get('value', spec.get('mean', 0))
+        self.fixed = self.distribution == 'fixed'
+
+    def sample(self):
+        if self.fixed:
+            return self.mean
+        spec = self.spec
+        rng = self._rng
+        if self.distribution == 'uniform':
+            value = rng.uniform(spec['low'], spec['high'])
+        elif self.distribution == 'normal':
+            value = rng.gauss(spec['mean'], spec['stddev'])
+        elif self.distribution == 'exponential':
+            value = rng.expovariate(1 / spec['mean']) if spec['mean'] > 0 else 0
+        else:
+            value = rng.lognormvariate(spec['mu'], spec['sigma'])
+        return value if value > 0 else 0
+
+class LatencyModel:
+    """
+    Per-access cost model. A TLB lookup (when there is a TLB) is paid by
+    every access; a TLB miss adds a page walk of `walkLevels` levels; a
+    page hit then costs one memory access and a page fault the fault
+    service time, plus a dirty write-back for every page written back
+    while servicing it. Without a TLB the walk is folded into the memory
+    access, as in the original EAT formula.
+    """
+
+    def __init__(self, config=None, tlb_config=None):
+        config = config or {}
+        tlb_config = tlb_config or {}
+        rng = random.Random(config.get('seed', 0))
+        self.memory = Cost(config.get('memoryAccessTime', 100), rng)
+        self.tlb = Cost(config.get('tlbAccessTime', tlb_config.get('accessTime', 10)), rng)
+        self.walk_levels = config.get('walkLevels', tlb_config.get('walkLevels', 1))
+        # One page-walk step reads a page-table entry from memory by default
+        self.walk_step = Cost(config.get('pageWalkTime', config.get('memoryAccessTime', 100)), rng)
+        self.fault = Cost(config.get('pageFaultServiceTime', 8000000), rng)
+        self.writeback = Cost(config.get('dirtyWritebackTime', 0), rng)
+
+    def walk(self):
+        return sum(self.walk_step.sample() for _ in range(self.walk_levels))
+
+    def access_latency(self, tlb_hit, page_fault, writebacks):
+        """Latency of one access; tlb_hit is None when there is no TLB"""
+        latency = 0
+        if tlb_hit is not None:
+            latency += self.tlb.sample()
+            if not tlb_hit:
+                latency += self.walk()
+        latency += self.fault.sample() if page_fault else self.memory.sample()
+        for _ in range(writebacks):
+            latency += self.writeback.sample()
+        return latency
+
+    def means(self):
+        return {
+            'memory_access_time': self.memory.mean,
+            'tlb_access_time': self.tlb.mean,
+            'page_walk_time': self.walk_step.mean * self.walk_levels,
+            'walk_levels': self.walk_levels,
+            'page_fault_service_time': self.fault.mean,
+            'dirty_writeback_time': self.writeback.mean
+        }
+
+class LatencyHistogram:
+    """
+    Fixed-size log-linear histogram (HDR style): values below 32 ns get
+    exact buckets, above that each power of two is split into 16 buckets,
+    so any recorded value is within 1/16 of its bucket's bounds. Values up
+    to 2^48 ns (~3 days) fit; recording is O(1) and memory is constant.
+    """
+    SUB_BUCKET_BITS = 5
+    MAX_BITS = 48
+
+    def __init__(self):
+        self.linear = 1 << self.SUB_BUCKET_BITS
+        self.half = self.linear // 2
+        self.limit = (1 << self.MAX_BITS) - 1
+        self.counts = array('q', bytes(8 * (self.linear + (self.MAX_BITS - self.SUB_BUCKET_BITS) * self.half)))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self.linear:
+            return value
+        shift = value.bit_length() - self.SUB_BUCKET_BITS
+        return self.linear + (shift - 1) * self.half + (value >> shift) - self.half
+
+    def _bounds(self, index):
+        if index < self.linear:
+            return index, index
+        shift = (index - self.linear) // self.half + 1
+        sub = (index - self.linear) % self.half + self.half
+        return sub << shift, ((sub + 1) << shift) - 1
+
+    def record(self, latency):
+        value = min(int(latency), self.limit)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += latency
+        if self.min is None or latency < self.min:
+            self.min = latency
+        if self.max is None or latency > self.max:
+            self.max = latency
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (capped at max)"""
+        if self.count == 0:
+            return 0
+        rank = max(math.ceil(p / 100 * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._bounds(index)[1], self.max)
+        return self.max
+
+    def report(self):
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 2) if self.count else 0,
+            'min': round(self.min, 2) if self.count else 0,
+            'max': round(self.max, 2) if self.count else 0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9),
+            'buckets': [
+                {'lower': lower, 'upper': upper, 'count': count}
+                for index, count in enumerate(self.counts) if count
+                for lower, upper in (self._bounds(index),)
+            ]
+        }
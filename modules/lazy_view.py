@@ -0,0 +1,30 @@
+from collections.abc import Sequence
+
+class LazyView(Sequence):
+    """
+    Read-only sequence that builds entry dicts on access. Entries are never
+    cached, so a full list only exists while the JSON response is written.
+    """
+
+    def __init__(self, length, make_entry):
+        self._length = length
+        self._make_entry = make_entry
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._make_entry(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('index out of range')
+        return self._make_entry(index)
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._make_entry(i)
+
+    def to_json(self):
+        return list(self)
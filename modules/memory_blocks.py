@@ -0,0 +1,108 @@
+from array import array
+
+from modules.lazy_view import LazyView
+
+class MemoryBlockStore:
+    """
+    Compact struct-of-arrays storage for contiguous memory blocks.
+    Block starts, sizes and owners live in parallel array('q') columns and
+    process ids are interned, so a block costs 24 bytes instead of a dict.
+    """
+    FREE = -1
+
+    def __init__(self, memory_size=0):
+        self.starts = array('q')
+        self.sizes = array('q')
+        self.owners = array('q')
+        self.process_ids = []
+        self._process_index = {}
+
+        if memory_size > 0:
+            self.append(0, memory_size)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def intern(self, process_id):
+        """Return the owner index for a process id, adding it if needed"""
+        index = self._process_index.get(process_id)
+        if index is None:
+            index = len(self.process_ids)
+            self.process_ids.append(process_id)
+            self._process_index[process_id] = index
+        return index
+
+    def owner(self, index):
+        """Process id owning block `index`, or None when the block is free"""
+        owner = self.owners[index]
+        return None if owner == self.FREE else self.process_ids[owner]
+
+    def is_free(self, index):
+        return self.owners[index] == self.FREE
+
+    def append(self, start, size, process_id=None):
+        """Append a block at the end of the store"""
+        self.starts.append(start)
+        self.sizes.append(size)
+        self.owners.append(self.FREE if process_id is None else self.intern(process_id))
+
+    def assign(self, index, process_id):
+        """Mark block `index` as owned by a process without resizing it"""
+        self.owners[index] = self.intern(process_id)
+
+    def allocate(self, index, size, process_id):
+        """
+        Assign the first `size` units of free block `index` to a process,
+        splitting the remainder off as a new free block
+        """
+        remaining_size = self.sizes[index] - size
+        self.sizes[index] = size
+        self.assign(index, process_id)
+
+        if remaining_size > 0:
+            self.starts.insert(index + 1, self.starts[index] + size)
+            self.sizes.insert(index + 1, remaining_size)
+            self.owners.insert(index + 1, self.FREE)
+
+    def carve(self, index, size):
+        """
+        Take `size` units off the front of block `index`, dropping the block
+        once it is empty. Used when the store only tracks free holes.
+        """
+        if self.sizes[index] == size:
+            del self.starts[index]
+            del self.sizes[index]
+            del self.owners[index]
+        else:
+            self.starts[index] += size
+            self.sizes[index] -= size
+
+    def free_size(self):
+        """Total size of all free blocks"""
+        return sum(size for size, owner in zip(self.sizes, self.owners) if owner == self.FREE)
+
+    def blocks(self):
+        """Lazy `{start, size, allocated}` view of the blocks"""
+        return LazyView(len(self), self._block_entry)
+
+    def memory_map(self):
+        """Lazy `{start, end, size, process, type}` view of the blocks"""
+        return LazyView(len(self), self._map_entry)
+
+    def _block_entry(self, index):
+        return {
+            'start': self.starts[index],
+            'size': self.sizes[index],
+            'allocated': self.owner(index)
+        }
+
+    def _map_entry(self, index):
+        process = self.owner(index)
+        return {
+            'start': self.starts[index],
+            'end': self.starts[index] + self.sizes[index],
+            'size': self.sizes[index],
+            'process': process,
+            'type': 'allocated' if process else 'free'
+        }
+
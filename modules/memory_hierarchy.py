@@ -0,0 +1,336 @@
+from modules.latency import LatencyHistogram
+from modules.replacement_policies import REPLACEMENT_POLICIES, make_policy
+
+TIER_TYPES = ['cache', 'dram', 'compressed', 'swap']
+
+def default_tiers(physical_size):
+    """
+    A typical hierarchy in nanoseconds: three cache levels, DRAM of
+    `physical_size` bytes, a zswap-like pool of a quarter of that holding
+    pages compressed 3:1, and swap behind everything. Caches are capped at
+    the DRAM size, since they only hold lines of resident pages.
+    """
+    return [
+        {'name': 'L1', 'type': 'cache', 'size': min(32 << 10, physical_size), 'lineSize': 64, 'policy': 'lru',
+         'latency': 1},
+        {'name': 'L2', 'type': 'cache', 'size': min(256 << 10, physical_size), 'lineSize': 64, 'policy': 'lru',
+         'latency': 4},
+        {'name': 'L3', 'type': 'cache', 'size': min(8 << 20, physical_size), 'lineSize': 64, 'policy': 'lru',
+         'latency': 12},
+        {'name': 'DRAM', 'type': 'dram', 'size': physical_size, 'policy': 'clock', 'latency': 100},
+        {'name': 'zswap', 'type': 'compressed', 'size': physical_size // 4, 'compressionRatio': 3,
+         'policy': 'lru', 'latency': 2000, 'writeLatency': 5000},
+        {'name': 'swap', 'type': 'swap', 'latency': 8000000, 'writeLatency': 8000000}
+    ]
+
+class Tier:
+    """
+    One level of the hierarchy: up to `capacity` blocks (cache lines or
+    pages) in a dict, with victims from a replacement policy, so lookups,
+    fills and evictions are all O(1) amortised. Caches are modelled fully
+    associative.
+    """
+
+    def __init__(self, config, block_size, capacity, on_writeback=None):
+        self.name = config['name']
+        self.type = config['type']
+        self.size = config.get('size')
+        self.block_size = block_size
+        self.capacity = capacity
+        self.policy_name = config.get('policy', 'lru')
+        self.policy = make_policy(self.policy_name, capacity, on_writeback=on_writeback) if capacity else None
+        self.latency = config.get('latency', 0)
+        self.write_latency = config.get('writeLatency', self.latency)
+        # Cost of a probe that misses: a cache or DRAM pays its full
+        # latency, a compressed pool only its (negligible) index lookup
+        self.miss_latency = config.get('missLatency', 0 if self.type == 'compressed' else self.latency)
+
+        self.blocks = {}
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        # Latency this tier added to accesses, for the EAT breakdown
+        self.time = 0
+
+    def lookup(self, key):
+        """Probe for a block; its entry on a hit, else None"""
+        self.lookups += 1
+        entry = self.blocks.get(key)
+        if entry is None:
+            self.time += self.miss_latency
+        else:
+            self.hits += 1
+            self.time += self.latency
+            self.touch(key, entry)
+        return entry
+
+    def touch(self, key, entry):
+        entry['reference'] = True
+        self.policy.on_access(key, entry)
+
+    def insert(self, key, dirty=False):
+        """Fill a block; the (key, entry) evicted to make room, or None"""
+        victim = None
+        if len(self.blocks) >= self.capacity:
+            victim_key = self.policy.select_victim(self.blocks)
+            victim = (victim_key, self.blocks.pop(victim_key))
+            self.evictions += 1
+        entry = self.blocks[key] = {'reference': True, 'dirty': dirty}
+        self.policy.on_load(key, entry)
+        return victim
+
+    def remove(self, key):
+        """Drop a block evicted from outside the policy; its entry, or None"""
+        entry = self.blocks.pop(key, None)
+        if entry is not None:
+            self.policy.on_evict(key, entry)
+        return entry
+
+    def stats(self, total_accesses):
+        return {
+            'name': self.name,
+            'type': self.type,
+            'size': self.size,
+            'block_size': self.block_size,
+            'capacity_blocks': self.capacity,
+            'policy': self.policy_name,
+            'latency': self.latency,
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'misses': self.lookups - self.hits,
+            # Local hit rate (of lookups reaching this tier) and the share
+            # of all accesses this tier served
+            'hit_rate': round(self.hits / self.lookups * 100, 2) if self.lookups else 0,
+            'served': round(self.hits / total_accesses * 100, 2) if total_accesses else 0,
+            'evictions': self.evictions,
+            'resident_blocks': len(self.blocks),
+            'eat_contribution': round(self.time / total_accesses, 2) if total_accesses else 0
+        }
+
+class CacheTier(Tier):
+    """
+    Cache of lines indexed by virtual line number, also indexed by page so
+    a page leaving DRAM can take its cached lines with it
+    """
+
+    def __init__(self, config, page_size):
+        line_size = config.get('lineSize', 64)
+        super().__init__(config, line_size, config.get('size', 0) // line_size)
+        self.lines_per_page = page_size // line_size
+        self.by_page = {}
+
+    def insert(self, key, dirty=False):
+        victim = super().insert(key, dirty)
+        page = key // self.lines_per_page
+        lines = self.by_page.get(page)
+        if lines is None:
+            lines = self.by_page[page] = set()
+        lines.add(key)
+        if victim is not None:
+            self._forget(victim[0])
+        return victim
+
+    def _forget(self, line):
+        page = line // self.lines_per_page
+        lines = self.by_page[page]
+        lines.discard(line)
+        if not lines:
+            del self.by_page[page]
+
+    def invalidate_page(self, page):
+        for line in self.by_page.pop(page, ()):
+            self.remove(line)
+
+class MemoryHierarchyEngine:
+    """
+    Accesses cascade through cache levels, DRAM, an optional compressed
+    pool (zswap-like) and swap. A cache hit ends the access; otherwise the
+    line is filled into every cache level that missed. A DRAM miss is
+    served from the compressed pool when the page is there (it is promoted
+    back to DRAM), else read from swap. DRAM victims are compressed into
+    the pool, and only its dirty victims are written to swap; without a
+    pool, dirty DRAM victims go straight to swap.
+
+    Writes mark the page dirty in DRAM (caches are not write-back
+    modelled). Every tier is an O(1)-amortised dict plus replacement
+    policy, so an access costs O(number of tiers) however long the trace.
+    """
+
+    def __init__(self, virtual_size, page_size, tiers):
+        self.virtual_size = virtual_size
+        self.page_size = page_size
+        self.num_virtual_pages = virtual_size // page_size
+        self.tier_configs = tiers
+
+        self.caches = [CacheTier(config, page_size) for config in tiers if config['type'] == 'cache']
+        dram = next(config for config in tiers if config['type'] == 'dram')
+        self.dram = Tier(dram, page_size, dram['size'] // page_size, self._clean)
+        compressed = next((config for config in tiers if config['type'] == 'compressed'), None)
+        if compressed:
+            # Each page is held compressed, so the pool fits ratio times more
+            ratio = compressed.get('compressionRatio', 3)
+            self.compressed = Tier(compressed, page_size, int(compressed.get('size', 0) * ratio) // page_size,
+                                   self._clean)
+            self.compressed.compression_ratio = ratio
+        else:
+            self.compressed = None
+        self.tiers = self.caches + [self.dram] + ([self.compressed] if self.compressed else [])
+        swap = next((config for config in tiers if config['type'] == 'swap'), {'name': 'swap', 'type': 'swap'})
+        self.swap_name = swap['name']
+        self.swap_latency = swap.get('latency', 8000000)
+        self.swap_write_latency = swap.get('writeLatency', self.swap_latency)
+
+        self.total_accesses = 0
+        self.invalid_accesses = 0
+        self.swap_reads = 0
+        self.swap_writes = 0
+        self.swap_time = 0
+        self.compressions = 0
+        self.total_time = 0
+        self.latency = LatencyHistogram()
+
+    def access(self, logical_address, access_type='read'):
+        """Simulate one access through the hierarchy; returns its latency"""
+        page = logical_address // self.page_size
+        if not 0 <= page < self.num_virtual_pages:
+            self.invalid_accesses += 1
+            return 0
+        self.total_accesses += 1
+        dram = self.dram
+        start_time = self._elapsed()
+
+        hit = False
+        missed = []
+        for cache in self.caches:
+            line = logical_address // cache.block_size
+            if cache.lookup(line) is not None:
+                # Caches only hold lines of resident pages; DRAM's policy
+                # still sees the page being used
+                dram.touch(page, dram.blocks[page])
+                hit = True
+                break
+            missed.append((cache, line))
+        if not hit and dram.lookup(page) is None:
+            self._fault(page)
+        for cache, line in missed:
+            cache.insert(line)
+        if access_type == 'write':
+            dram.blocks[page]['dirty'] = True
+
+        latency = self._elapsed() - start_time
+        self.total_time += latency
+        self.latency.record(latency)
+        return latency
+
+    def _fault(self, page):
+        """Bring a page into DRAM from the compressed pool or swap"""
+        dirty = False
+        compressed = self.compressed
+        if compressed is not None and compressed.lookup(page) is not None:
+            # Decompressed back into DRAM; a dirty page stays dirty since
+            # swap never saw its latest contents
+            dirty = compressed.remove(page)['dirty']
+        else:
+            self.swap_reads += 1
+            self.swap_time += self.swap_latency
+
+        victim = self.dram.insert(page, dirty)
+        if victim is not None:
+            victim_page, victim_entry = victim
+            for cache in self.caches:
+                cache.invalidate_page(victim_page)
+            self._demote(victim_page, victim_entry['dirty'])
+        return self.dram.blocks[page]
+
+    def _demote(self, page, dirty):
+        compressed = self.compressed
+        if compressed is None or compressed.capacity == 0:
+            if dirty:
+                self._write_swap()
+            return
+        self.compressions += 1
+        compressed.time += compressed.write_latency
+        victim = compressed.insert(page, dirty)
+        if victim is not None and victim[1]['dirty']:
+            self._write_swap()
+
+    def _write_swap(self):
+        self.swap_writes += 1
+        self.swap_time += self.swap_write_latency
+
+    def _clean(self, page, entry):
+        """A dirty DRAM or pooled page written back ahead of eviction (WSClock)"""
+        self._write_swap()
+
+    def _elapsed(self):
+        return sum(tier.time for tier in self.tiers) + self.swap_time
+
+    def result(self):
+        total_accesses = self.total_accesses
+        tiers = []
+        for tier in self.tiers:
+            stats = tier.stats(total_accesses)
+            if tier is self.compressed:
+                stats['compression_ratio'] = tier.compression_ratio
+                stats['compressions'] = self.compressions
+            tiers.append(stats)
+        tiers.append({
+            'name': self.swap_name,
+            'type': 'swap',
+            'latency': self.swap_latency,
+            'reads': self.swap_reads,
+            'writes': self.swap_writes,
+            # Every swap read serves one access that missed every other tier
+            'served': round(self.swap_reads / total_accesses * 100, 2) if total_accesses else 0,
+            'eat_contribution': round(self.swap_time / total_accesses, 2) if total_accesses else 0
+        })
+
+        return {
+            'virtual_size': self.virtual_size,
+            'page_size': self.page_size,
+            'total_accesses': total_accesses,
+            'invalid_accesses': self.invalid_accesses,
+            'tiers': tiers,
+            'page_faults': self.dram.lookups - self.dram.hits,
+            'swap_reads': self.swap_reads,
+            'swap_writes': self.swap_writes,
+            # Hierarchy-aware EAT: mean latency over every access, i.e. the
+            # sum of each tier's contribution
+            'effective_access_time': round(self.total_time / total_accesses, 2) if total_accesses else 0,
+            'latency': self.latency.report()
+        }
+
+def check_tiers(tiers, page_size):
+    """Error message for an invalid tier list, or None"""
+    if not isinstance(tiers, list):
+        return 'tiers must be a list'
+    counts = {kind: 0 for kind in TIER_TYPES}
+    for config in tiers:
+        if not isinstance(config, dict):
+            return 'Every tier must be an object'
+        kind = config.get('type')
+        if kind not in TIER_TYPES:
+            return f'Unknown tier type: {kind}'
+        if 'name' not in config:
+            return 'Every tier needs a name'
+        name = config['name']
+        counts[kind] += 1
+        for field in ('size', 'lineSize', 'latency', 'writeLatency', 'missLatency', 'compressionRatio'):
+            value = config.get(field, 0)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                return f'{field} of {name} must be a non-negative number'
+        if kind != 'swap' and config.get('policy', 'lru') not in REPLACEMENT_POLICIES:
+            return f"Unknown replacement policy for {name}: {config['policy']}"
+        if kind == 'cache':
+            line_size = config.get('lineSize', 64)
+            if line_size <= 0 or page_size % line_size:
+                return f'Line size of {name} must divide the page size'
+            if config.get('size', 0) < line_size:
+                return f'{name} must hold at least one line'
+        if kind == 'dram' and config.get('size', 0) < page_size:
+            return f'{name} must hold at least one page'
+    if counts['dram'] != 1:
+        return 'The hierarchy needs exactly one dram tier'
+    if counts['compressed'] > 1 or counts['swap'] > 1:
+        return 'At most one compressed tier and one swap tier are allowed'
+    return None
@@ -0,0 +1,297 @@
+import heapq
+import math
+import random
+import statistics
+from bisect import bisect_right
+
+import numpy as np
+
+# Spatial sampling keeps a page when the top HASH_BITS bits of its hash
+# fall below the threshold T, i.e. with rate R = T / MODULUS
+HASH_BITS = 24
+MODULUS = 1 << HASH_BITS
+DEFAULT_SAMPLE_SIZE = 8192
+DEFAULT_GROUPS = 16
+DEFAULT_CACHE_SIZES = [1 << i for i in range(41)]
+
+BENCHMARK_TRACES = ['zipf', 'loop', 'phases', 'uniform']
+# The exact curve each benchmark compares against is the slow part, so a
+# request runs at most this many references per trace
+MAX_BENCHMARK_LENGTH = 1000000
+
+def spatial_hash(pages):
+    """splitmix64 finaliser over an array of page numbers (uint64, wraps)"""
+    with np.errstate(over='ignore'):
+        z = pages.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+class StackDistanceCounter:
+    """
+    LRU stack distances in O(log n): each tracked page keeps the time of
+    its last reference, and a Fenwick tree over those times counts how many
+    distinct pages were referenced since. Times are renumbered when the tree
+    fills up, so memory is proportional to the tracked pages, not the trace.
+    """
+
+    def __init__(self, capacity=1024):
+        self.last = {}
+        self.time = 1
+        self.capacity = capacity
+        self.tree = [0] * (capacity + 1)
+
+    def _add(self, index, delta):
+        tree = self.tree
+        while index <= self.capacity:
+            tree[index] += delta
+            index += index & -index
+
+    def _prefix(self, index):
+        tree = self.tree
+        total = 0
+        while index:
+            total += tree[index]
+            index &= index - 1
+        return total
+
+    def _compact(self):
+        pages = sorted(self.last, key=self.last.get)
+        self.capacity = max(2 * (len(pages) + 1), 1024)
+        # Renumbered in place: callers may hold on to the dict
+        self.last.update((page, time) for time, page in enumerate(pages, 1))
+        self.time = len(pages) + 1
+        # Linear-time Fenwick build over the renumbered times
+        tree = self.tree = [0] + [1] * len(pages) + [0] * (self.capacity - len(pages))
+        for index in range(1, self.capacity + 1):
+            parent = index + (index & -index)
+            if parent <= self.capacity:
+                tree[parent] += tree[index]
+
+    def reference(self, page):
+        """Reference a page; its stack distance, or None on first reference"""
+        if self.time > self.capacity:
+            self._compact()
+        previous = self.last.get(page)
+        if previous is None:
+            distance = None
+        else:
+            distance = len(self.last) - self._prefix(previous)
+            self._add(previous, -1)
+        self.last[page] = self.time
+        self._add(self.time, 1)
+        self.time += 1
+        return distance
+
+    def remove(self, page):
+        """Stop tracking a page (it leaves the sample)"""
+        self._add(self.last.pop(page), -1)
+
+class ShardsEstimator:
+    """
+    LRU miss-ratio curve from spatially hashed sampling (SHARDS). A page
+    is sampled when its hash falls below the threshold, so every reference
+    to a sampled page is seen and stack distances among sampled pages,
+    scaled by 1/R, estimate the true ones. With a fixed `rate` memory grows
+    with R times the distinct pages; with `sample_size` at most that many
+    pages are tracked and the threshold drops (evicting the page with the
+    largest hash) whenever the sample overflows.
+
+    Each reference is weighted by 1/R at the time it was seen and binned
+    against the requested cache sizes, split across `groups` hash-disjoint
+    subsamples whose spread gives a rough error bar for every point.
+    """
+
+    FEED_SLICE = 16384
+
+    def __init__(self, cache_sizes=None, rate=None, sample_size=None, groups=DEFAULT_GROUPS, adjust=True):
+        self.cache_sizes = sorted(set(cache_sizes or DEFAULT_CACHE_SIZES))
+        self.fixed_size = rate is None
+        self.sample_size = sample_size or DEFAULT_SAMPLE_SIZE
+        self.threshold = MODULUS if self.fixed_size else max(1, min(MODULUS, round(rate * MODULUS)))
+        self.groups = groups
+        self.adjust = adjust
+
+        self.counter = StackDistanceCounter()
+        # Max-heap of (-hash, page) over tracked pages, for fixed-size eviction
+        self.heap = []
+        bins = len(self.cache_sizes) + 1
+        self.histograms = [[0.0] * bins for _ in range(groups)]
+        self.references = 0
+        self.sampled_references = 0
+
+    @property
+    def rate(self):
+        return self.threshold / MODULUS
+
+    def feed(self, pages):
+        """Offer a chunk of page numbers (any int sequence or array)"""
+        pages = np.asarray(pages, dtype=np.int64)
+        # Small slices, so a fixed-size sample's falling threshold soon
+        # filters references in NumPy rather than in the loop
+        step = self.FEED_SLICE if self.fixed_size else len(pages)
+        for start in range(0, len(pages), max(step, 1)):
+            self._feed(pages[start:start + step])
+
+    def _feed(self, pages):
+        self.references += len(pages)
+        hashes = spatial_hash(pages)
+        keys = hashes >> np.uint64(64 - HASH_BITS)
+        # The threshold only falls, so filtering on its current value keeps
+        # a superset of what is sampled; each survivor is re-checked below
+        selected = keys < np.uint64(self.threshold)
+        group_mask = np.uint64(self.groups - 1)
+        self._sample(
+            pages[selected].tolist(), keys[selected].tolist(),
+            (hashes[selected] & group_mask).tolist() if self.groups & (self.groups - 1) == 0
+            else (hashes[selected] % np.uint64(self.groups)).tolist()
+        )
+
+    def _sample(self, pages, keys, groups):
+        counter = self.counter
+        last = counter.last
+        cache_sizes = self.cache_sizes
+        cold_bin = len(cache_sizes)
+        histograms = self.histograms
+        for page, key, group in zip(pages, keys, groups):
+            if key >= self.threshold:
+                continue
+            if self.fixed_size and page not in last:
+                heapq.heappush(self.heap, (-key, page))
+            distance = counter.reference(page)
+            rate = self.threshold / MODULUS
+            self.sampled_references += 1
+            if distance is None:
+                bin_index = cold_bin
+            else:
+                bin_index = bisect_right(cache_sizes, distance / rate)
+            histograms[group][bin_index] += 1 / rate
+            if self.fixed_size and len(last) > self.sample_size:
+                self._lower_threshold()
+
+    def _lower_threshold(self):
+        """Evict the largest-hash pages and make their hash the new threshold"""
+        heap = self.heap
+        key = -heap[0][0]
+        while heap and -heap[0][0] == key:
+            self.counter.remove(heapq.heappop(heap)[1])
+        self.threshold = key
+
+    def curve(self, confidence=0.95):
+        """
+        MRC points with an error bound per point: z (for `confidence`)
+        times the random-groups standard error of the per-group estimates.
+        It measures sampling spread only and is not a confidence interval.
+        A group's estimate is far from normal when a few hot pages dominate
+        (all of a page's references land in one group), and the shared
+        SHARDS bias is invisible to the spread. Measured coverage is below
+        nominal on skewed traces (about 65% for zipf at rate 0.1), so read
+        lower/upper as a scale of the error, and see benchmark_mrc's
+        bound_coverage for how often it holds.
+        """
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+        if self.adjust:
+            # SHARDS_adj: the weighted sample should add up to the N
+            # references seen; the shortfall or excess is put down to reuse
+            # at the smallest distances, so misses are divided by N (and
+            # each group's by N / groups) rather than by the sample weight
+            histograms = self.histograms
+            denominators = [self.references / self.groups] * self.groups
+        else:
+            histograms = [histogram for histogram in self.histograms if sum(histogram)]
+            denominators = [sum(histogram) for histogram in histograms]
+        weight = sum(denominators)
+
+        exact = self.threshold == MODULUS
+        group_misses = [sum(histogram) for histogram in histograms]
+        points = []
+        for index, cache_size in enumerate(self.cache_sizes):
+            # A reference misses a cache of c pages when its distance is >= c
+            for g, histogram in enumerate(histograms):
+                group_misses[g] -= histogram[index]
+            miss_ratio = min(max(sum(group_misses) / weight, 0), 1) if weight else 0
+            if exact or len(histograms) < 2:
+                bound = 0
+            else:
+                estimates = [misses / total for misses, total in zip(group_misses, denominators)]
+                bound = z * statistics.stdev(estimates) / math.sqrt(len(histograms))
+            points.append({
+                'cache_size': cache_size,
+                'miss_ratio': round(miss_ratio, 6),
+                'error_bound': round(bound, 6),
+                'lower': round(max(miss_ratio - bound, 0), 6),
+                'upper': round(min(miss_ratio + bound, 1), 6)
+            })
+        return points
+
+    def distinct_pages(self):
+        """Estimated number of distinct pages in the trace"""
+        return round(len(self.counter.last) / self.rate) if self.references else 0
+
+    def report(self, confidence=0.95, trim=True):
+        curve = self.curve(confidence)
+        distinct = self.distinct_pages()
+        if trim:
+            # Past the estimated footprint only cold misses remain
+            end = next((i for i, point in enumerate(curve) if point['cache_size'] >= distinct), len(curve) - 1)
+            curve = curve[:end + 1]
+        return {
+            'mode': 'fixed_size' if self.fixed_size else 'fixed_rate',
+            'rate': self.rate,
+            'sample_size': self.sample_size if self.fixed_size else None,
+            'tracked_pages': len(self.counter.last),
+            'total_references': self.references,
+            'sampled_references': self.sampled_references,
+            'estimated_distinct_pages': distinct,
+            'confidence': confidence,
+            'curve': curve
+        }
+
+def exact_mrc(chunks, cache_sizes=None):
+    """Exact LRU miss-ratio curve: SHARDS with every page sampled"""
+    estimator = ShardsEstimator(cache_sizes, rate=1, groups=1, adjust=False)
+    for chunk in chunks:
+        estimator.feed(chunk)
+    return estimator
+
+def compare_curves(estimate, exact):
+    """Absolute error of an estimated curve against the exact one"""
+    errors = [abs(e['miss_ratio'] - x['miss_ratio']) for e, x in zip(estimate, exact)]
+    covered = sum(
+        1 for e, x in zip(estimate, exact) if e['lower'] - 1e-9 <= x['miss_ratio'] <= e['upper'] + 1e-9
+    )
+    return {
+        'mean_absolute_error': round(sum(errors) / len(errors), 6) if errors else 0,
+        'max_absolute_error': round(max(errors), 6) if errors else 0,
+        'bound_coverage': round(covered / len(errors) * 100, 2) if errors else 0,
+        'points': [
+            {'cache_size': e['cache_size'], 'estimate': e['miss_ratio'], 'exact': x['miss_ratio'],
+             'error_bound': e['error_bound'], 'absolute_error': round(error, 6)}
+            for e, x, error in zip(estimate, exact, errors)
+        ]
+    }
+
+def benchmark_trace(name, length, pages, seed=0):
+    """
+    Seeded synthetic page-reference traces used to measure SHARDS error:
+      zipf    - skewed popularity (alpha 0.9) over `pages` pages
+      loop    - cyclic scans over `pages` pages
+      phases  - four working sets of pages/8 pages with 90% locality
+      uniform - uniform references over `pages` pages
+    """
+    rng = np.random.default_rng(random.Random(f'{name}:{seed}').getrandbits(64))
+    if name == 'loop':
+        return np.arange(length, dtype=np.int64) % pages
+    if name == 'uniform':
+        return rng.integers(0, pages, length, dtype=np.int64)
+    if name == 'phases':
+        working = max(pages // 8, 1)
+        phase = np.arange(length) * 4 // max(length, 1)
+        local = rng.integers(0, working, length) + phase * working * 2
+        scattered = rng.integers(0, pages, length)
+        return np.where(rng.random(length) < 0.9, local, scattered).astype(np.int64)
+    ranks = np.arange(1, pages + 1, dtype=np.float64)
+    weights = ranks ** -0.9
+    # Scatter ranks over page numbers so popularity is not spatially ordered
+    order = rng.permutation(pages)
+    return order[rng.choice(pages, length, p=weights / weights.sum())].astype(np.int64)
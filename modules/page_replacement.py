@@ -1,25 +1,90 @@
+import copy
 import time
 
+import numpy as np
+
+from modules.mrc import BENCHMARK_TRACES, MAX_BENCHMARK_LENGTH, ShardsEstimator, benchmark_trace, compare_curves, exact_mrc
+from modules.session_store import SessionStore, unknown_session
+from modules.trace_reader import TRACE_FORMATS, read_trace
+
+class ReplacementRun:
+    """
+    Resumable state of one FIFO, LRU or LFU run. References are fed one at
+    a time through step(), so a run kept between requests can be continued
+    where it stopped; the optimal algorithm looks ahead and so cannot be.
+    """
+    
+    def __init__(self, algorithm, frame_count):
+        self.algorithm = algorithm
+        self.frame_count = frame_count
+        self.frames = []
+        # Load order for FIFO, recency order for LRU
+        self.order = []
+        self.frequency = {}
+        self.page_faults = 0
+        self.total_references = 0
+    
+    def step(self, page, frequency_delta=False):
+        """
+        Reference one page and return its page_sequence entry. An LFU entry
+        carries the whole frequency table, or with `frequency_delta` only
+        the referenced page's count (appended steps, where the table comes
+        once with the totals)
+        """
+        self.total_references += 1
+        frames = self.frames
+        if self.algorithm == 'lfu':
+            self.frequency[page] = self.frequency.get(page, 0) + 1
+        
+        fault = page not in frames
+        if fault:
+            self.page_faults += 1
+            if len(frames) < self.frame_count:
+                frames.append(page)
+                if self.algorithm != 'lfu':
+                    self.order.append(page)
+            elif self.algorithm == 'lfu':
+                # Replace the least frequently used page
+                frames.remove(min(frames, key=lambda p: self.frequency[p]))
+                frames.append(page)
+            else:
+                # Replace the oldest (FIFO) or least recently used (LRU) page
+                frames.remove(self.order.pop(0))
+                frames.append(page)
+                self.order.append(page)
+        elif self.algorithm == 'lru':
+            # Update recent usage
+            self.order.remove(page)
+            self.order.append(page)
+        
+        entry = {
+            'page': page,
+            'frames': frames.copy(),
+            'fault': fault
+        }
+        if self.algorithm == 'lfu':
+            entry['frequency'] = {page: self.frequency[page]} if frequency_delta else self.frequency.copy()
+        return entry
+
 class PageReplacementSimulator:
-    def __init__(self):
-        pass
+    def __init__(self, max_sessions=32, session_ttl=900):
+        # FIFO/LRU/LFU runs are kept so references can be appended later
+        self.sessions = SessionStore(max_sessions, session_ttl)
     
-    def simulate(self, algorithm, reference_string, frame_count):
+    def simulate(self, algorithm, reference_string, frame_count, keep_session=True):
         """
-        Simulate page replacement algorithm
+        Simulate page replacement algorithm. FIFO, LRU and LFU runs are
+        kept as a session (unless keep_session is False) for append()
         """
         start_time = time.perf_counter()
         
-        if algorithm == 'fifo':
-            result = self._fifo(reference_string, frame_count)
-        elif algorithm == 'lru':
-            result = self._lru(reference_string, frame_count)
-        elif algorithm == 'lfu':
-            result = self._lfu(reference_string, frame_count)
-        elif algorithm == 'optimal':
+        run = None
+        if algorithm == 'optimal':
             result = self._optimal(reference_string, frame_count)
         else:
-            result = self._fifo(reference_string, frame_count)
+            # Unknown algorithms fall back to FIFO
+            run = ReplacementRun(algorithm if algorithm in ('lru', 'lfu') else 'fifo', frame_count)
+            result = self._run(run, reference_string)
         
         end_time = time.perf_counter()
         execution_time = (end_time - start_time) * 1000000  # Convert to milliseconds
@@ -37,138 +102,73 @@ class PageReplacementSimulator:
         result['hit_ratio'] = round(hit_ratio, 2)
         result['fault_ratio'] = round(fault_ratio, 2)
         result['execution_time'] = round(execution_time, 2)
+        if run is not None and keep_session:
+            result['session_id'] = self.sessions.create(run)
         
         return result
     
-    def _fifo(self, reference_string, frame_count):
-        """
-        First In First Out (FIFO) page replacement
-        """
-        frames = []
-        page_faults = 0
-        page_sequence = []
-        queue = []
-        
-        for page in reference_string:
-            if page not in frames:
-                page_faults += 1
-                if len(frames) < frame_count:
-                    frames.append(page)
-                    queue.append(page)
-                else:
-                    # Replace the oldest page (first in queue)
-                    old_page = queue.pop(0)
-                    frames.remove(old_page)
-                    frames.append(page)
-                    queue.append(page)
-                
-                page_sequence.append({
-                    'page': page,
-                    'frames': frames.copy(),
-                    'fault': True
-                })
-            else:
-                page_sequence.append({
-                    'page': page,
-                    'frames': frames.copy(),
-                    'fault': False
-                })
-        
-        return {
-            'page_faults': page_faults,
+    def _run(self, run, reference_string):
+        page_sequence = [run.step(page) for page in reference_string]
+        result = {
+            'page_faults': run.page_faults,
             'page_sequence': page_sequence,
-            'final_frames': frames
+            'final_frames': run.frames
         }
+        if run.algorithm == 'lfu':
+            result['frequency'] = run.frequency
+        return result
     
-    def _lru(self, reference_string, frame_count):
+    def append(self, session_id, reference_string):
         """
-        Least Recently Used (LRU) page replacement
+        Continue a stored fifo/lru/lfu run with more references. Only the
+        new steps are returned, with the updated totals, so the cost is
+        proportional to the appended length rather than the whole string.
         """
-        frames = []
-        page_faults = 0
-        page_sequence = []
-        recent_usage = []
-        
-        for page in reference_string:
-            if page not in frames:
-                page_faults += 1
-                if len(frames) < frame_count:
-                    frames.append(page)
-                    recent_usage.append(page)
-                else:
-                    # Replace the least recently used page
-                    lru_page = recent_usage.pop(0)
-                    frames.remove(lru_page)
-                    frames.append(page)
-                    recent_usage.append(page)
-                
-                page_sequence.append({
-                    'page': page,
-                    'frames': frames.copy(),
-                    'fault': True
-                })
-            else:
-                # Update recent usage
-                recent_usage.remove(page)
-                recent_usage.append(page)
-                
-                page_sequence.append({
-                    'page': page,
-                    'frames': frames.copy(),
-                    'fault': False
-                })
-        
-        return {
-            'page_faults': page_faults,
-            'page_sequence': page_sequence,
-            'final_frames': frames
-        }
+        with self.sessions.use(session_id) as run:
+            if run is None:
+                return unknown_session(session_id)
+            
+            start_time = time.perf_counter()
+            start = run.total_references
+            page_sequence = [run.step(page, frequency_delta=True) for page in reference_string]
+            execution_time = (time.perf_counter() - start_time) * 1000000
+            
+            total_references = run.total_references
+            page_hits = total_references - run.page_faults
+            result = {
+                'session_id': session_id,
+                'algorithm': run.algorithm,
+                'start_index': start,
+                'appended': len(reference_string),
+                'page_sequence': page_sequence,
+                'page_faults': run.page_faults,
+                'total_references': total_references,
+                'page_hits': page_hits,
+                'hit_ratio': round(page_hits / total_references * 100, 2) if total_references > 0 else 0,
+                'fault_ratio': round(run.page_faults / total_references * 100, 2) if total_references > 0 else 0,
+                # Copies: the run may be resumed again while this is serialised
+                'final_frames': list(run.frames),
+                'execution_time': round(execution_time, 2)
+            }
+            if run.algorithm == 'lfu':
+                result['frequency'] = dict(run.frequency)
+            return result
     
-    def _lfu(self, reference_string, frame_count):
+    def checkpoint(self, session_id):
         """
-        Least Frequently Used (LFU) page replacement
+        Snapshot a stored run under a new session id; appending to either
+        one leaves the other untouched
         """
-        frames = []
-        page_faults = 0
-        page_sequence = []
-        frequency = {}
-        
-        for page in reference_string:
-            # Update frequency
-            if page in frequency:
-                frequency[page] += 1
-            else:
-                frequency[page] = 1
-            
-            if page not in frames:
-                page_faults += 1
-                if len(frames) < frame_count:
-                    frames.append(page)
-                else:
-                    # Replace the least frequently used page
-                    lfu_page = min(frames, key=lambda p: frequency[p])
-                    frames.remove(lfu_page)
-                    frames.append(page)
-                
-                page_sequence.append({
-                    'page': page,
-                    'frames': frames.copy(),
-                    'fault': True,
-                    'frequency': frequency.copy()
-                })
-            else:
-                page_sequence.append({
-                    'page': page,
-                    'frames': frames.copy(),
-                    'fault': False,
-                    'frequency': frequency.copy()
-                })
-        
+        with self.sessions.use(session_id) as run:
+            if run is None:
+                return unknown_session(session_id)
+            snapshot = copy.deepcopy(run)
         return {
-            'page_faults': page_faults,
-            'page_sequence': page_sequence,
-            'final_frames': frames,
-            'frequency': frequency
+            'session_id': session_id,
+            'checkpoint_id': self.sessions.create(snapshot),
+            'algorithm': snapshot.algorithm,
+            'total_references': snapshot.total_references,
+            'success': True
         }
     
     def _optimal(self, reference_string, frame_count):
@@ -226,7 +226,7 @@ class PageReplacementSimulator:
         results = {}
         
         for algo in algorithms:
-            result = self.simulate(algo, reference_string, frame_count)
+            result = self.simulate(algo, reference_string, frame_count, keep_session=False)
             results[algo] = {
                 'algorithm': algo,
                 'page_faults': result['page_faults'],
@@ -244,4 +244,104 @@ class PageReplacementSimulator:
         
         results['best_algorithm'] = best_algo
         
-        return results
\ No newline at end of file
+        return results
+    
+    def estimate_mrc(self, reference_string, rate=None, sample_size=None, cache_sizes=None,
+                     confidence=0.95, adjust=True, compare_exact=False):
+        """
+        Approximate LRU miss-ratio curve (miss ratio for every cache size)
+        by SHARDS spatial sampling, at a fixed `rate` or with a fixed-size
+        sample of `sample_size` pages (the default). compare_exact also runs
+        the exact curve and reports the measured error. Each point's
+        error_bound is sampling spread, not a confidence interval (see
+        ShardsEstimator.curve).
+        """
+        return self._estimate_mrc(lambda: [reference_string], rate, sample_size, cache_sizes,
+                                  confidence, adjust, compare_exact)
+    
+    def estimate_trace_mrc(self, trace_path, trace_format='lackey', page_size=4096, include_instructions=True,
+                           rate=None, sample_size=None, cache_sizes=None, confidence=0.95, adjust=True,
+                           compare_exact=False):
+        """
+        Miss-ratio curve of a memory trace file, streamed in chunks so only
+        the sample is held in memory
+        """
+        if trace_format not in TRACE_FORMATS:
+            return {'trace_format': trace_format, 'error': f'Unknown trace format: {trace_format}', 'success': False}
+        
+        def chunks():
+            for addresses, _ in read_trace(trace_path, trace_format, include_instructions):
+                yield (np.asarray(addresses, dtype=np.uint64) // np.uint64(page_size)).astype(np.int64)
+        
+        result = self._estimate_mrc(chunks, rate, sample_size, cache_sizes, confidence, adjust, compare_exact)
+        result['trace_format'] = trace_format
+        result['page_size'] = page_size
+        return result
+    
+    def _estimate_mrc(self, chunks, rate, sample_size, cache_sizes, confidence, adjust, compare_exact):
+        if rate is not None and not 0 < rate <= 1:
+            return {'rate': rate, 'error': 'Sampling rate must be in (0, 1]', 'success': False}
+        if sample_size is not None and sample_size < 1:
+            return {'sample_size': sample_size, 'error': 'Sample size must be positive', 'success': False}
+        if not 0 < confidence < 1:
+            return {'confidence': confidence, 'error': 'Confidence must be in (0, 1)', 'success': False}
+        
+        start_time = time.perf_counter()
+        estimator = ShardsEstimator(cache_sizes, rate, sample_size, adjust=adjust)
+        for chunk in chunks():
+            estimator.feed(chunk)
+        result = estimator.report(confidence, trim=cache_sizes is None)
+        result['algorithm'] = 'lru'
+        result['execution_time'] = round((time.perf_counter() - start_time) * 1000000, 2)
+        
+        if compare_exact:
+            start_time = time.perf_counter()
+            exact = exact_mrc(chunks(), cache_sizes).curve()[:len(result['curve'])]
+            exact_time = (time.perf_counter() - start_time) * 1000000
+            result['exact'] = compare_curves(result['curve'], exact)
+            result['exact']['execution_time'] = round(exact_time, 2)
+            result['exact']['speedup'] = round(exact_time / result['execution_time'], 2) if result['execution_time'] else None
+        return result
+    
+    def benchmark_mrc(self, length=200000, pages=50000, rate=0.01, sample_size=None, confidence=0.95,
+                      adjust=True, seed=0, traces=None):
+        """
+        Measured SHARDS error against exact curves on the seeded synthetic
+        benchmark traces (see modules.mrc.benchmark_trace). The defaults
+        sample 1% of a footprint far larger than the fixed-size sample, so
+        the error and speedup reflect sampling; pass rate=None for the
+        fixed-size mode.
+        """
+        if not 0 < length <= MAX_BENCHMARK_LENGTH:
+            return {'length': length, 'error': f'Benchmark length must be 1 to {MAX_BENCHMARK_LENGTH}', 'success': False}
+        traces = traces or BENCHMARK_TRACES
+        for name in traces:
+            if name not in BENCHMARK_TRACES:
+                return {'trace': name, 'error': f'Unknown benchmark trace: {name}', 'success': False}
+        
+        results = {}
+        for name in traces:
+            reference_string = benchmark_trace(name, length, pages, seed)
+            result = self.estimate_mrc(reference_string, rate, sample_size, None, confidence, adjust, True)
+            if 'error' in result:
+                return result
+            exact = result['exact']
+            results[name] = {
+                'mean_absolute_error': exact['mean_absolute_error'],
+                'max_absolute_error': exact['max_absolute_error'],
+                'bound_coverage': exact['bound_coverage'],
+                'rate': result['rate'],
+                'tracked_pages': result['tracked_pages'],
+                'execution_time': result['execution_time'],
+                'exact_execution_time': exact['execution_time'],
+                'speedup': exact['speedup'],
+                'points': exact['points']
+            }
+        
+        return {
+            'length': length,
+            'pages': pages,
+            'mode': 'fixed_rate' if rate is not None else 'fixed_size',
+            'seed': seed,
+            'traces': results
+        }
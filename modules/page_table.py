@@ -0,0 +1,83 @@
+from array import array
+from bisect import bisect_right
+
+from modules.lazy_view import LazyView
+
+class RangePageTable:
+    """
+    Run-length encoded page table. Each run maps a contiguous range of pages
+    to a contiguous range of frames (or marks it not resident), so a
+    million-page process with a simple layout costs a handful of integers.
+    Per-page entries are only built when a client pages through them.
+    """
+    NOT_RESIDENT = -1
+
+    def __init__(self, num_pages, page_size):
+        self.num_pages = num_pages
+        self.page_size = page_size
+        self.run_starts = array('q')
+        self.run_frames = array('q')
+        self._mapped_pages = 0
+
+    def __len__(self):
+        return self.num_pages
+
+    def map_range(self, count, first_frame=None):
+        """
+        Map the next `count` pages to frames starting at `first_frame`,
+        or mark them not resident when `first_frame` is None
+        """
+        if count <= 0:
+            return
+        self.run_starts.append(self._mapped_pages)
+        self.run_frames.append(self.NOT_RESIDENT if first_frame is None else first_frame)
+        self._mapped_pages += count
+
+    def _run_end(self, run):
+        return self.run_starts[run + 1] if run + 1 < len(self.run_starts) else self._mapped_pages
+
+    def frame_of(self, page_number):
+        """Frame holding `page_number`, or None when it is not resident"""
+        if not 0 <= page_number < self._mapped_pages:
+            return None
+        run = bisect_right(self.run_starts, page_number) - 1
+        first_frame = self.run_frames[run]
+        if first_frame == self.NOT_RESIDENT:
+            return None
+        return first_frame + (page_number - self.run_starts[run])
+
+    def frames_used(self):
+        """Number of resident pages, from run lengths"""
+        return sum(
+            self._run_end(run) - self.run_starts[run]
+            for run in range(len(self.run_starts))
+            if self.run_frames[run] != self.NOT_RESIDENT
+        )
+
+    def entry(self, page_number):
+        frame_number = self.frame_of(page_number)
+        return {
+            'page_number': page_number,
+            'frame_number': frame_number,
+            'valid': frame_number is not None,
+            'page_address': page_number * self.page_size,
+            'physical_address': frame_number * self.page_size if frame_number is not None else None
+        }
+
+    def entries(self):
+        """Lazy per-page view in the classic page_table format"""
+        return LazyView(self.num_pages, self.entry)
+
+    def ranges(self):
+        """Compact run list: one dict per contiguous mapping"""
+        ranges = []
+        for run in range(len(self.run_starts)):
+            first_frame = self.run_frames[run]
+            resident = first_frame != self.NOT_RESIDENT
+            ranges.append({
+                'first_page': self.run_starts[run],
+                'page_count': self._run_end(run) - self.run_starts[run],
+                'first_frame': first_frame if resident else None,
+                'valid': resident
+            })
+        return ranges
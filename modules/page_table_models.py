@@ -0,0 +1,136 @@
+import math
+
+PAGE_TABLE_MODES = {
+    'single': 1,
+    'two_level': 2,
+    'four_level': 4,
+    'inverted': None
+}
+
+def count_aligned_blocks(regions, span):
+    """Distinct aligned `span`-sized blocks touched by sorted (start, size) regions"""
+    count = 0
+    last_block = -1
+    for start, size in regions:
+        first = start // span
+        last = (start + size - 1) // span
+        if last <= last_block:
+            continue
+        count += last - max(first, last_block + 1) + 1
+        last_block = last
+    return count
+
+class PageTableModel:
+    """
+    Analytic page-table overhead model. Table counts are derived from the
+    mapped virtual regions (sparse occupancy), never by allocating entries,
+    so address spaces far too large to enumerate can be sized.
+    """
+
+    def __init__(self, pte_size=8, memory_access_time=100):
+        self.pte_size = pte_size
+        self.memory_access_time = memory_access_time
+
+    def analyze(self, mode, page_size, regions, physical_size, virtual_address_bits=None):
+        """
+        Page-table memory, walk depth and translation cost for `regions`,
+        a list of {'start', 'size'} virtual ranges in bytes
+        """
+        if mode not in PAGE_TABLE_MODES:
+            return {'mode': mode, 'error': f'Unknown page table mode: {mode}', 'success': False}
+
+        offset_bits = max(math.ceil(math.log2(page_size)), 0)
+        entries_per_table = max(page_size // self.pte_size, 2)
+        level_bits = int(math.log2(entries_per_table))
+        regions = sorted((r['start'], r['size']) for r in regions if r['size'] > 0)
+        mapped_pages = count_aligned_blocks(regions, page_size)
+        num_frames = physical_size // page_size
+
+        levels = PAGE_TABLE_MODES[mode]
+        if virtual_address_bits is None:
+            # Wide enough for the highest mapped byte, and for at least one
+            # VPN bit (a full index at every level of a multi-level table)
+            highest = max((start + size for start, size in regions), default=page_size)
+            span_bits = math.ceil(math.log2(highest)) if highest > 1 else 0
+            if levels and levels > 1:
+                virtual_address_bits = max(offset_bits + levels * level_bits, span_bits)
+            else:
+                virtual_address_bits = max(span_bits, offset_bits + 1)
+        vpn_bits = virtual_address_bits - offset_bits
+        if any(start + size > (1 << virtual_address_bits) for start, size in regions):
+            return {
+                'mode': mode,
+                'error': f'Region exceeds the {virtual_address_bits}-bit address space',
+                'success': False
+            }
+
+        if mode == 'inverted':
+            return self._inverted(virtual_address_bits, vpn_bits, mapped_pages, num_frames)
+
+        top_bits = vpn_bits - (levels - 1) * level_bits
+        if top_bits < 1:
+            return {
+                'mode': mode,
+                'error': f'{virtual_address_bits}-bit address space is too small for {levels} levels',
+                'success': False
+            }
+
+        # Each table at a level covers a span of 2^(bits below it) bytes;
+        # tables exist only for spans that contain at least one mapped page
+        level_details = []
+        total_tables = 0
+        overhead = 0
+        for level in range(levels):
+            index_bits = top_bits if level == 0 else level_bits
+            lower_bits = offset_bits + (levels - 1 - level) * level_bits
+            span = 1 << (lower_bits + index_bits)
+            tables = 1 if level == 0 else count_aligned_blocks(regions, span)
+            table_size = (1 << index_bits) * self.pte_size
+            level_details.append({
+                'level': level + 1,
+                'index_bits': index_bits,
+                'entries_per_table': 1 << index_bits,
+                'tables': tables,
+                'bytes': tables * table_size
+            })
+            total_tables += tables
+            overhead += tables * table_size
+
+        return self._report(mode, virtual_address_bits, offset_bits, mapped_pages, levels, overhead, {
+            'levels': level_details,
+            'total_tables': total_tables
+        })
+
+    def _inverted(self, virtual_address_bits, vpn_bits, mapped_pages, num_frames):
+        """Inverted table (one entry per frame) with a hash anchor table"""
+        # Entry holds pid + VPN + chain pointer; the anchor table is sized to
+        # the next power of two above the frame count
+        entry_size = 2 * self.pte_size
+        anchor_entries = 1 << max(num_frames - 1, 0).bit_length()
+        resident = min(mapped_pages, num_frames)
+        load_factor = resident / anchor_entries if anchor_entries else 0
+        # Anchor read plus expected chain probes for a successful lookup
+        walk_depth = 1 + (1 + load_factor / 2)
+        overhead = num_frames * entry_size + anchor_entries * self.pte_size
+
+        offset_bits = virtual_address_bits - vpn_bits
+        return self._report('inverted', virtual_address_bits, offset_bits, mapped_pages, walk_depth, overhead, {
+            'inverted_entries': num_frames,
+            'anchor_entries': anchor_entries,
+            'load_factor': round(load_factor, 4)
+        })
+
+    def _report(self, mode, virtual_address_bits, offset_bits, mapped_pages, walk_depth, overhead, details):
+        translation_cost = walk_depth * self.memory_access_time
+        return {
+            'mode': mode,
+            'virtual_address_bits': virtual_address_bits,
+            'offset_bits': offset_bits,
+            'mapped_pages': mapped_pages,
+            'page_table_overhead': overhead,
+            'overhead_per_mapped_page': round(overhead / mapped_pages, 2) if mapped_pages else 0,
+            'walk_depth': round(walk_depth, 4),
+            'translation_cost': round(translation_cost, 2),
+            'effective_access_time': round(translation_cost + self.memory_access_time, 2),
+            **details
+        }
@@ -1,10 +1,21 @@
 import math
 
+import numpy as np
+
+from modules.page_table import RangePageTable
+from modules.page_table_models import PageTableModel
+from modules.tlb import TLB, TLB_REPLACEMENTS
+from modules.hole_index import HoleIndex
+from modules.huge_pages import MixedPageLayout, PROMOTION_POLICIES
+from modules.session_store import SessionStore, unknown_session
+
 class PagingSegmentation:
-    def __init__(self):
-        pass
+    def __init__(self, max_sessions=32, session_ttl=900):
+        # Built reverse-map indexes are kept as sessions, so later lookups
+        # are a binary search without re-running the simulation
+        self.sessions = SessionStore(max_sessions, session_ttl)
     
-    def simulate_paging(self, memory_size, process_size, page_size):
+    def simulate_paging(self, memory_size, process_size, page_size, table_mode=None, virtual_address_bits=None):
         """
         Simulate paging memory management
         """
@@ -12,101 +23,89 @@ class PagingSegmentation:
         num_pages = math.ceil(process_size / page_size)
         num_frames = memory_size // page_size
         
-        # Create page table
-        page_table = []
-        frames_used = []
-        
-        for page_num in range(num_pages):
-            if page_num < num_frames:
-                frame_num = page_num
-                frames_used.append(frame_num)
-                page_table.append({
-                    'page_number': page_num,
-                    'frame_number': frame_num,
-                    'valid': True,
-                    'page_address': page_num * page_size,
-                    'physical_address': frame_num * page_size
-                })
-            else:
-                page_table.append({
-                    'page_number': page_num,
-                    'frame_number': None,
-                    'valid': False,
-                    'page_address': page_num * page_size,
-                    'physical_address': None
-                })
+        # Page table as ranges: the first pages fill the frames in order, the
+        # rest stay on disk
+        pages_in_memory = min(num_pages, num_frames)
+        page_table = RangePageTable(num_pages, page_size)
+        page_table.map_range(pages_in_memory, 0)
+        page_table.map_range(num_pages - pages_in_memory)
         
         # Calculate metrics
         internal_fragmentation = 0
         if process_size % page_size != 0:
             internal_fragmentation = page_size - (process_size % page_size)
         
-        memory_used = min(num_pages, num_frames) * page_size
+        memory_used = pages_in_memory * page_size
         memory_utilization = (process_size / memory_size) * 100 if memory_size > 0 else 0
         
         # Calculate page fault probability (pages not in memory)
-        pages_in_memory = min(num_pages, num_frames)
         page_fault_probability = ((num_pages - pages_in_memory) / num_pages * 100) if num_pages > 0 else 0
         
-        return {
+        result = {
             'mode': 'paging',
             'memory_size': memory_size,
             'process_size': process_size,
             'page_size': page_size,
             'num_pages': num_pages,
             'num_frames': num_frames,
-            'frames_used': len(frames_used),
-            'page_table': page_table,
+            'frames_used': page_table.frames_used(),
+            'page_table': page_table.entries(),
+            'page_table_ranges': page_table.ranges(),
             'internal_fragmentation': internal_fragmentation,
             'external_fragmentation': 0,
             'memory_utilization': round(memory_utilization, 2),
             'page_fault_probability': round(page_fault_probability, 2),
             'access_efficiency': round(100 - page_fault_probability, 2)
         }
+        
+        if table_mode:
+            result['page_table_model'] = self.analyze_page_table(
+                table_mode, page_size, [{'start': 0, 'size': process_size}], memory_size, virtual_address_bits
+            )
+        
+        return result
+    
+    def analyze_page_table(self, mode, page_size, regions, physical_size, virtual_address_bits=None,
+                           pte_size=8, memory_access_time=100):
+        """
+        Page-table overhead, walk depth and translation cost for a
+        single-level, two-level, four-level or inverted table
+        """
+        model = PageTableModel(pte_size, memory_access_time)
+        return model.analyze(mode, page_size, regions, physical_size, virtual_address_bits)
     
-    def simulate_segmentation(self, memory_size, segments):
+    def simulate_segmentation(self, memory_size, segments, placement='first_fit', operations=None):
         """
-        Simulate segmentation memory management
+        Simulate segmentation memory management. Segments are placed into
+        free holes by first, best or worst fit; `operations` can then
+        allocate, remove or grow segments, reusing the holes they leave.
         """
+        holes = HoleIndex(memory_size)
         segment_table = []
-        current_base = 0
-        total_segment_size = 0
+        operations_log = []
+        
+        for segment in segments:
+            self._allocate_segment(holes, segment_table, segment, placement)
+        
+        for operation in operations or []:
+            operations_log.append(self._apply_segment_operation(holes, segment_table, operation, placement))
+        
         allocated_segments = []
         unallocated_segments = []
-        
-        for i, segment in enumerate(segments):
-            seg_size = segment['size']
-            seg_name = segment.get('name', f'Segment {i}')
-            
-            if current_base + seg_size <= memory_size:
-                segment_table.append({
-                    'segment_number': i,
-                    'segment_name': seg_name,
-                    'base_address': current_base,
-                    'limit': seg_size,
-                    'end_address': current_base + seg_size,
-                    'allocated': True
-                })
+        total_segment_size = 0
+        for entry in segment_table:
+            if entry['allocated']:
                 allocated_segments.append({
-                    'number': i,
-                    'name': seg_name,
-                    'size': seg_size
-                })
-                current_base += seg_size
-                total_segment_size += seg_size
-            else:
-                segment_table.append({
-                    'segment_number': i,
-                    'segment_name': seg_name,
-                    'base_address': None,
-                    'limit': seg_size,
-                    'end_address': None,
-                    'allocated': False
+                    'number': entry['segment_number'],
+                    'name': entry['segment_name'],
+                    'size': entry['limit']
                 })
+                total_segment_size += entry['limit']
+            elif not entry.get('removed'):
                 unallocated_segments.append({
-                    'number': i,
-                    'name': seg_name,
-                    'size': seg_size
+                    'number': entry['segment_number'],
+                    'name': entry['segment_name'],
+                    'size': entry['limit']
                 })
         
         # Calculate metrics
@@ -116,10 +115,10 @@ class PagingSegmentation:
         # Segment overhead (segment table size)
         segment_overhead = len(segment_table) * 8  # Assume 8 bytes per segment table entry
         
-        return {
+        result = {
             'mode': 'segmentation',
             'memory_size': memory_size,
-            'total_segments': len(segments),
+            'total_segments': len(segment_table),
             'allocated_segments': len(allocated_segments),
             'segment_table': segment_table,
             'allocated': allocated_segments,
@@ -130,6 +129,131 @@ class PagingSegmentation:
             'segment_overhead': segment_overhead,
             'access_efficiency': round(memory_utilization, 2)
         }
+        
+        if operations:
+            result['placement'] = placement
+            result['operations'] = operations_log
+            result['hole_count'] = len(holes)
+            result['largest_hole'] = holes.largest_hole()
+        
+        return result
+    
+    def _allocate_segment(self, holes, segment_table, segment, placement):
+        """Place a new segment into a hole and append its table entry"""
+        i = len(segment_table)
+        seg_size = segment.get('size')
+        seg_name = segment.get('name', f'Segment {i}')
+        error = self._check_segment_size(seg_size)
+        base = holes.find(seg_size, placement) if error is None else None
+        
+        if base is not None:
+            holes.take(base, seg_size)
+            segment_table.append({
+                'segment_number': i,
+                'segment_name': seg_name,
+                'base_address': base,
+                'limit': seg_size,
+                'end_address': base + seg_size,
+                'allocated': True
+            })
+        else:
+            segment_table.append({
+                'segment_number': i,
+                'segment_name': seg_name,
+                'base_address': None,
+                'limit': seg_size,
+                'end_address': None,
+                'allocated': False
+            })
+            if error is not None:
+                segment_table[i]['error'] = error
+        return segment_table[i]
+    
+    def _check_segment_size(self, size):
+        """Error message for a segment size, or None"""
+        if size is None:
+            return 'Segment size is required'
+        # Holes are whole units; an empty segment would leave a zero-size
+        # hole behind when removed
+        if isinstance(size, bool) or not isinstance(size, int) or size <= 0:
+            return 'Segment size must be a positive integer'
+        return None
+    
+    def _apply_segment_operation(self, holes, segment_table, operation, placement):
+        """Apply one allocate / remove / grow operation"""
+        op = operation.get('op', 'allocate')
+        
+        if op == 'allocate':
+            entry = self._allocate_segment(holes, segment_table, operation, placement)
+            result = {
+                'op': op,
+                'segment_number': entry['segment_number'],
+                'base_address': entry['base_address'],
+                'success': entry['allocated']
+            }
+            if 'error' in entry:
+                result['error'] = entry['error']
+            return result
+        
+        number = operation.get('segment')
+        if number is None or not 0 <= number < len(segment_table) or not segment_table[number]['allocated']:
+            return {'op': op, 'segment_number': number, 'error': 'Segment not allocated', 'success': False}
+        entry = segment_table[number]
+        
+        if op == 'remove':
+            holes.release(entry['base_address'], entry['limit'])
+            entry.update({'base_address': None, 'end_address': None, 'allocated': False, 'removed': True})
+            return {'op': op, 'segment_number': number, 'success': True}
+        
+        if op == 'grow':
+            new_size = operation.get('size')
+            error = self._check_segment_size(new_size)
+            if error is not None:
+                return {'op': op, 'segment_number': number, 'error': error, 'success': False}
+            entry_base, old_size = entry['base_address'], entry['limit']
+            base = entry_base
+            if new_size <= old_size:
+                # Shrinking hands the tail back to the free set
+                if new_size < old_size:
+                    holes.release(base + new_size, old_size - new_size)
+            elif not holes.take_at(base + old_size, new_size - old_size):
+                # No room to extend in place: relocate to a hole that fits
+                holes.release(base, old_size)
+                base = holes.find(new_size, placement)
+                if base is None:
+                    holes.take_at(entry_base, old_size)
+                    return {'op': op, 'segment_number': number, 'error': 'No hole large enough', 'success': False}
+                holes.take(base, new_size)
+            entry.update({'base_address': base, 'limit': new_size, 'end_address': base + new_size})
+            return {
+                'op': op,
+                'segment_number': number,
+                'base_address': base,
+                'relocated': base != entry_base,
+                'success': True
+            }
+        
+        return {'op': op, 'segment_number': number, 'error': f'Unknown operation: {op}', 'success': False}
+    
+    def store_reverse_index(self, index):
+        """Keep a built ReverseMapIndex and return its session id"""
+        return self.sessions.create(index)
+    
+    def reverse_lookup(self, session_id, physical_address=0, physical_addresses=None):
+        """
+        Owner of a physical address (or of an array of them) in a stored
+        ReverseMapIndex: O(log n) per address, with no rebuild
+        """
+        with self.sessions.use(session_id) as index:
+            if index is None:
+                return unknown_session(session_id)
+            if physical_addresses is not None:
+                result = index.lookup_batch(physical_addresses)
+            else:
+                result = index.lookup(physical_address)
+            result['mode'] = index.mode
+        result['session_id'] = session_id
+        return result
     
     def translate_logical_to_physical_paging(self, logical_address, page_size, page_table):
         """
@@ -204,4 +328,226 @@ class PagingSegmentation:
                 'offset': offset,
                 'error': 'Invalid segment number',
                 'success': False
-            }
\ No newline at end of file
+            }
+    
+    def sweep_page_sizes(self, memory_size, process_size, page_sizes, page_mixes=None, pte_size=8):
+        """
+        Evaluate many candidate page sizes (and mixes of page sizes) in one
+        vectorised pass, without building any page table
+        """
+        sizes = np.asarray(page_sizes, dtype=np.int64)
+        num_pages = -(-process_size // sizes)
+        num_frames = memory_size // sizes
+        pages_in_memory = np.minimum(num_pages, num_frames)
+        fault_probability = np.where(num_pages > 0, (num_pages - pages_in_memory) / np.maximum(num_pages, 1) * 100, 0)
+        
+        result = {
+            'memory_size': memory_size,
+            'process_size': process_size,
+            'memory_utilization': round((process_size / memory_size) * 100 if memory_size > 0 else 0, 2),
+            'candidates': {
+                'page_size': sizes,
+                'num_pages': num_pages,
+                'num_frames': num_frames,
+                'frames_used': pages_in_memory,
+                'internal_fragmentation': num_pages * sizes - process_size,
+                'page_table_size': num_pages * pte_size,
+                'page_fault_probability': np.round(fault_probability, 2)
+            }
+        }
+        
+        if page_mixes:
+            result['mixes'] = self._sweep_page_mixes(memory_size, process_size, page_mixes, pte_size)
+        
+        return result
+    
+    def _sweep_page_mixes(self, memory_size, process_size, page_mixes, pte_size):
+        """
+        Greedy backing for each mix: the largest sizes cover what they can
+        fully, the smallest size rounds up the remainder. Vectorised across
+        mixes, one step per size class.
+        """
+        width = max(len(mix) for mix in page_mixes)
+        classes = np.zeros((len(page_mixes), width), dtype=np.int64)
+        for i, mix in enumerate(page_mixes):
+            ordered = sorted(mix, reverse=True)
+            classes[i, :len(ordered)] = ordered
+        class_count = np.count_nonzero(classes, axis=1)
+        
+        counts = np.zeros_like(classes)
+        resident = np.zeros_like(classes)
+        remaining = np.full(len(page_mixes), process_size, dtype=np.int64)
+        free_memory = np.full(len(page_mixes), memory_size, dtype=np.int64)
+        for j in range(width):
+            size = np.maximum(classes[:, j], 1)
+            active = classes[:, j] > 0
+            is_last = j == class_count - 1
+            count = np.where(is_last, -(-remaining // size), remaining // size)
+            counts[:, j] = np.where(active, count, 0)
+            remaining = np.maximum(remaining - counts[:, j] * classes[:, j], 0)
+            # Frames are filled largest pages first
+            resident[:, j] = np.where(active, np.minimum(counts[:, j], free_memory // size), 0)
+            free_memory = free_memory - resident[:, j] * classes[:, j]
+        
+        total_pages = counts.sum(axis=1)
+        resident_pages = resident.sum(axis=1)
+        backing = (counts * classes).sum(axis=1)
+        fault_probability = np.where(
+            total_pages > 0, (total_pages - resident_pages) / np.maximum(total_pages, 1) * 100, 0
+        )
+        
+        return {
+            'page_sizes': classes,
+            'page_counts': counts,
+            'total_pages': total_pages,
+            'frames_used': resident_pages,
+            'internal_fragmentation': backing - process_size,
+            'page_table_size': total_pages * pte_size,
+            'page_fault_probability': np.round(fault_probability, 2)
+        }
+    
+    def simulate_huge_pages(self, memory_size, regions, page_sizes=(4096, 2 << 20, 1 << 30),
+                            policy='aligned', promotion_threshold=0.5, tlb_entries=64, pte_size=8):
+        """
+        Back a process layout with mixed page sizes (e.g. 4 KB / 2 MB / 1 GB)
+        under a promotion policy
+        """
+        if policy not in PROMOTION_POLICIES:
+            return {'policy': policy, 'error': f'Unknown promotion policy: {policy}', 'success': False}
+        
+        layout = MixedPageLayout(page_sizes, policy, promotion_threshold, pte_size)
+        for region in regions:
+            layout.back(region['start'], region['size'])
+        
+        result = layout.report(memory_size, tlb_entries)
+        result['memory_size'] = memory_size
+        return result
+    
+    def simulate_tlb(self, logical_addresses, page_size, page_table_ranges, tlb_config=None,
+                     walk_depth=1, memory_access_time=100, asids=None):
+        """
+        Run an address trace through a TLB in front of the range-encoded
+        page table and report the TLB hit ratio and TLB-aware EAT
+        """
+        if asids and len(asids) != len(logical_addresses):
+            return {
+                'asids': len(asids),
+                'addresses': len(logical_addresses),
+                'error': 'asids must give one ASID per address',
+                'success': False
+            }
+        tlb_config = tlb_config or {}
+        replacement = tlb_config.get('replacement', 'lru')
+        if replacement not in TLB_REPLACEMENTS:
+            return {'tlb': tlb_config, 'error': f'Unknown TLB replacement: {replacement}', 'success': False}
+        tlb = TLB.from_config(tlb_config)
+        tlb_time = tlb_config.get('accessTime', 10)
+        table = RangePageTable(sum(r['page_count'] for r in page_table_ranges), page_size)
+        for r in page_table_ranges:
+            table.map_range(r['page_count'], r['first_frame'] if r['valid'] else None)
+        
+        translations = 0
+        faults = 0
+        for i, logical_address in enumerate(logical_addresses):
+            page_number = logical_address // page_size
+            asid = asids[i] if asids else 0
+            if tlb.lookup(page_number, asid) is not None:
+                translations += 1
+                continue
+            frame_number = table.frame_of(page_number)
+            if frame_number is None:
+                faults += 1
+                continue
+            translations += 1
+            tlb.insert(page_number, frame_number, asid)
+        
+        lookups = tlb.hits + tlb.misses
+        walk_time = walk_depth * memory_access_time
+        # Faulting accesses are excluded: their cost is dominated by the fault
+        translated_misses = translations - tlb.hits
+        eat = (
+            (tlb_time + memory_access_time) * translations + walk_time * translated_misses
+        ) / translations if translations else 0
+        
+        return {
+            'total_accesses': lookups,
+            'translations': translations,
+            'page_faults': faults,
+            'walk_depth': walk_depth,
+            'tlb': tlb.stats(),
+            'effective_access_time': round(eat, 2),
+            'no_tlb_effective_access_time': round(walk_time + memory_access_time, 2)
+        }
+    
+    def translate_batch_paging(self, logical_addresses, page_size, page_table_ranges):
+        """
+        Translate an array of logical addresses at once against a
+        range-encoded page table (the `page_table_ranges` of simulate_paging).
+        Status codes: 0 = translated, 1 = invalid page number, 2 = page fault.
+        """
+        addresses = np.asarray(logical_addresses, dtype=np.int64)
+        page_numbers = addresses // page_size
+        offsets = addresses % page_size
+        
+        run_starts = np.array([r['first_page'] for r in page_table_ranges] or [0], dtype=np.int64)
+        run_ends = np.array([r['first_page'] + r['page_count'] for r in page_table_ranges] or [0], dtype=np.int64)
+        run_frames = np.array(
+            [r['first_frame'] if r['valid'] else -1 for r in page_table_ranges] or [-1], dtype=np.int64
+        )
+        
+        # Locate the run holding each page, then offset into its frame range
+        run = np.clip(np.searchsorted(run_starts, page_numbers, side='right') - 1, 0, None)
+        in_table = (addresses >= 0) & (page_numbers >= run_starts[run]) & (page_numbers < run_ends[run])
+        resident = in_table & (run_frames[run] >= 0)
+        
+        frame_numbers = np.where(resident, run_frames[run] + page_numbers - run_starts[run], -1)
+        physical_addresses = np.where(resident, frame_numbers * page_size + offsets, -1)
+        status = np.where(resident, 0, np.where(in_table, 2, 1)).astype(np.int8)
+        
+        return {
+            'count': int(addresses.size),
+            'page_numbers': page_numbers,
+            'offsets': offsets,
+            'frame_numbers': frame_numbers,
+            'physical_addresses': physical_addresses,
+            'fault': status != 0,
+            'status': status,
+            'fault_count': int(np.count_nonzero(status))
+        }
+    
+    def translate_batch_segmentation(self, segment_numbers, offsets, segment_table):
+        """
+        Translate arrays of (segment, offset) pairs at once.
+        Status codes: 0 = translated, 1 = invalid segment number,
+        2 = segment not allocated, 3 = offset exceeds limit.
+        """
+        if len(segment_numbers) != len(offsets):
+            return {
+                'segment_numbers': len(segment_numbers),
+                'offsets': len(offsets),
+                'error': 'segmentNumbers and offsets must have the same length',
+                'success': False
+            }
+        segments = np.asarray(segment_numbers, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        
+        bases = np.array(
+            [s['base_address'] if s['allocated'] else -1 for s in segment_table] or [-1], dtype=np.int64
+        )
+        limits = np.array([s['limit'] for s in segment_table] or [0], dtype=np.int64)
+        
+        valid_segment = (segments >= 0) & (segments < len(segment_table))
+        index = np.where(valid_segment, segments, 0)
+        allocated = valid_segment & (bases[index] >= 0)
+        within_limit = allocated & (offsets >= 0) & (offsets < limits[index])
+        
+        physical_addresses = np.where(within_limit, bases[index] + offsets, -1)
+        status = np.select([within_limit, allocated, valid_segment], [0, 3, 2], default=1).astype(np.int8)
+        
+        return {
+            'count': int(segments.size),
+            'physical_addresses': physical_addresses,
+            'violation': status != 0,
+            'status': status,
+            'violation_count': int(np.count_nonzero(status))
+        }
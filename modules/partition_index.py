@@ -0,0 +1,76 @@
+from bisect import bisect_left, insort
+
+class FreePartitionIndex:
+    """
+    Index over the free partitions of a fixed-partition layout.
+    A sorted multiset of (size, partition) pairs answers best and worst fit
+    with a binary search, and a max segment tree over partition order answers
+    first fit by descending to the leftmost partition that is large enough.
+    """
+
+    def __init__(self, sizes):
+        self.count = len(sizes)
+        self.by_size = sorted((size, i) for i, size in enumerate(sizes))
+
+        # Leaves hold partition sizes, free partitions only; 0 marks "taken"
+        self._leaf_base = 1
+        while self._leaf_base < max(self.count, 1):
+            self._leaf_base *= 2
+        self._tree = [0] * (2 * self._leaf_base)
+        for i, size in enumerate(sizes):
+            self._tree[self._leaf_base + i] = size
+        for node in range(self._leaf_base - 1, 0, -1):
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+
+    def __len__(self):
+        return len(self.by_size)
+
+    def first_fit(self, size):
+        """Lowest-numbered free partition of at least `size`"""
+        if not self.by_size:
+            return None
+        if size <= 0:
+            return min(i for _, i in self.by_size)
+        if self._tree[1] < size:
+            return None
+        node = 1
+        while node < self._leaf_base:
+            node = 2 * node if self._tree[2 * node] >= size else 2 * node + 1
+        return node - self._leaf_base
+
+    def best_fit(self, size):
+        """Smallest free partition of at least `size` (lowest number on ties)"""
+        pos = bisect_left(self.by_size, (size, -1))
+        if pos == len(self.by_size):
+            return None
+        return self.by_size[pos][1]
+
+    def worst_fit(self, size):
+        """Largest free partition if it holds `size` (lowest number on ties)"""
+        if not self.by_size or self.by_size[-1][0] < size:
+            return None
+        largest = self.by_size[-1][0]
+        return self.by_size[bisect_left(self.by_size, (largest, -1))][1]
+
+    def remove(self, partition, size):
+        """Take partition out of the free set once it has been allocated"""
+        pos = bisect_left(self.by_size, (size, partition))
+        del self.by_size[pos]
+
+        node = self._leaf_base + partition
+        self._tree[node] = 0
+        node //= 2
+        while node:
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+
+    def add(self, partition, size):
+        """Return a released partition to the free set"""
+        insort(self.by_size, (size, partition))
+
+        node = self._leaf_base + partition
+        self._tree[node] = size
+        node //= 2
+        while node:
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
@@ -0,0 +1,125 @@
+from collections import OrderedDict
+
+class SequentialPrefetcher:
+    """
+    Adaptive read-ahead: while accesses walk forward one page at a time the
+    read-ahead window doubles (up to `max_window`), and any other access
+    resets it. Pages already read ahead are never requested twice, so a
+    sequential run of length L issues at most L + max_window pages.
+    """
+    name = 'sequential'
+
+    def __init__(self, initial_window=2, max_window=32):
+        self.initial_window = max(initial_window, 1)
+        self.max_window = max(max_window, self.initial_window)
+        self.window = self.initial_window
+        self.last_page = None
+        self.ahead = None
+
+    def predict(self, page_number, page_fault):
+        last_page, self.last_page = self.last_page, page_number
+        if last_page is None or page_number != last_page + 1:
+            self.window = self.initial_window
+            self.ahead = page_number if page_fault else None
+            return ()
+
+        first = max(page_number, self.ahead if self.ahead is not None else page_number) + 1
+        last = page_number + self.window
+        if first > last:
+            return ()
+        self.ahead = last
+        self.window = min(self.window * 2, self.max_window)
+        return range(first, last + 1)
+
+class StridePrefetcher:
+    """
+    Stride detection: once the same page stride has repeated `threshold`
+    times, prefetch the next `degree` pages along it
+    """
+    name = 'stride'
+
+    def __init__(self, degree=2, threshold=2):
+        self.degree = degree
+        self.threshold = threshold
+        self.last_page = None
+        self.stride = 0
+        self.confidence = 0
+
+    def predict(self, page_number, page_fault):
+        last_page, self.last_page = self.last_page, page_number
+        if last_page is None:
+            return ()
+        stride = page_number - last_page
+        if stride == 0:
+            return ()
+        if stride == self.stride:
+            self.confidence += 1
+        else:
+            self.stride = stride
+            self.confidence = 0
+        if self.confidence < self.threshold:
+            return ()
+        return [page_number + stride * k for k in range(1, self.degree + 1)]
+
+class MarkovPrefetcher:
+    """
+    Markov next-page prediction: for each page, remember up to `width`
+    successors with hit counts and prefetch the `degree` most frequent.
+    The table holds at most `max_entries` source pages (least recently
+    updated dropped first), so every update is O(width).
+    """
+    name = 'markov'
+
+    def __init__(self, degree=1, width=4, max_entries=4096):
+        self.degree = degree
+        self.width = width
+        self.max_entries = max_entries
+        self.table = OrderedDict()
+        self.last_page = None
+
+    def predict(self, page_number, page_fault):
+        last_page, self.last_page = self.last_page, page_number
+        if last_page is not None and last_page != page_number:
+            self._learn(last_page, page_number)
+
+        successors = self.table.get(page_number)
+        if not successors:
+            return ()
+        ranked = sorted(successors.items(), key=lambda item: -item[1])
+        return [page for page, _ in ranked[:self.degree]]
+
+    def _learn(self, source, successor):
+        successors = self.table.get(source)
+        if successors is None:
+            successors = self.table[source] = {}
+            if len(self.table) > self.max_entries:
+                self.table.popitem(last=False)
+        else:
+            self.table.move_to_end(source)
+
+        if successor in successors:
+            successors[successor] += 1
+        else:
+            if len(successors) >= self.width:
+                del successors[min(successors, key=successors.get)]
+            successors[successor] = 1
+
+PREFETCHERS = {
+    prefetcher.name: prefetcher
+    for prefetcher in (SequentialPrefetcher, StridePrefetcher, MarkovPrefetcher)
+}
+
+def make_prefetcher(config, num_frames):
+    """
+    Build a prefetcher from an API-style config, e.g.
+    {'type': 'sequential', 'initialWindow': 2, 'maxWindow': 32}. The
+    read-ahead window is capped at half the frames so read-ahead pages are
+    not evicted by later read-ahead before they are used.
+    """
+    kind = config.get('type', 'sequential')
+    if kind == 'stride':
+        return StridePrefetcher(config.get('degree', 2), config.get('threshold', 2))
+    if kind == 'markov':
+        return MarkovPrefetcher(config.get('degree', 1), config.get('width', 4), config.get('maxEntries', 4096))
+    max_window = min(config.get('maxWindow', 32), max(num_frames // 2, 1))
+    return SequentialPrefetcher(min(config.get('initialWindow', 2), max_window), max_window)
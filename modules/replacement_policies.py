@@ -0,0 +1,220 @@
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+DEFAULT_WINDOW = 100  # working-set window τ, in references
+
+class FIFOPolicy:
+    """
+    First In First Out: evict the page that was loaded earliest. The queue
+    is an OrderedDict so pages evicted from outside the policy can also be
+    dropped in O(1).
+    """
+    name = 'fifo'
+
+    def __init__(self, num_frames):
+        self.queue = OrderedDict()
+
+    def on_load(self, page_number, entry):
+        self.queue[page_number] = None
+
+    def on_access(self, page_number, entry):
+        pass
+
+    def select_victim(self, page_table):
+        page_number, _ = self.queue.popitem(last=False)
+        return page_number
+
+    def on_evict(self, page_number, entry):
+        """Forget a page evicted by something other than select_victim"""
+        self.queue.pop(page_number, None)
+
+class LRUPolicy:
+    """Least Recently Used: recency order kept in an OrderedDict"""
+    name = 'lru'
+
+    def __init__(self, num_frames):
+        self.order = OrderedDict()
+
+    def on_load(self, page_number, entry):
+        self.order[page_number] = None
+
+    def on_access(self, page_number, entry):
+        self.order.move_to_end(page_number)
+
+    def select_victim(self, page_table):
+        page_number, _ = self.order.popitem(last=False)
+        return page_number
+
+    def on_evict(self, page_number, entry):
+        self.order.pop(page_number, None)
+
+class ClockPolicy:
+    """
+    CLOCK (second chance): a hand sweeps the resident pages in ring order,
+    clearing reference bits, and evicts the first page whose bit is already
+    clear. Ring slots are the policy's own, so one policy can manage any
+    subset of frames (e.g. a single process's quota).
+    """
+    name = 'clock'
+
+    def __init__(self, num_frames):
+        self.ring = [None] * num_frames
+        self.hand = 0
+        # Ring slot of each resident page; freed slots are refilled first
+        self.slot_of = {}
+        self.free_slots = list(range(num_frames - 1, -1, -1))
+
+    def on_load(self, page_number, entry):
+        slot = self.free_slots.pop()
+        self.ring[slot] = page_number
+        self.slot_of[page_number] = slot
+
+    def on_access(self, page_number, entry):
+        pass
+
+    def select_victim(self, page_table):
+        while True:
+            page_number = self.ring[self.hand]
+            self.hand = (self.hand + 1) % len(self.ring)
+            if page_number is None:
+                continue
+            entry = page_table[page_number]
+            if not entry['reference']:
+                return self._release(page_number)
+            entry['reference'] = False
+
+    def _release(self, page_number):
+        slot = self.slot_of.pop(page_number)
+        self.ring[slot] = None
+        self.free_slots.append(slot)
+        return page_number
+
+    def on_evict(self, page_number, entry):
+        if page_number in self.slot_of:
+            self._release(page_number)
+
+class EnhancedSecondChancePolicy(ClockPolicy):
+    """
+    Enhanced second chance: prefer (reference, dirty) = (0, 0), then (0, 1),
+    clearing reference bits on the second sweep, so clean pages are evicted
+    before dirty ones and fewer pages need writing back.
+
+    Pages are loaded and hit with the reference bit set, so a page only
+    becomes (0, 0) when the second sweep clears the bit of a clean page.
+    Those slots are kept sorted, and the first sweep visits only them
+    instead of walking every frame.
+    """
+    name = 'enhanced_second_chance'
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.clean_slots = []
+
+    def select_victim(self, page_table):
+        frames = len(self.ring)
+        while True:
+            # Sweep 1: clean, unreferenced page at or after the hand
+            page_number = self._next_clean(page_table)
+            if page_number is not None:
+                return self._release(page_number)
+            # Sweep 2: dirty, unreferenced page; clear reference bits on the way
+            for _ in range(frames):
+                slot = self.hand
+                page_number = self.ring[slot]
+                self.hand = (slot + 1) % frames
+                if page_number is not None:
+                    entry = page_table[page_number]
+                    if not entry['reference'] and entry['dirty']:
+                        return self._release(page_number)
+                    if entry['reference'] and not entry['dirty']:
+                        insort(self.clean_slots, slot)
+                    entry['reference'] = False
+
+    def _next_clean(self, page_table):
+        """
+        First (0, 0) page in ring order from the hand, dropping slots whose
+        page has since been referenced or replaced
+        """
+        slots = self.clean_slots
+        while slots:
+            i = bisect_left(slots, self.hand)
+            if i == len(slots):
+                i = 0
+            slot = slots.pop(i)
+            page_number = self.ring[slot]
+            if page_number is None:
+                continue
+            entry = page_table[page_number]
+            if not entry['reference'] and not entry['dirty']:
+                self.hand = (slot + 1) % len(self.ring)
+                return page_number
+        return None
+
+class WSClockPolicy(ClockPolicy):
+    """
+    WSClock: CLOCK over the frames, but a page is only evicted once it has
+    aged out of the working-set window τ (virtual time since its last use).
+    An old dirty page is not evicted on the spot: its write-back is
+    scheduled (reported through `on_writeback`) and the hand moves on, so
+    the page is clean when the hand comes round again. If no page is old,
+    the first young unreferenced page the hand passed is evicted.
+    """
+    name = 'wsclock'
+
+    def __init__(self, num_frames, window=DEFAULT_WINDOW, on_writeback=None):
+        super().__init__(num_frames)
+        self.window = window
+        self.on_writeback = on_writeback
+        self.time = 0
+        self.last_use = {}
+
+    def on_load(self, page_number, entry):
+        super().on_load(page_number, entry)
+        self.time += 1
+        self.last_use[page_number] = self.time
+
+    def on_access(self, page_number, entry):
+        self.time += 1
+
+    def select_victim(self, page_table):
+        frames = len(self.ring)
+        young = None
+        # Lap 1 clears reference bits and schedules write-backs, so lap 2
+        # finds any page that was old
+        for _ in range(2 * frames):
+            page_number = self.ring[self.hand]
+            self.hand = (self.hand + 1) % frames
+            if page_number is None:
+                continue
+            entry = page_table[page_number]
+            if entry['reference']:
+                entry['reference'] = False
+                self.last_use[page_number] = self.time
+            elif self.time - self.last_use[page_number] > self.window:
+                if not entry['dirty']:
+                    return self._release(page_number)
+                entry['dirty'] = False
+                if self.on_writeback:
+                    self.on_writeback(page_number, entry)
+            elif young is None:
+                young = page_number
+        return self._release(young)
+
+    def _release(self, page_number):
+        del self.last_use[page_number]
+        return super()._release(page_number)
+
+REPLACEMENT_POLICIES = {
+    policy.name: policy
+    for policy in (FIFOPolicy, LRUPolicy, ClockPolicy, EnhancedSecondChancePolicy, WSClockPolicy)
+}
+
+def make_policy(name, num_frames, window=DEFAULT_WINDOW, on_writeback=None):
+    """
+    Instantiate a replacement policy by name, or None if unknown. `window`
+    (the working-set window τ) and `on_writeback` are used by WSClock only
+    """
+    if name == WSClockPolicy.name:
+        return WSClockPolicy(num_frames, window, on_writeback)
+    policy = REPLACEMENT_POLICIES.get(name)
+    return policy(num_frames) if policy else None
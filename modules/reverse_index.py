@@ -0,0 +1,98 @@
+from bisect import bisect_right
+
+import numpy as np
+
+class ReverseMapIndex:
+    """
+    Physical address -> owning page or segment. Resident regions (page runs
+    or allocated segments) are sorted by physical start so one lookup is a
+    binary search, and whole arrays of addresses are resolved with
+    np.searchsorted.
+    """
+
+    def __init__(self, mode, starts, lengths, owners, names=None, page_size=None):
+        order = sorted(range(len(starts)), key=lambda i: starts[i])
+        self.mode = mode
+        self.page_size = page_size
+        self.starts = [starts[i] for i in order]
+        self.ends = [starts[i] + lengths[i] for i in order]
+        # Paging: first page of the run; segmentation: segment number
+        self.owners = [owners[i] for i in order]
+        self.names = [names[i] for i in order] if names else None
+
+    @classmethod
+    def from_page_ranges(cls, page_table_ranges, page_size):
+        """Frame -> page index from simulate_paging's page_table_ranges"""
+        resident = [r for r in page_table_ranges if r['valid']]
+        return cls(
+            'paging',
+            [r['first_frame'] * page_size for r in resident],
+            [r['page_count'] * page_size for r in resident],
+            [r['first_page'] for r in resident],
+            page_size=page_size
+        )
+
+    @classmethod
+    def from_segment_table(cls, segment_table):
+        """Base address -> segment index from simulate_segmentation's segment_table"""
+        allocated = [s for s in segment_table if s['allocated']]
+        return cls(
+            'segmentation',
+            [s['base_address'] for s in allocated],
+            [s['limit'] for s in allocated],
+            [s['segment_number'] for s in allocated],
+            names=[s['segment_name'] for s in allocated]
+        )
+
+    def lookup(self, physical_address):
+        """Owner of a single physical address"""
+        i = bisect_right(self.starts, physical_address) - 1
+        if i < 0 or physical_address >= self.ends[i]:
+            return {
+                'physical_address': physical_address,
+                'error': 'Address not owned by any page or segment',
+                'found': False
+            }
+
+        region_offset = physical_address - self.starts[i]
+        if self.mode == 'paging':
+            page_number = self.owners[i] + region_offset // self.page_size
+            offset = region_offset % self.page_size
+            return {
+                'physical_address': physical_address,
+                'frame_number': physical_address // self.page_size,
+                'page_number': page_number,
+                'offset': offset,
+                'logical_address': page_number * self.page_size + offset,
+                'found': True
+            }
+        return {
+            'physical_address': physical_address,
+            'segment_number': self.owners[i],
+            'segment_name': self.names[i],
+            'offset': region_offset,
+            'found': True
+        }
+
+    def lookup_batch(self, physical_addresses):
+        """Owners of an array of physical addresses (-1 where unowned)"""
+        addresses = np.asarray(physical_addresses, dtype=np.int64)
+        starts = np.array(self.starts or [0], dtype=np.int64)
+        ends = np.array(self.ends or [0], dtype=np.int64)
+        owners = np.array(self.owners or [-1], dtype=np.int64)
+
+        region = np.clip(np.searchsorted(starts, addresses, side='right') - 1, 0, None)
+        found = (addresses >= starts[region]) & (addresses < ends[region])
+        region_offsets = addresses - starts[region]
+
+        result = {'count': int(addresses.size), 'found': found, 'found_count': int(np.count_nonzero(found))}
+        if self.mode == 'paging':
+            page_numbers = owners[region] + region_offsets // self.page_size
+            offsets = region_offsets % self.page_size
+            result['page_numbers'] = np.where(found, page_numbers, -1)
+            result['offsets'] = np.where(found, offsets, -1)
+            result['logical_addresses'] = np.where(found, page_numbers * self.page_size + offsets, -1)
+        else:
+            result['segment_numbers'] = np.where(found, owners[region], -1)
+            result['offsets'] = np.where(found, region_offsets, -1)
+        return result
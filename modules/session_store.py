@@ -0,0 +1,70 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+def unknown_session(session_id, **fields):
+    """Error entry for a session id that is unknown, expired or evicted"""
+    return {'session_id': session_id, **fields, 'error': 'Unknown or expired session', 'success': False}
+
+class SessionStore:
+    """
+    In-memory store for simulation sessions with LRU eviction and a sliding
+    TTL. Sessions sit in an OrderedDict in last-use order, so the least
+    recently used one is also the first to expire: eviction and expiry only
+    ever look at the front, and every operation is O(1) amortised.
+
+    Each session also has its own lock; use() holds it so two requests
+    never mutate (or copy) the same stored value at once.
+    """
+
+    def __init__(self, max_sessions=32, ttl=900, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _expire(self, now):
+        sessions = self._sessions
+        while sessions:
+            session_id, (last_used, _, _) = next(iter(sessions.items()))
+            if now - last_used <= self.ttl:
+                break
+            del sessions[session_id]
+
+    def create(self, value):
+        """Store a value and return its new session id"""
+        session_id = secrets.token_hex(16)
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._sessions[session_id] = (now, value, threading.Lock())
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def _lookup(self, session_id):
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            self._sessions[session_id] = (now, session[1], session[2])
+            self._sessions.move_to_end(session_id)
+            return session
+
+    @contextmanager
+    def use(self, session_id):
+        """Hold the session's lock while using its value (None if unknown)"""
+        session = self._lookup(session_id)
+        if session is None:
+            yield None
+            return
+        with session[2]:
+            yield session[1]
@@ -0,0 +1,83 @@
+import random
+
+TLB_REPLACEMENTS = ['lru', 'random']
+
+class TLB:
+    """
+    Set-associative translation lookaside buffer with ASID-tagged entries.
+    Each set is a short list ordered from least to most recently used, so a
+    lookup or fill costs O(associativity).
+    """
+
+    def __init__(self, entries=64, associativity=4, replacement='lru', seed=0):
+        if replacement not in TLB_REPLACEMENTS:
+            raise ValueError(f'Unknown TLB replacement: {replacement}')
+        self.associativity = max(1, min(associativity, entries))
+        self.num_sets = max(1, entries // self.associativity)
+        self.entries = self.num_sets * self.associativity
+        self.replacement = replacement
+        self.sets = [[] for _ in range(self.num_sets)]
+        self._rng = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _set_for(self, page_number):
+        return self.sets[page_number % self.num_sets]
+
+    def lookup(self, page_number, asid=0):
+        """Frame cached for (asid, page), or None on a TLB miss"""
+        tlb_set = self._set_for(page_number)
+        for i, entry in enumerate(tlb_set):
+            if entry[0] == page_number and entry[1] == asid:
+                self.hits += 1
+                if self.replacement == 'lru' and i != len(tlb_set) - 1:
+                    tlb_set.append(tlb_set.pop(i))
+                return entry[2]
+        self.misses += 1
+        return None
+
+    def insert(self, page_number, frame_number, asid=0):
+        """Fill an entry after a page-table walk, evicting if the set is full"""
+        tlb_set = self._set_for(page_number)
+        for i, entry in enumerate(tlb_set):
+            if entry[0] == page_number and entry[1] == asid:
+                del tlb_set[i]
+                break
+        else:
+            if len(tlb_set) >= self.associativity:
+                victim = self._rng.randrange(len(tlb_set)) if self.replacement == 'random' else 0
+                del tlb_set[victim]
+                self.evictions += 1
+        tlb_set.append([page_number, asid, frame_number])
+
+    def invalidate(self, page_number, asid=None):
+        """Shoot down entries for a page that left memory (any ASID by default)"""
+        tlb_set = self._set_for(page_number)
+        tlb_set[:] = [
+            e for e in tlb_set
+            if not (e[0] == page_number and (asid is None or e[1] == asid))
+        ]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': self.entries,
+            'associativity': self.associativity,
+            'sets': self.num_sets,
+            'replacement': self.replacement,
+            'tlb_hits': self.hits,
+            'tlb_misses': self.misses,
+            'tlb_evictions': self.evictions,
+            'tlb_hit_ratio': round(self.hits / lookups * 100, 2) if lookups else 0
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a TLB from an API-style config dict"""
+        return cls(
+            entries=config.get('entries', 64),
+            associativity=config.get('associativity', 4),
+            replacement=config.get('replacement', 'lru'),
+            seed=config.get('seed', 0)
+        )
@@ -0,0 +1,111 @@
+import mmap
+import os
+
+import numpy as np
+
+TRACE_FORMATS = ['lackey', 'binary']
+
+# Packed binary record: little-endian u64 address followed by a type byte
+RECORD_DTYPE = np.dtype([('address', '<u8'), ('type', 'u1')])
+RECORD_READ = 0
+RECORD_WRITE = 1
+RECORD_FETCH = 2
+
+def _parse_text_line(line, include_instructions):
+    """
+    (address, is_write) for one trace line, or None for headers, comments
+    and anything unparseable. Understands Valgrind lackey lines
+    ("I  0023C790,2", " S BE80199C,4", " L ...", " M ...") and pinatrace
+    lines ("0x401000: W 0x7ffd1c0").
+    """
+    parts = line.split()
+    if len(parts) < 2:
+        return None
+    kind = parts[0]
+
+    if kind.endswith(':'):
+        # pinatrace: <ip>: <R|W> <address>
+        if len(parts) < 3 or parts[1] not in ('R', 'W'):
+            return None
+        try:
+            return int(parts[2], 16), parts[1] == 'W'
+        except ValueError:
+            return None
+
+    if kind == 'I' and not include_instructions:
+        return None
+    if kind not in ('I', 'L', 'S', 'M'):
+        return None
+    try:
+        address = int(parts[1].split(',', 1)[0], 16)
+    except ValueError:
+        return None
+    # M (modify) is a load and a store to the same address: one write
+    return address, kind in ('S', 'M')
+
+def read_lackey(path, include_instructions=True, chunk_size=65536):
+    """
+    Stream a lackey (or pinatrace) text trace as (addresses, is_write)
+    chunks of at most `chunk_size` accesses, holding one chunk at a time
+    """
+    addresses = []
+    writes = []
+    with open(path, 'r', errors='replace') as trace:
+        for line in trace:
+            access = _parse_text_line(line, include_instructions)
+            if access is None:
+                continue
+            addresses.append(access[0])
+            writes.append(access[1])
+            if len(addresses) >= chunk_size:
+                yield addresses, writes
+                addresses = []
+                writes = []
+    if addresses:
+        yield addresses, writes
+
+def read_binary(path, include_instructions=True, chunk_size=65536):
+    """
+    Stream a packed binary trace through mmap as (addresses, is_write)
+    chunks. Records are viewed in place with numpy, so only the current
+    chunk is ever converted; a trailing partial record is ignored.
+    """
+    count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return
+    with open(path, 'rb') as trace, mmap.mmap(trace.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        records = np.frombuffer(mapped, dtype=RECORD_DTYPE, count=count)
+        chunk = None
+        try:
+            for start in range(0, count, chunk_size):
+                chunk = records[start:start + chunk_size]
+                if not include_instructions:
+                    chunk = chunk[chunk['type'] != RECORD_FETCH]
+                yield chunk['address'].tolist(), (chunk['type'] == RECORD_WRITE).tolist()
+        finally:
+            # The mmap cannot close while a numpy view still exports it
+            del records, chunk
+
+def read_trace(path, trace_format, include_instructions=True, chunk_size=65536):
+    if trace_format == 'binary':
+        return read_binary(path, include_instructions, chunk_size)
+    return read_lackey(path, include_instructions, chunk_size)
+
+def replay_trace(access, path, trace_format, include_instructions=True, max_accesses=None):
+    """Feed a trace through access(address, 'read' | 'write'), stopping after max_accesses"""
+    remaining = max_accesses
+    for addresses, writes in read_trace(path, trace_format, include_instructions):
+        if remaining is not None:
+            addresses, writes = addresses[:remaining], writes[:remaining]
+            remaining -= len(addresses)
+        for address, write in zip(addresses, writes):
+            access(address, 'write' if write else 'read')
+        if remaining == 0:
+            break
+
+def write_binary(path, addresses, types):
+    """Pack addresses and record types (RECORD_READ/WRITE/FETCH) into a binary trace"""
+    records = np.empty(len(addresses), dtype=RECORD_DTYPE)
+    records['address'] = addresses
+    records['type'] = types
+    records.tofile(path)
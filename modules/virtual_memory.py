@@ -1,194 +1,289 @@
+import copy
 import math
 
+from modules.access_log import LOG_FORMATS, LOG_MODES, SAMPLE_METHODS
+from modules.latency import COST_FIELDS, check_cost
+from modules.memory_hierarchy import MemoryHierarchyEngine, check_tiers, default_tiers
+from modules.prefetchers import PREFETCHERS
+from modules.replacement_policies import REPLACEMENT_POLICIES
+from modules.session_store import SessionStore, unknown_session
+from modules.tlb import TLB_REPLACEMENTS
+from modules.trace_reader import TRACE_FORMATS, replay_trace
+from modules.vm_engine import MultiProcessEngine, PageTableSession, VirtualMemoryEngine
+
 class VirtualMemorySimulator:
-    def __init__(self):
-        pass
+    def __init__(self, max_sessions=32, session_ttl=900):
+        # Finished runs are kept as sessions so later calls (translate) can
+        # use their page tables without the client sending them back; only
+        # resumable runs keep the whole engine for append and checkpoint
+        self.sessions = SessionStore(max_sessions, session_ttl)
     
-    def simulate(self, virtual_size, physical_size, page_size, access_pattern):
+    def simulate(self, virtual_size, physical_size, page_size, access_pattern, tlb_config=None, replacement='fifo',
+                 working_set_config=None, log='full', log_options=None, prefetch_config=None, latency_config=None,
+                 resumable=False):
         """
-        Simulate virtual memory management
+        Simulate virtual memory management with a pluggable page replacement
+        policy (fifo, lru, clock, enhanced_second_chance, wsclock), optionally
+        with a TLB in front of the page table, a working-set tracker (window
+        τ, sampling interval, thrashing threshold) and a prefetcher
+        (sequential, stride, markov). The access log keeps every access, a
+        sample (reservoir or every k-th) or nothing. Costs come from a
+        configurable latency model, and every run reports a latency
+        histogram with p50/p95/p99 alongside the mean EAT. The session keeps
+        only the page table unless `resumable`, which keeps the engine so
+        append and checkpoint can continue it.
         """
-        # Calculate number of virtual pages and physical frames
-        num_virtual_pages = virtual_size // page_size
-        num_physical_frames = physical_size // page_size
+        error = self._check_options(replacement, log, log_options, prefetch_config, latency_config,
+                                    working_set_config, tlb_config)
+        if error:
+            return error
         
-        # Initialize page table (all pages initially not in memory)
-        page_table = {}
-        for i in range(num_virtual_pages):
-            page_table[i] = {
-                'page_number': i,
-                'frame_number': None,
-                'valid': False,
-                'dirty': False,
-                'reference': False
-            }
+        engine = VirtualMemoryEngine(virtual_size, physical_size, page_size, replacement, tlb_config,
+                                     working_set_config, log, log_options, prefetch_config, latency_config)
+        for access in access_pattern:
+            engine.access(access['address'], access.get('type', 'read'), access.get('asid', 0))
+        
+        result = engine.result()
+        result['session_id'] = self._store(engine, resumable)
+        return result
+    
+    def simulate_trace(self, trace_path, trace_format='lackey', virtual_size=1 << 48, physical_size=1 << 24,
+                       page_size=4096, tlb_config=None, replacement='fifo', working_set_config=None,
+                       include_instructions=True, max_accesses=None, log='none', log_options=None,
+                       prefetch_config=None, latency_config=None, resumable=False):
+        """
+        Simulate a memory trace file (lackey/pinatrace text or packed
+        binary). The trace is streamed in chunks straight into the engine,
+        by default without an access log, so memory stays bounded by the
+        number of distinct pages rather than the trace length.
+        """
+        error = self._check_options(replacement, log, log_options, prefetch_config, latency_config,
+                                    working_set_config, tlb_config)
+        if error:
+            return error
+        if trace_format not in TRACE_FORMATS:
+            return {'trace_format': trace_format, 'error': f'Unknown trace format: {trace_format}', 'success': False}
+        
+        engine = VirtualMemoryEngine(virtual_size, physical_size, page_size, replacement, tlb_config,
+                                     working_set_config, log, log_options, prefetch_config, latency_config)
+        replay_trace(engine.access, trace_path, trace_format, include_instructions, max_accesses)
         
-        # Track frames
-        frames = [None] * num_physical_frames
-        free_frames = list(range(num_physical_frames))
+        result = engine.result()
+        result['trace_format'] = trace_format
+        result['session_id'] = self._store(engine, resumable)
+        return result
+    
+    def _store(self, engine, resumable):
+        return self.sessions.create(engine if resumable else PageTableSession(engine))
+    
+    def _check_options(self, replacement, log, log_options, prefetch_config=None, latency_config=None,
+                       working_set_config=None, tlb_config=None):
+        if replacement not in REPLACEMENT_POLICIES:
+            return {'replacement': replacement, 'error': f'Unknown replacement policy: {replacement}', 'success': False}
+        tlb_replacement = (tlb_config or {}).get('replacement', 'lru')
+        if tlb_replacement not in TLB_REPLACEMENTS:
+            return {'tlb': tlb_config, 'error': f'Unknown TLB replacement: {tlb_replacement}', 'success': False}
+        for name in ('window', 'interval'):
+            value = (working_set_config or {}).get(name, 1)
+            if not isinstance(value, (int, float)) or value < 1:
+                return {'working_set': working_set_config, 'error': f'Working-set {name} must be at least 1', 'success': False}
+        if log not in LOG_MODES:
+            return {'log': log, 'error': f'Unknown log mode: {log}', 'success': False}
+        method = (log_options or {}).get('method', 'reservoir')
+        if method not in SAMPLE_METHODS:
+            return {'log': log, 'error': f'Unknown sampling method: {method}', 'success': False}
+        log_format = (log_options or {}).get('format', 'rows')
+        if log_format not in LOG_FORMATS:
+            return {'log': log, 'error': f'Unknown log format: {log_format}', 'success': False}
+        if prefetch_config and prefetch_config.get('type', 'sequential') not in PREFETCHERS:
+            prefetcher = prefetch_config['type']
+            return {'prefetch': prefetch_config, 'error': f'Unknown prefetcher: {prefetcher}', 'success': False}
+        for name in COST_FIELDS:
+            if name in (latency_config or {}):
+                error = check_cost(latency_config[name])
+                if error:
+                    return {'latency': latency_config, 'error': f'{name} {error}', 'success': False}
+        return None
+    
+    def simulate_multiprocess(self, virtual_size, physical_size, page_size, access_pattern, replacement='fifo',
+                              scope='global', quotas=None):
+        """
+        Simulate many processes, each access tagged with a pid, sharing one
+        pool of physical frames. Global replacement may take a victim from
+        any process; local replacement only from the faulting process,
+        which holds at most its quota of frames. Processes without an
+        explicit quota split the frames left over equally.
+        """
+        if replacement not in REPLACEMENT_POLICIES:
+            return {'replacement': replacement, 'error': f'Unknown replacement policy: {replacement}', 'success': False}
+        if scope not in ('global', 'local'):
+            return {'scope': scope, 'error': f'Unknown replacement scope: {scope}', 'success': False}
         
-        # Simulate access pattern
-        access_log = []
-        page_faults = 0
-        page_hits = 0
-        disk_writes = 0
+        process_quotas = None
+        if scope == 'local':
+            # Quota keys arrive as JSON strings; match them to pids as given
+            quotas = {str(pid): frames for pid, frames in (quotas or {}).items()}
+            pids = list(dict.fromkeys(access.get('pid', 0) for access in access_pattern))
+            num_frames = physical_size // page_size
+            unassigned = [pid for pid in pids if str(pid) not in quotas]
+            spare = num_frames - sum(quotas.get(str(pid), 0) for pid in pids)
+            default_quota = spare // len(unassigned) if unassigned else 0
+            process_quotas = {pid: quotas.get(str(pid), default_quota) for pid in pids}
+            if spare < 0 or any(frames < 1 for frames in process_quotas.values()):
+                return {
+                    'scope': scope,
+                    'error': f'{num_frames} frames cannot give {len(pids)} processes at least one frame each within their quotas',
+                    'success': False
+                }
         
+        engine = MultiProcessEngine(virtual_size, physical_size, page_size, replacement, scope, process_quotas)
         for access in access_pattern:
-            logical_address = access['address']
-            access_type = access.get('type', 'read')  # 'read' or 'write'
-            
-            page_number = logical_address // page_size
-            offset = logical_address % page_size
-            
-            if page_number >= num_virtual_pages:
-                access_log.append({
-                    'address': logical_address,
-                    'page_number': page_number,
-                    'offset': offset,
-                    'type': access_type,
-                    'result': 'Invalid address',
-                    'page_fault': False
-                })
-                continue
-            
-            page_entry = page_table[page_number]
-            
-            if page_entry['valid']:
-                # Page hit
-                page_hits += 1
-                frame_number = page_entry['frame_number']
-                physical_address = frame_number * page_size + offset
-                page_entry['reference'] = True
-                
-                if access_type == 'write':
-                    page_entry['dirty'] = True
-                
-                access_log.append({
-                    'address': logical_address,
-                    'page_number': page_number,
-                    'offset': offset,
-                    'frame_number': frame_number,
-                    'physical_address': physical_address,
-                    'type': access_type,
-                    'result': 'Hit',
-                    'page_fault': False
-                })
-            else:
-                # Page fault
-                page_faults += 1
-                
-                if free_frames:
-                    # Allocate a free frame
-                    frame_number = free_frames.pop(0)
-                else:
-                    # Need to replace a page (using FIFO for simplicity)
-                    victim_page = None
-                    for pg_num, pg_entry in page_table.items():
-                        if pg_entry['valid']:
-                            victim_page = pg_num
-                            break
-                    
-                    frame_number = page_table[victim_page]['frame_number']
-                    
-                    # Check if victim page is dirty (needs to be written back)
-                    if page_table[victim_page]['dirty']:
-                        disk_writes += 1
-                    
-                    # Invalidate victim page
-                    page_table[victim_page]['valid'] = False
-                    page_table[victim_page]['frame_number'] = None
-                    page_table[victim_page]['dirty'] = False
-                
-                # Load page into frame
-                frames[frame_number] = page_number
-                page_entry['frame_number'] = frame_number
-                page_entry['valid'] = True
-                page_entry['reference'] = True
-                
-                if access_type == 'write':
-                    page_entry['dirty'] = True
-                
-                physical_address = frame_number * page_size + offset
-                
-                access_log.append({
-                    'address': logical_address,
-                    'page_number': page_number,
-                    'offset': offset,
-                    'frame_number': frame_number,
-                    'physical_address': physical_address,
-                    'type': access_type,
-                    'result': 'Page Fault',
-                    'page_fault': True
-                })
+            engine.access(access.get('pid', 0), access['address'], access.get('type', 'read'))
         
-        # Calculate metrics
-        total_accesses = len(access_pattern)
-        page_fault_rate = (page_faults / total_accesses * 100) if total_accesses > 0 else 0
-        hit_rate = (page_hits / total_accesses * 100) if total_accesses > 0 else 0
+        return engine.result()
+    
+    def simulate_hierarchy(self, virtual_size, physical_size, page_size, access_pattern, tiers=None):
+        """
+        Simulate accesses through a memory hierarchy (caches, DRAM, a
+        compressed pool, swap); `tiers` defaults to default_tiers() with
+        DRAM of physical_size bytes
+        """
+        tiers = tiers or default_tiers(physical_size)
+        error = check_tiers(tiers, page_size)
+        if error:
+            return {'tiers': tiers, 'error': error, 'success': False}
         
-        # Effective Access Time (EAT)
-        memory_access_time = 100  # nanoseconds
-        page_fault_service_time = 8000000  # 8ms in nanoseconds
-        eat = (hit_rate/100) * memory_access_time + (page_fault_rate/100) * page_fault_service_time
+        engine = MemoryHierarchyEngine(virtual_size, page_size, tiers)
+        for access in access_pattern:
+            engine.access(access['address'], access.get('type', 'read'))
         
+        return engine.result()
+    
+    def simulate_hierarchy_trace(self, trace_path, trace_format='lackey', virtual_size=1 << 48, physical_size=1 << 24,
+                                 page_size=4096, tiers=None, include_instructions=True, max_accesses=None):
+        """Stream a memory trace file through the hierarchy, chunk by chunk"""
+        tiers = tiers or default_tiers(physical_size)
+        error = check_tiers(tiers, page_size)
+        if error:
+            return {'tiers': tiers, 'error': error, 'success': False}
+        if trace_format not in TRACE_FORMATS:
+            return {'trace_format': trace_format, 'error': f'Unknown trace format: {trace_format}', 'success': False}
+        
+        engine = MemoryHierarchyEngine(virtual_size, page_size, tiers)
+        replay_trace(engine.access, trace_path, trace_format, include_instructions, max_accesses)
+        
+        result = engine.result()
+        result['trace_format'] = trace_format
+        return result
+    
+    def append(self, session_id, access_pattern):
+        """
+        Continue a stored simulation with more accesses. Only the new log
+        entries are returned, with the updated totals, so the cost is
+        proportional to the appended length rather than the whole pattern.
+        """
+        with self.sessions.use(session_id) as engine:
+            if engine is None:
+                return unknown_session(session_id)
+            if not isinstance(engine, VirtualMemoryEngine):
+                return self._not_resumable(session_id)
+            
+            start = engine.total_accesses
+            for access in access_pattern:
+                engine.access(access['address'], access.get('type', 'read'), access.get('asid', 0))
+            
+            return {
+                'session_id': session_id,
+                'start_index': start,
+                'appended': len(access_pattern),
+                'access_log': engine.access_log.since(start),
+                'touched_pages': len(engine.page_table),
+                **engine.totals()
+            }
+    
+    def checkpoint(self, session_id):
+        """
+        Snapshot a stored simulation under a new session id; appending to
+        either one leaves the other untouched
+        """
+        with self.sessions.use(session_id) as engine:
+            if engine is None:
+                return unknown_session(session_id)
+            if not isinstance(engine, VirtualMemoryEngine):
+                return self._not_resumable(session_id)
+            snapshot = copy.deepcopy(engine)
         return {
-            'virtual_size': virtual_size,
-            'physical_size': physical_size,
-            'page_size': page_size,
-            'num_virtual_pages': num_virtual_pages,
-            'num_physical_frames': num_physical_frames,
-            'page_table': [page_table[i] for i in range(num_virtual_pages)],
-            'frames': frames,
-            'access_log': access_log,
-            'total_accesses': total_accesses,
-            'page_faults': page_faults,
-            'page_hits': page_hits,
-            'disk_writes': disk_writes,
-            'page_fault_rate': round(page_fault_rate, 2),
-            'hit_rate': round(hit_rate, 2),
-            'effective_access_time': round(eat, 2)
+            'session_id': session_id,
+            'checkpoint_id': self.sessions.create(snapshot),
+            'total_accesses': snapshot.total_accesses,
+            'success': True
+        }
+    
+    def _not_resumable(self, session_id):
+        return {
+            'session_id': session_id,
+            'resumable': False,
+            'error': 'Session only keeps its page table; simulate with resumable to continue it',
+            'success': False
         }
     
     def translate_address(self, logical_address, page_size, page_table):
         """
-        Translate a single logical address to physical address
+        Translate a single logical address to physical address against a
+        page table sent by the client (JSON object keys arrive as strings)
         """
+        page_number = logical_address // page_size
+        page_entry = page_table.get(page_number, page_table.get(str(page_number)))
+        return self._translate(logical_address, page_size, page_entry, page_entry is not None)
+    
+    def translate_session(self, session_id, logical_address):
+        """
+        Translate against the page table of a stored simulation session, an
+        O(1) lookup in its sparse table
+        """
+        with self.sessions.use(session_id) as engine:
+            if engine is None:
+                return unknown_session(session_id, logical_address=logical_address)
+            page_number = logical_address // engine.page_size
+            result = self._translate(
+                logical_address, engine.page_size, engine.page_table.get(page_number),
+                page_number < engine.num_virtual_pages
+            )
+        result['session_id'] = session_id
+        return result
+    
+    def _translate(self, logical_address, page_size, page_entry, in_range):
         page_number = logical_address // page_size
         offset = logical_address % page_size
         
-        # Convert page_table dict keys to integers if they're strings
-        page_table_int = {int(k): v for k, v in page_table.items()}
-        
-        if page_number in page_table_int:
-            page_entry = page_table_int[page_number]
+        if page_entry is not None and page_entry['valid']:
+            frame_number = page_entry['frame_number']
+            physical_address = frame_number * page_size + offset
             
-            if page_entry['valid']:
-                frame_number = page_entry['frame_number']
-                physical_address = frame_number * page_size + offset
-                
-                return {
-                    'logical_address': logical_address,
-                    'page_number': page_number,
-                    'offset': offset,
-                    'frame_number': frame_number,
-                    'physical_address': physical_address,
-                    'success': True,
-                    'binary_breakdown': {
-                        'logical_binary': bin(logical_address)[2:].zfill(16),
-                        'page_bits': bin(page_number)[2:].zfill(8),
-                        'offset_bits': bin(offset)[2:].zfill(8),
-                        'frame_bits': bin(frame_number)[2:].zfill(8),
-                        'physical_binary': bin(physical_address)[2:].zfill(16)
-                    }
-                }
-            else:
-                return {
-                    'logical_address': logical_address,
-                    'page_number': page_number,
-                    'offset': offset,
-                    'error': 'Page fault - Page not in memory',
-                    'success': False
+            return {
+                'logical_address': logical_address,
+                'page_number': page_number,
+                'offset': offset,
+                'frame_number': frame_number,
+                'physical_address': physical_address,
+                'success': True,
+                'binary_breakdown': {
+                    'logical_binary': bin(logical_address)[2:].zfill(16),
+                    'page_bits': bin(page_number)[2:].zfill(8),
+                    'offset_bits': bin(offset)[2:].zfill(8),
+                    'frame_bits': bin(frame_number)[2:].zfill(8),
+                    'physical_binary': bin(physical_address)[2:].zfill(16)
                 }
+            }
+        elif in_range:
+            # Known page (or untouched page of a session) that is not resident
+            return {
+                'logical_address': logical_address,
+                'page_number': page_number,
+                'offset': offset,
+                'error': 'Page fault - Page not in memory',
+                'success': False
+            }
         else:
             return {
                 'logical_address': logical_address,
@@ -134,13 +134,9 @@ class Visualizer:
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
         
         if mode == 'paging':
-            # Page Table Visualization
-            page_table = result['page_table']
-            valid_pages = [p for p in page_table if p['valid']]
-            invalid_pages = [p for p in page_table if not p['valid']]
-            
-            valid_count = len(valid_pages)
-            invalid_count = len(invalid_pages)
+            # Page Table Visualization (counts come from the range-encoded table)
+            valid_count = result['frames_used']
+            invalid_count = result['num_pages'] - valid_count
             
             # Bar chart for page status
             categories = ['Pages in Memory', 'Pages Not in Memory']
@@ -416,8 +412,9 @@ class Visualizer:
                     f'{height:.1f}%', ha='center', va='bottom', fontweight='bold')
         
         # Page Table Status
+        # The page table is sparse: untouched pages are on disk too
         valid_pages = sum(1 for page in result['page_table'] if page['valid'])
-        invalid_pages = len(result['page_table']) - valid_pages
+        invalid_pages = result['num_virtual_pages'] - valid_pages
         
         sizes = [valid_pages, invalid_pages]
         labels = ['Pages in Memory', 'Pages on Disk']
@@ -0,0 +1,497 @@
+from modules.access_log import FLAG_INVALID, FLAG_PAGE_FAULT, FLAG_TLB_HIT, FLAG_WRITE, AccessLog
+from modules.latency import LatencyHistogram, LatencyModel
+from modules.lazy_view import LazyView
+from modules.prefetchers import make_prefetcher
+from modules.replacement_policies import DEFAULT_WINDOW, make_policy
+from modules.tlb import TLB
+from modules.working_set import WorkingSetTracker
+
+def new_page_entry(page_number):
+    return {
+        'page_number': page_number,
+        'frame_number': None,
+        'valid': False,
+        'dirty': False,
+        'reference': False
+    }
+
+class VirtualMemoryEngine:
+    """
+    Stateful demand-paging engine behind VirtualMemorySimulator. Accesses
+    are fed one at a time through access(); the page table is sparse and
+    victims come from a pluggable replacement policy, so every access costs
+    O(1) amortised whatever the size of the address space.
+    """
+    memory_access_time = 100  # nanoseconds
+    page_fault_service_time = 8000000  # 8ms in nanoseconds
+
+    def __init__(self, virtual_size, physical_size, page_size, replacement='fifo', tlb_config=None,
+                 working_set_config=None, log='full', log_options=None, prefetch_config=None, latency_config=None):
+        # Calculate number of virtual pages and physical frames
+        self.virtual_size = virtual_size
+        self.physical_size = physical_size
+        self.page_size = page_size
+        self.num_virtual_pages = virtual_size // page_size
+        self.num_physical_frames = physical_size // page_size
+        self.replacement = replacement
+        # The working-set window τ is shared by the tracker and WSClock
+        working_set_config = working_set_config or {}
+        window = working_set_config.get('window', DEFAULT_WINDOW)
+        self.policy = make_policy(replacement, self.num_physical_frames, window, self._write_back)
+
+        # Sparse page table: an entry is created the first time a page is
+        # touched, so cost scales with distinct pages, not virtual_size
+        self.page_table = {}
+
+        # Track frames (frame -> page); frames are handed out in order until
+        # memory is full, then reused through replacement
+        self.frames = {}
+        self.next_free_frame = 0
+
+        self.tlb_config = tlb_config
+        self.tlb = TLB.from_config(tlb_config) if tlb_config else None
+
+        # Cost model (mean costs feed the EAT) and per-access latency histogram
+        self.latency_model = LatencyModel(latency_config, tlb_config)
+        self.memory_access_time = self.latency_model.memory.mean
+        self.page_fault_service_time = self.latency_model.fault.mean
+        self.latency = LatencyHistogram()
+        self.working_set = WorkingSetTracker(
+            window,
+            self.num_physical_frames,
+            working_set_config.get('interval', 100),
+            working_set_config.get('faultRateThreshold', 0.5)
+        ) if working_set_config else None
+
+        # Typed log columns; long traces run with log='none' or 'sampled'
+        # so memory stays bounded
+        self.access_log = AccessLog(page_size, log, log_options, tlb=self.tlb is not None)
+
+        # Prefetching: pages read ahead but not yet used, and a demand-only
+        # shadow engine fed the same accesses to measure the fault reduction
+        self.prefetch_config = prefetch_config
+        self.prefetcher = make_prefetcher(prefetch_config, self.num_physical_frames) if prefetch_config else None
+        self.prefetched = set()
+        self.prefetches_issued = 0
+        self.prefetches_useful = 0
+        self.prefetches_wasted = 0
+        self.baseline = VirtualMemoryEngine(
+            virtual_size, physical_size, page_size, replacement, log='none',
+            working_set_config={'window': window} if replacement == 'wsclock' else None
+        ) if prefetch_config else None
+        self.total_accesses = 0
+        self.page_faults = 0
+        self.page_hits = 0
+        self.disk_writes = 0
+
+    def access(self, logical_address, access_type='read', asid=0):
+        """Simulate one memory access; True if it page-faulted"""
+        self.total_accesses += 1
+        if self.baseline:
+            self.baseline.access(logical_address, access_type, asid)
+        disk_writes = self.disk_writes
+        page_size = self.page_size
+        page_number = logical_address // page_size
+        offset = logical_address % page_size
+
+        if page_number >= self.num_virtual_pages:
+            if self.access_log.enabled:
+                flags = FLAG_INVALID | (FLAG_WRITE if access_type == 'write' else 0)
+                self.access_log.record(page_number, offset, -1, flags)
+            return False
+
+        page_entry = self.page_table.get(page_number)
+        if page_entry is None:
+            page_entry = self.page_table[page_number] = new_page_entry(page_number)
+        tlb = self.tlb
+        tlb_hit = tlb.lookup(page_number, asid) is not None if tlb else None
+
+        if page_entry['valid']:
+            # Page hit
+            self.page_hits += 1
+            frame_number = page_entry['frame_number']
+            if tlb and not tlb_hit:
+                tlb.insert(page_number, frame_number, asid)
+            page_entry['reference'] = True
+            self.policy.on_access(page_number, page_entry)
+            if page_number in self.prefetched:
+                self.prefetched.discard(page_number)
+                self.prefetches_useful += 1
+            page_fault = False
+        else:
+            # Page fault
+            self.page_faults += 1
+            frame_number = self._load(page_number, page_entry)
+            if tlb:
+                tlb.insert(page_number, frame_number, asid)
+            page_fault = True
+
+        if access_type == 'write':
+            page_entry['dirty'] = True
+        if self.working_set:
+            self.working_set.record(page_number, page_fault)
+        # Read-ahead is asynchronous, so it is not on this access's path
+        self.latency.record(self.latency_model.access_latency(tlb_hit, page_fault, self.disk_writes - disk_writes))
+        if self.prefetcher:
+            # Never read ahead so much that the demanded page itself is evicted
+            budget = self.num_physical_frames - 1
+            for candidate in self.prefetcher.predict(page_number, page_fault):
+                if budget <= 0:
+                    break
+                budget -= self._prefetch(candidate)
+        if self.access_log.enabled:
+            flags = FLAG_PAGE_FAULT if page_fault else 0
+            if access_type == 'write':
+                flags |= FLAG_WRITE
+            if tlb_hit:
+                flags |= FLAG_TLB_HIT
+            self.access_log.record(page_number, offset, frame_number, flags)
+        return page_fault
+
+    def _load(self, page_number, page_entry):
+        """Bring a page into a free frame, evicting a victim if memory is full"""
+        if self.next_free_frame < self.num_physical_frames:
+            # Allocate a free frame
+            frame_number = self.next_free_frame
+            self.next_free_frame += 1
+        else:
+            victim_page = self.policy.select_victim(self.page_table)
+            frame_number = self._evict(victim_page)
+
+        # Load page into frame
+        self.frames[frame_number] = page_number
+        page_entry['frame_number'] = frame_number
+        page_entry['valid'] = True
+        page_entry['reference'] = True
+        self.policy.on_load(page_number, page_entry)
+        return frame_number
+
+    def _prefetch(self, page_number):
+        """
+        Read a predicted page ahead of use unless it is resident or out of
+        range; True if a page was loaded
+        """
+        if not 0 <= page_number < self.num_virtual_pages:
+            return False
+        page_entry = self.page_table.get(page_number)
+        if page_entry is None:
+            page_entry = self.page_table[page_number] = new_page_entry(page_number)
+        elif page_entry['valid']:
+            return False
+        # Loaded referenced, so CLOCK-style policies give a read-ahead page
+        # one lap of the hand to be used before it can be evicted
+        self._load(page_number, page_entry)
+        self.prefetched.add(page_number)
+        self.prefetches_issued += 1
+        return True
+
+    def _evict(self, victim_page):
+        """Invalidate a resident page and return the frame it held"""
+        victim = self.page_table[victim_page]
+        frame_number = victim['frame_number']
+        if victim_page in self.prefetched:
+            # Read ahead, never used
+            self.prefetched.discard(victim_page)
+            self.prefetches_wasted += 1
+
+        # Check if victim page is dirty (needs to be written back)
+        if victim['dirty']:
+            self.disk_writes += 1
+
+        if self.tlb:
+            self.tlb.invalidate(victim_page)
+        victim['valid'] = False
+        victim['frame_number'] = None
+        victim['dirty'] = False
+        return frame_number
+
+    def _write_back(self, page_number, entry):
+        """A dirty page cleaned by the policy ahead of eviction"""
+        self.disk_writes += 1
+
+    def result(self):
+        """Metrics and tables in the VirtualMemorySimulator.simulate format"""
+        result = {
+            'virtual_size': self.virtual_size,
+            'physical_size': self.physical_size,
+            'page_size': self.page_size,
+            'num_virtual_pages': self.num_virtual_pages,
+            'num_physical_frames': self.num_physical_frames,
+            'replacement': self.replacement,
+            'page_table': [self.page_table[i] for i in sorted(self.page_table)],
+            'touched_pages': len(self.page_table),
+            'frames': LazyView(self.num_physical_frames, self.frames.get),
+            'access_log': self.access_log,
+            **self.totals()
+        }
+
+        return result
+
+    def totals(self):
+        """Running counters, rates and reports shared by simulate and append"""
+        total_accesses = self.total_accesses
+        page_fault_rate = (self.page_faults / total_accesses * 100) if total_accesses > 0 else 0
+        hit_rate = (self.page_hits / total_accesses * 100) if total_accesses > 0 else 0
+
+        # Effective Access Time (EAT)
+        eat = (hit_rate/100) * self.memory_access_time + (page_fault_rate/100) * self.page_fault_service_time
+        eat += self._writeback_time()
+
+        totals = {
+            'total_accesses': total_accesses,
+            'page_faults': self.page_faults,
+            'page_hits': self.page_hits,
+            'disk_writes': self.disk_writes,
+            'page_fault_rate': round(page_fault_rate, 2),
+            'hit_rate': round(hit_rate, 2),
+            'effective_access_time': round(eat, 2)
+        }
+
+        if self.tlb:
+            totals['tlb'] = self.tlb.stats()
+            totals['tlb_effective_access_time'] = round(self._tlb_eat(), 2)
+
+        if self.working_set:
+            totals['working_set'] = self.working_set.report()
+
+        totals['latency'] = {'model': self.latency_model.means(), **self.latency.report()}
+
+        if self.prefetcher:
+            totals['prefetch'] = self._prefetch_report()
+
+        return totals
+
+    def _prefetch_report(self):
+        """
+        Accuracy: share of prefetched pages used before eviction. Coverage:
+        share of would-be faults that a prefetch absorbed. Fault reduction:
+        faults saved against the demand-only shadow run.
+        """
+        issued = self.prefetches_issued
+        useful = self.prefetches_useful
+        baseline_faults = self.baseline.page_faults
+        return {
+            'prefetcher': self.prefetcher.name,
+            'config': self.prefetch_config,
+            'issued': issued,
+            'useful': useful,
+            'wasted': self.prefetches_wasted,
+            'pending': len(self.prefetched),
+            'accuracy': round(useful / issued * 100, 2) if issued else 0,
+            'coverage': round(useful / (useful + self.page_faults) * 100, 2) if useful + self.page_faults else 0,
+            'baseline_page_faults': baseline_faults,
+            'baseline_page_fault_rate': round(baseline_faults / self.total_accesses * 100, 2) if self.total_accesses else 0,
+            'fault_reduction': round((baseline_faults - self.page_faults) / baseline_faults * 100, 2) if baseline_faults else 0
+        }
+
+    def _tlb_eat(self):
+        """
+        EAT with the TLB in front: every access pays the TLB lookup, TLB hits
+        one memory access, TLB misses a page walk plus the access, and page
+        faults a page walk plus the fault service
+        """
+        tlb = self.tlb
+        lookups = tlb.hits + tlb.misses
+        if lookups == 0:
+            return 0
+        tlb_time = self.latency_model.tlb.mean
+        walk_time = self.latency_model.walk_levels * self.latency_model.walk_step.mean
+        walk_hits = tlb.misses - self.page_faults
+        total_time = (
+            lookups * tlb_time
+            + tlb.hits * self.memory_access_time
+            + walk_hits * (walk_time + self.memory_access_time)
+            + self.page_faults * (walk_time + self.page_fault_service_time)
+        )
+        # Invalid accesses never reach the TLB, so average over its lookups
+        return total_time / lookups + self._writeback_time()
+
+    def _writeback_time(self):
+        """Dirty write-back cost spread over every access"""
+        if self.total_accesses == 0:
+            return 0
+        return self.disk_writes * self.latency_model.writeback.mean / self.total_accesses
+
+class PageTableSession:
+    """
+    What a finished simulation keeps for address translation: the sparse
+    page table and the address-space geometry, without the access log,
+    replacement policy or working-set state of the engine
+    """
+
+    def __init__(self, engine):
+        self.page_size = engine.page_size
+        self.num_virtual_pages = engine.num_virtual_pages
+        self.page_table = engine.page_table
+        self.total_accesses = engine.total_accesses
+
+class MultiProcessEngine:
+    """
+    Many address spaces sharing one physical frame pool. Each process has
+    its own sparse page table; free frames sit on a stack, and victims come
+    from one policy over every resident page (global replacement) or from
+    the faulting process's own policy, sized to its frame quota (local
+    replacement). Each access is O(1) amortised however many processes run.
+    """
+    memory_access_time = VirtualMemoryEngine.memory_access_time
+    page_fault_service_time = VirtualMemoryEngine.page_fault_service_time
+
+    def __init__(self, virtual_size, physical_size, page_size, replacement='fifo', scope='global', quotas=None):
+        self.virtual_size = virtual_size
+        self.physical_size = physical_size
+        self.page_size = page_size
+        self.num_virtual_pages = virtual_size // page_size
+        self.num_physical_frames = physical_size // page_size
+        self.replacement = replacement
+        self.scope = scope
+        # Local replacement: pid -> frames the process may hold
+        self.quotas = quotas or {}
+
+        self.page_tables = {}
+        self.processes = {}
+        self.free_frames = list(range(self.num_physical_frames - 1, -1, -1))
+
+        # Global replacement keys policy pages by (pid, page) and hands the
+        # policy every resident entry; local replacement keeps one policy per
+        # process over that process's page table
+        self.policy = make_policy(
+            replacement, self.num_physical_frames, on_writeback=lambda key, entry: self._write_back(key[0])
+        ) if scope == 'global' else None
+        self.resident = {}
+        self.policies = {}
+
+        self.total_accesses = 0
+        self.page_faults = 0
+        self.page_hits = 0
+        self.disk_writes = 0
+
+    def _add_process(self, pid):
+        self.page_tables[pid] = {}
+        if self.scope == 'local':
+            self.policies[pid] = make_policy(
+                self.replacement, self.quotas[pid], on_writeback=lambda page_number, entry: self._write_back(pid)
+            )
+        stats = self.processes[pid] = {
+            'pid': pid,
+            'accesses': 0,
+            'invalid_accesses': 0,
+            'page_faults': 0,
+            'page_hits': 0,
+            'disk_writes': 0,
+            'resident_pages': 0,
+            'peak_resident_pages': 0,
+            'pages_stolen': 0
+        }
+        return stats
+
+    def access(self, pid, logical_address, access_type='read'):
+        """Simulate one access by process `pid`; True if it page-faulted"""
+        self.total_accesses += 1
+        stats = self.processes.get(pid) or self._add_process(pid)
+        stats['accesses'] += 1
+        page_number = logical_address // self.page_size
+
+        if page_number >= self.num_virtual_pages:
+            stats['invalid_accesses'] += 1
+            return False
+
+        page_table = self.page_tables[pid]
+        page_entry = page_table.get(page_number)
+        if page_entry is None:
+            page_entry = page_table[page_number] = new_page_entry(page_number)
+        if self.scope == 'global':
+            policy, key = self.policy, (pid, page_number)
+        else:
+            policy, key = self.policies[pid], page_number
+
+        if page_entry['valid']:
+            self.page_hits += 1
+            stats['page_hits'] += 1
+            page_entry['reference'] = True
+            policy.on_access(key, page_entry)
+            page_fault = False
+        else:
+            self.page_faults += 1
+            stats['page_faults'] += 1
+            frame_number = self._frame_for(pid, stats)
+            page_entry['frame_number'] = frame_number
+            page_entry['valid'] = True
+            page_entry['reference'] = True
+            self.resident[(pid, page_number)] = page_entry
+            stats['resident_pages'] += 1
+            if stats['resident_pages'] > stats['peak_resident_pages']:
+                stats['peak_resident_pages'] = stats['resident_pages']
+            policy.on_load(key, page_entry)
+            page_fault = True
+
+        if access_type == 'write':
+            page_entry['dirty'] = True
+        return page_fault
+
+    def _frame_for(self, pid, stats):
+        """A free frame, or the frame of a victim picked by the scope's policy"""
+        if self.scope == 'global':
+            if self.free_frames:
+                return self.free_frames.pop()
+            victim_pid, victim_page = self.policy.select_victim(self.resident)
+        else:
+            if stats['resident_pages'] < self.quotas[pid]:
+                return self.free_frames.pop()
+            victim_pid, victim_page = pid, self.policies[pid].select_victim(self.page_tables[pid])
+        return self._evict(victim_pid, victim_page, pid)
+
+    def _write_back(self, pid):
+        self.disk_writes += 1
+        self.processes[pid]['disk_writes'] += 1
+
+    def _evict(self, victim_pid, victim_page, faulting_pid):
+        victim = self.resident.pop((victim_pid, victim_page))
+        victim_stats = self.processes[victim_pid]
+        frame_number = victim['frame_number']
+
+        if victim['dirty']:
+            self.disk_writes += 1
+            victim_stats['disk_writes'] += 1
+        victim_stats['resident_pages'] -= 1
+        if victim_pid != faulting_pid:
+            victim_stats['pages_stolen'] += 1
+
+        victim['valid'] = False
+        victim['frame_number'] = None
+        victim['dirty'] = False
+        return frame_number
+
+    def result(self):
+        total_accesses = self.total_accesses
+        page_fault_rate = (self.page_faults / total_accesses * 100) if total_accesses > 0 else 0
+        hit_rate = (self.page_hits / total_accesses * 100) if total_accesses > 0 else 0
+        eat = (hit_rate/100) * self.memory_access_time + (page_fault_rate/100) * self.page_fault_service_time
+
+        processes = []
+        for pid, stats in self.processes.items():
+            process = dict(stats)
+            process['touched_pages'] = len(self.page_tables[pid])
+            process['page_fault_rate'] = round(stats['page_faults'] / stats['accesses'] * 100, 2) if stats['accesses'] else 0
+            if self.scope == 'local':
+                process['quota'] = self.quotas[pid]
+            processes.append(process)
+
+        return {
+            'virtual_size': self.virtual_size,
+            'physical_size': self.physical_size,
+            'page_size': self.page_size,
+            'num_virtual_pages': self.num_virtual_pages,
+            'num_physical_frames': self.num_physical_frames,
+            'replacement': self.replacement,
+            'scope': self.scope,
+            'num_processes': len(processes),
+            'processes': processes,
+            'free_frames': len(self.free_frames),
+            'total_accesses': total_accesses,
+            'page_faults': self.page_faults,
+            'page_hits': self.page_hits,
+            'disk_writes': self.disk_writes,
+            'page_fault_rate': round(page_fault_rate, 2),
+            'hit_rate': round(hit_rate, 2),
+            'effective_access_time': round(eat, 2)
+        }
@@ -0,0 +1,149 @@
+from collections import deque
+
+class WorkingSetTracker:
+    """
+    Incremental working-set model. W(t, τ) is the number of distinct pages
+    referenced in the last τ references: each reference is queued with its
+    time, and when it falls out of the window the page leaves the working
+    set only if it has not been referenced again since. Every reference is
+    O(1) amortised, so a long trace is never re-scanned per window.
+
+    Every `interval` references one sample of the working-set size and the
+    fault rate is closed. A sample is flagged as thrashing when its fault
+    rate reaches `fault_rate_threshold` while the working set needs more
+    pages than there are frames.
+    """
+
+    def __init__(self, window, num_frames, interval=100, fault_rate_threshold=0.5):
+        self.window = window
+        self.num_frames = num_frames
+        self.interval = max(interval, 1)
+        self.fault_rate_threshold = fault_rate_threshold
+
+        self.time = 0
+        self.references = deque()
+        self.last_reference = {}
+        self.size = 0
+        self.peak_size = 0
+        self.size_total = 0
+
+        # Time series, one point per closed interval
+        self.times = []
+        self.sizes = []
+        self.mean_sizes = []
+        self.peak_sizes = []
+        self.fault_rates = []
+        self.thrashing = []
+
+        # Running totals for the interval being filled
+        self._interval_start = 0
+        self._interval_faults = 0
+        self._interval_size_total = 0
+        self._interval_peak = 0
+
+    def record(self, page_number, page_fault):
+        """Account one reference at the next virtual time step"""
+        self.time += 1
+        time = self.time
+
+        if page_number not in self.last_reference:
+            self.size += 1
+        self.last_reference[page_number] = time
+        self.references.append((time, page_number))
+
+        # Expire references that have left the window (t - τ, t]
+        horizon = time - self.window
+        references = self.references
+        while references and references[0][0] <= horizon:
+            expired_time, expired_page = references.popleft()
+            if self.last_reference[expired_page] == expired_time:
+                del self.last_reference[expired_page]
+                self.size -= 1
+
+        size = self.size
+        self.size_total += size
+        if size > self.peak_size:
+            self.peak_size = size
+
+        self._interval_faults += page_fault
+        self._interval_size_total += size
+        if size > self._interval_peak:
+            self._interval_peak = size
+        if time - self._interval_start == self.interval:
+            self._close_interval()
+
+    def _interval_sample(self):
+        """(time, size, mean size, peak size, fault rate %, thrashing) of the open interval"""
+        length = self.time - self._interval_start
+        fault_rate = self._interval_faults / length
+        return (
+            self.time,
+            self.size,
+            round(self._interval_size_total / length, 2),
+            self._interval_peak,
+            round(fault_rate * 100, 2),
+            fault_rate >= self.fault_rate_threshold and self._interval_peak > self.num_frames
+        )
+
+    def _close_interval(self):
+        time, size, mean_size, peak_size, fault_rate, thrashing = self._interval_sample()
+        self.times.append(time)
+        self.sizes.append(size)
+        self.mean_sizes.append(mean_size)
+        self.peak_sizes.append(peak_size)
+        self.fault_rates.append(fault_rate)
+        self.thrashing.append(thrashing)
+        self._interval_start = self.time
+        self._interval_faults = 0
+        self._interval_size_total = 0
+        self._interval_peak = 0
+
+    @staticmethod
+    def thrashing_intervals(times, fault_rates, peak_sizes, thrashing):
+        """Merge consecutive flagged samples into (start, end] time ranges"""
+        intervals = []
+        start = None
+        for i, flagged in enumerate(thrashing):
+            if flagged and start is None:
+                start = i
+            if start is not None and (not flagged or i == len(thrashing) - 1):
+                end = i if flagged else i - 1
+                rates = fault_rates[start:end + 1]
+                intervals.append({
+                    'start': times[start - 1] if start > 0 else 0,
+                    'end': times[end],
+                    'mean_fault_rate': round(sum(rates) / len(rates), 2),
+                    'peak_working_set_size': max(peak_sizes[start:end + 1])
+                })
+                start = None
+        return intervals
+
+    def report(self):
+        times, sizes, mean_sizes = list(self.times), list(self.sizes), list(self.mean_sizes)
+        peak_sizes, fault_rates, thrashing = list(self.peak_sizes), list(self.fault_rates), list(self.thrashing)
+        # Include the trailing partial interval so the series covers the
+        # trace, without closing it: a resumed run must keep sampling on
+        # `interval` boundaries
+        if self.time > self._interval_start:
+            for series, value in zip((times, sizes, mean_sizes, peak_sizes, fault_rates, thrashing),
+                                     self._interval_sample()):
+                series.append(value)
+
+        return {
+            'window': self.window,
+            'interval': self.interval,
+            'fault_rate_threshold': self.fault_rate_threshold,
+            'working_set_size': self.size,
+            'peak_working_set_size': self.peak_size,
+            'mean_working_set_size': round(self.size_total / self.time, 2) if self.time else 0,
+            'timeline': {
+                'time': times,
+                'working_set_size': sizes,
+                'mean_working_set_size': mean_sizes,
+                'peak_working_set_size': peak_sizes,
+                'fault_rate': fault_rates,
+                'thrashing': thrashing
+            },
+            'thrashing_intervals': self.thrashing_intervals(times, fault_rates, peak_sizes, thrashing),
+            'thrashing': any(thrashing)
+        }
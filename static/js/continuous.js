@@ -54,6 +54,14 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    function getPartitionSizes() {
+        const value = document.getElementById('partitionSizes').value.trim();
+        if (!value) return null;
+        return value.split(',')
+            .map(size => parseInt(size.trim()))
+            .filter(size => !isNaN(size) && size > 0);
+    }
+    
     function loadSampleData() {
         const processList = document.getElementById('processList');
         processList.innerHTML = '';
@@ -70,6 +78,7 @@ document.addEventListener('DOMContentLoaded', function() {
         
         document.getElementById('memorySize').value = 1000;
         document.getElementById('partitionType').value = 'variable';
+        document.getElementById('partitionSizes').value = '';
         document.getElementById('algorithm').value = 'first_fit';
         
         appUtils.showNotification('Sample data loaded successfully!', 'success');
@@ -93,6 +102,7 @@ document.addEventListener('DOMContentLoaded', function() {
             memorySize: memorySize,
             processes: processes,
             partitionType: partitionType,
+            partitionSizes: getPartitionSizes(),
             algorithm: algorithm
         };
         
@@ -182,7 +192,8 @@ document.addEventListener('DOMContentLoaded', function() {
         const data = {
             memorySize: memorySize,
             processes: processes,
-            partitionType: partitionType
+            partitionType: partitionType,
+            partitionSizes: getPartitionSizes()
         };
         
         try {
@@ -260,6 +271,7 @@ document.addEventListener('DOMContentLoaded', function() {
         
         document.getElementById('memorySize').value = 1000;
         document.getElementById('partitionType').value = 'variable';
+        document.getElementById('partitionSizes').value = '';
         document.getElementById('algorithm').value = 'first_fit';
         
         appUtils.clearResults();
@@ -2,6 +2,8 @@
 
 document.addEventListener('DOMContentLoaded', function() {
     let accessPattern = [];
+    // Server-side session of the last simulation, used by address translation
+    let lastSessionId = null;
     
     // Initialize with sample data
     initializePage();
@@ -128,6 +130,7 @@ document.addEventListener('DOMContentLoaded', function() {
         
         try {
             const result = await appUtils.makeAPIRequest('/api/virtual-memory/simulate', 'POST', data);
+            lastSessionId = result.session_id || null;
             displayResults(result);
             appUtils.showNotification('Simulation completed successfully!', 'success');
         } catch (error) {
@@ -194,6 +197,38 @@ document.addEventListener('DOMContentLoaded', function() {
         appUtils.animateElement(pageTableDisplay);
     }
     
+    function accessLogRows(accessLog) {
+        // Rows by default (sampled rows carry their access index)
+        if (Array.isArray(accessLog)) {
+            return accessLog.map((entry, i) => ({ index: i, ...entry }));
+        }
+        
+        // With logOptions.format 'columns', rebuild one row per logged access
+        const columns = accessLog.columns;
+        const bits = accessLog.flag_bits;
+        const pageSize = accessLog.page_size;
+        
+        return columns.page_number.map((pageNumber, i) => {
+            const offset = columns.offset[i];
+            const flags = columns.flags[i];
+            const invalid = (flags & bits.invalid) !== 0;
+            const pageFault = (flags & bits.page_fault) !== 0;
+            const frameNumber = invalid ? undefined : columns.frame_number[i];
+            
+            return {
+                index: columns.index ? columns.index[i] : i,
+                address: pageNumber * pageSize + offset,
+                page_number: pageNumber,
+                offset: offset,
+                frame_number: frameNumber,
+                physical_address: invalid ? undefined : frameNumber * pageSize + offset,
+                type: (flags & bits.write) ? 'write' : 'read',
+                result: invalid ? 'Invalid address' : (pageFault ? 'Page Fault' : 'Hit'),
+                page_fault: pageFault
+            };
+        });
+    }
+    
     function displayAccessLog(accessLog) {
         const accessLogDisplay = document.getElementById('accessLogDisplay');
         const tableBody = document.getElementById('accessLogBody');
@@ -201,14 +236,14 @@ document.addEventListener('DOMContentLoaded', function() {
         accessLogDisplay.style.display = 'block';
         tableBody.innerHTML = '';
         
-        accessLog.forEach((log, index) => {
+        accessLogRows(accessLog).forEach(log => {
             const row = document.createElement('tr');
             
             const resultClass = log.page_fault ? 'status-fault' : 'status-hit';
             const resultText = log.result;
             
             row.innerHTML = `
-                <td><strong>${index + 1}</strong></td>
+                <td><strong>${log.index + 1}</strong></td>
                 <td>${log.address}</td>
                 <td>${log.page_number}</td>
                 <td>${log.offset}</td>
@@ -239,26 +274,38 @@ document.addEventListener('DOMContentLoaded', function() {
         const pageNumber = Math.floor(logicalAddress / pageSize);
         const offset = logicalAddress % pageSize;
         
-        // Create a simple page table for demonstration
-        const pageTable = {};
-        // Assume first few pages are in memory
-        for (let i = 0; i <= pageNumber; i++) {
-            pageTable[i] = {
-                valid: i < 4, // First 4 pages in memory
-                frame_number: i < 4 ? i : null
+        let data;
+        if (lastSessionId) {
+            // Translate against the page table of the last simulation
+            data = {
+                logicalAddress: logicalAddress,
+                pageSize: pageSize,
+                sessionId: lastSessionId
+            };
+        } else {
+            // Create a simple page table for demonstration
+            const pageTable = {};
+            // Assume first few pages are in memory
+            for (let i = 0; i <= pageNumber; i++) {
+                pageTable[i] = {
+                    valid: i < 4, // First 4 pages in memory
+                    frame_number: i < 4 ? i : null
+                };
+            }
+            
+            data = {
+                logicalAddress: logicalAddress,
+                pageSize: pageSize,
+                pageTable: pageTable
             };
         }
         
-        const data = {
-            logicalAddress: logicalAddress,
-            pageSize: pageSize,
-            pageTable: pageTable
-        };
-        
         try {
             const result = await appUtils.makeAPIRequest('/api/virtual-memory/translate', 'POST', data);
             displayTranslationResult(result);
         } catch (error) {
+            // The session may have expired; fall back to the demo table next time
+            lastSessionId = null;
             console.error('Translation error:', error);
         }
     }
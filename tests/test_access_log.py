@@ -0,0 +1,43 @@
+from modules.access_log import FLAG_PAGE_FAULT, FLAG_WRITE, AccessLog
+
+def _fill(log, count):
+    for i in range(count):
+        log.record(i, i % 7, i % 5, FLAG_WRITE if i % 2 else FLAG_PAGE_FAULT)
+    return log
+
+def test_full_log_keeps_every_access():
+    log = _fill(AccessLog(256), 50)
+
+    assert [entry['page_number'] for entry in log] == list(range(50))
+    assert log[3]['address'] == 3 * 256 + 3
+    assert log[3]['type'] == 'write'
+    assert log[4]['page_fault'] is True
+
+def test_every_kth_sample_matches_a_stride():
+    log = _fill(AccessLog(256, 'sampled', {'method': 'every', 'every': 7}), 100)
+
+    assert [entry['index'] for entry in log.since(0)] == list(range(0, 100, 7))
+    assert [entry['page_number'] for entry in log] == list(range(0, 100, 7))
+
+def test_reservoir_keeps_size_rows_in_access_order():
+    log = _fill(AccessLog(256, 'sampled', {'size': 20, 'seed': 3}), 5000)
+    entries = log.since(0)
+    indices = [entry['index'] for entry in entries]
+
+    assert len(log) == 20
+    assert indices == sorted(set(indices))
+    # Rows stay with the access they were taken from
+    assert all(entry['page_number'] == entry['index'] for entry in entries)
+    assert log.columns()['index'].tolist() == indices
+    assert [entry['index'] for entry in log.since(2500)] == [i for i in indices if i >= 2500]
+
+def test_reservoir_sample_is_uniform_over_the_stream():
+    # Each access should land in the reservoir with probability size / n
+    hits = [0] * 10
+    for seed in range(400):
+        log = _fill(AccessLog(256, 'sampled', {'size': 10, 'seed': seed}), 1000)
+        for entry in log.since(0):
+            hits[entry['index'] // 100] += 1
+
+    # 400 runs * 10 rows spread over 10 deciles: about 400 each
+    assert all(300 < count < 500 for count in hits)
@@ -0,0 +1,42 @@
+import statistics
+
+from modules.experiment_runner import MAX_TRIALS, AllocationExperimentRunner, generate_workload, trial_seed
+
+def test_results_do_not_depend_on_worker_count():
+    runner = AllocationExperimentRunner()
+    serial = runner.run(2000, process_count=10, trials=12, seed=3, workers=1)
+    parallel = runner.run(2000, process_count=10, trials=12, seed=3, workers=2)
+
+    assert serial['results'] == parallel['results']
+
+def test_interval_is_the_normal_approximation():
+    runner = AllocationExperimentRunner()
+    result = runner.run(2000, process_count=10, trials=30, seed=1, workers=1, confidence=0.9)
+
+    # Recompute first fit's utilisation directly from the seeded workloads
+    values = []
+    for trial in range(30):
+        processes = generate_workload(trial_seed(1, trial), 10, 'uniform', {'min_size': 50, 'max_size': 300})
+        allocated = 0
+        holes = [[0, 2000]]
+        for process in processes:
+            hole = next((hole for hole in holes if hole[1] >= process['size']), None)
+            if hole:
+                hole[0] += process['size']
+                hole[1] -= process['size']
+                allocated += process['size']
+        values.append(round(allocated / 2000 * 100, 2))
+    mean = statistics.fmean(values)
+    margin = statistics.NormalDist().inv_cdf(0.95) * statistics.stdev(values) / 30 ** 0.5
+
+    interval = result['results']['first_fit']['memory_utilization']
+    assert interval['mean'] == round(mean, 4)
+    assert interval['ci_high'] == round(mean + margin, 4)
+
+def test_invalid_inputs_are_error_entries():
+    runner = AllocationExperimentRunner()
+
+    assert runner.run(1000, trials=10, confidence=1)['success'] is False
+    assert runner.run(1000, trials=10, distribution_params={'min_size': 300, 'max_size': 50})['success'] is False
+    assert runner.run(1000, trials=MAX_TRIALS + 1)['success'] is False
+    assert runner.run(1000, trials=0)['success'] is False
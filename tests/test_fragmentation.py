@@ -0,0 +1,37 @@
+import random
+
+from modules.fragmentation import FragmentationTracker
+
+def test_histogram_and_index_match_the_hole_list():
+    rng = random.Random(0)
+    tracker = FragmentationTracker(1000)
+    holes = []
+    for step in range(500):
+        if holes and rng.random() < 0.5:
+            size = holes.pop(rng.randrange(len(holes)))
+            tracker.remove_hole(size)
+        else:
+            size = rng.randrange(0, 1000)
+            tracker.add_hole(size)
+            if size > 0:
+                holes.append(size)
+        tracker.record(step, True)
+
+        buckets = [0] * len(tracker.histogram)
+        for size in holes:
+            buckets[min(size.bit_length() - 1, len(buckets) - 1)] += 1
+        assert tracker.histogram == buckets
+        assert tracker.free_memory == sum(holes)
+        assert tracker.largest_free_block() == max(holes, default=0)
+        expected = 1 - max(holes) / sum(holes) if holes else 0
+        assert tracker.timeline['fragmentation_index'][-1] == round(expected, 4)
+
+def test_histogram_buckets_cover_every_hole_size():
+    tracker = FragmentationTracker(1000)
+    bounds = tracker.summary()['histogram_buckets']
+
+    assert bounds[0] == [1, 1]
+    assert bounds[-1][1] >= 1000
+    for size in (1, 2, 3, 511, 512, 1000):
+        tracker.add_hole(size)
+    assert tracker.histogram == [1, 2, 0, 0, 0, 0, 0, 0, 1, 2]
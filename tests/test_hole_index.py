@@ -0,0 +1,66 @@
+import random
+
+from modules.hole_index import HoleIndex
+from modules.paging_segmentation import PagingSegmentation
+
+def _holes(free):
+    """(start, size) runs of a set of free addresses"""
+    runs = []
+    for address in sorted(free):
+        if runs and runs[-1][0] + runs[-1][1] == address:
+            runs[-1][1] += 1
+        else:
+            runs.append([address, 1])
+    return [tuple(run) for run in runs]
+
+def _scan(holes, size, placement):
+    fits = [(hole_size, start) for start, hole_size in holes if hole_size >= size]
+    if not fits:
+        return None
+    if placement == 'first_fit':
+        return min(start for _, start in fits)
+    if placement == 'best_fit':
+        return min(fits)[1]
+    largest = max(hole_size for hole_size, _ in fits)
+    return min(start for hole_size, start in fits if hole_size == largest)
+
+def test_fits_and_coalescing_match_a_free_address_set():
+    rng = random.Random(0)
+    holes = HoleIndex(500)
+    free = set(range(500))
+    taken = []
+    for _ in range(400):
+        if taken and rng.random() < 0.4:
+            start, size = taken.pop(rng.randrange(len(taken)))
+            holes.release(start, size)
+            free.update(range(start, start + size))
+        else:
+            size = rng.randrange(1, 40)
+            placement = rng.choice(['first_fit', 'best_fit', 'worst_fit'])
+            start = holes.find(size, placement)
+            assert start == _scan(_holes(free), size, placement)
+            if start is not None:
+                holes.take(start, size)
+                free.difference_update(range(start, start + size))
+                taken.append((start, size))
+        # Released neighbours are merged, so the holes are exactly the free runs
+        assert sorted((start, size) for size, start in holes.by_size) == _holes(free)
+        assert holes.free_memory == len(free)
+
+def test_take_at_only_claims_a_free_range():
+    holes = HoleIndex(100)
+    holes.take(0, 30)
+
+    assert holes.take_at(20, 20) is False
+    assert holes.take_at(40, 20) is True
+    assert sorted(holes.by_size) == [(10, 30), (40, 60)]
+
+def test_segment_without_a_size_is_an_error_entry():
+    result = PagingSegmentation().simulate_segmentation(
+        1000, [{'size': 100}, {'name': 'heap'}],
+        operations=[{'op': 'allocate'}, {'op': 'grow', 'segment': 0}, {'op': 'grow', 'segment': 0, 'size': 2.5}]
+    )
+
+    assert result['segment_table'][1]['error'] == 'Segment size is required'
+    assert [operation['success'] for operation in result['operations']] == [False, False, False]
+    assert result['segment_table'][0]['limit'] == 100
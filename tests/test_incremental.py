@@ -0,0 +1,70 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.page_replacement import PageReplacementSimulator
+from modules.virtual_memory import VirtualMemorySimulator
+from modules.vm_engine import VirtualMemoryEngine
+
+def _pattern(count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.randrange(1 << 16), rng.choice(['read', 'write'])) for _ in range(count)]
+
+def _engine():
+    return VirtualMemoryEngine(1 << 16, 1 << 12, 256, 'lru', working_set_config={'window': 20, 'interval': 50})
+
+def test_resumed_working_set_report_matches_single_run():
+    pattern = _pattern(1000)
+    whole = _engine()
+    for address, access_type in pattern:
+        whole.access(address, access_type)
+
+    resumed = _engine()
+    # Split off an interval boundary and report in between, as simulate + append do
+    for address, access_type in pattern[:333]:
+        resumed.access(address, access_type)
+    resumed.result()
+    for address, access_type in pattern[333:]:
+        resumed.access(address, access_type)
+
+    assert resumed.result()['working_set'] == whole.result()['working_set']
+
+def test_append_reports_working_set():
+    simulator = VirtualMemorySimulator()
+    pattern = [{'address': address, 'type': access_type} for address, access_type in _pattern(600)]
+    config = (1 << 16, 1 << 12, 256)
+    whole = simulator.simulate(*config, pattern, working_set_config={'window': 20, 'interval': 50})
+    first = simulator.simulate(*config, pattern[:250], working_set_config={'window': 20, 'interval': 50},
+                               resumable=True)
+    appended = simulator.append(first['session_id'], pattern[250:])
+
+    assert appended['working_set'] == whole['working_set']
+
+def test_sessions_keep_only_the_page_table_by_default():
+    simulator = VirtualMemorySimulator()
+    result = simulator.simulate(1 << 16, 1 << 12, 256, [{'address': 300}])
+
+    assert simulator.translate_session(result['session_id'], 300)['frame_number'] == 0
+    assert simulator.append(result['session_id'], [{'address': 0}])['resumable'] is False
+    assert simulator.checkpoint(result['session_id'])['success'] is False
+
+def test_concurrent_appends_are_serialised():
+    simulator = PageReplacementSimulator()
+    rng = random.Random(1)
+    chunks = [[rng.randrange(20) for _ in range(200)] for _ in range(16)]
+    session_id = simulator.simulate('lru', [], 4)['session_id']
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda chunk: simulator.append(session_id, chunk), chunks))
+
+    # Every append saw a consistent run: starts are disjoint and cover the total
+    starts = sorted(result['start_index'] for result in results)
+    assert starts == [200 * i for i in range(16)]
+    assert max(result['total_references'] for result in results) == 3200
+
+def test_lfu_steps_snapshot_on_simulate_and_delta_on_append():
+    simulator = PageReplacementSimulator()
+    result = simulator.simulate('lfu', [1, 2, 1], 2)
+    assert [step['frequency'] for step in result['page_sequence']] == [{1: 1}, {1: 1, 2: 1}, {1: 2, 2: 1}]
+
+    appended = simulator.append(result['session_id'], [3, 1])
+    assert [step['frequency'] for step in appended['page_sequence']] == [{3: 1}, {1: 3}]
+    assert appended['frequency'] == {1: 3, 2: 1, 3: 1}
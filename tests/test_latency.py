@@ -0,0 +1,43 @@
+import math
+import random
+
+from modules.latency import Cost, LatencyHistogram, check_cost
+
+def test_percentiles_are_within_a_bucket_of_the_exact_ones():
+    rng = random.Random(0)
+    values = [int(rng.lognormvariate(6, 2)) for _ in range(5000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    for p in (50, 95, 99, 99.9):
+        exact = ordered[max(math.ceil(p / 100 * len(values)), 1) - 1]
+        reported = histogram.percentile(p)
+        assert exact <= reported <= max(exact * 17 / 16, exact + 1)
+
+def test_small_values_get_exact_buckets():
+    histogram = LatencyHistogram()
+    for value in (3, 3, 7, 31):
+        histogram.record(value)
+
+    assert histogram.percentile(50) == 3
+    assert histogram.percentile(100) == 31
+    assert histogram.report()['buckets'] == [
+        {'lower': 3, 'upper': 3, 'count': 2}, {'lower': 7, 'upper': 7, 'count': 1}, {'lower': 31, 'upper': 31, 'count': 1}
+    ]
+
+def test_cost_specs_need_their_parameters():
+    assert check_cost(100) is None
+    assert check_cost({'distribution': 'normal', 'mean': 100, 'stddev': 10}) is None
+    assert check_cost({'distribution': 'uniform'}) is not None
+    assert check_cost({'distribution': 'uniform', 'low': 10, 'high': 1}) is not None
+    assert check_cost({'distribution': 'lognormal', 'mu': 1, 'sigma': -1}) is not None
+    assert check_cost({'distribution': 'gamma'}) is not None
+    assert check_cost('100') is not None
+
+def test_uniform_cost_mean_and_range():
+    cost = Cost({'distribution': 'uniform', 'low': 10, 'high': 30}, random.Random(1))
+
+    assert cost.mean == 20
+    assert all(10 <= cost.sample() <= 30 for _ in range(100))
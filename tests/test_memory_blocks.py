@@ -0,0 +1,54 @@
+import random
+
+from modules.continuous_allocation import ContinuousMemoryAllocator
+from modules.memory_blocks import MemoryBlockStore
+
+def _reference_first_fit(memory_size, sizes):
+    """Variable partitioning over a plain list of [start, size, owner] blocks"""
+    blocks = [[0, memory_size, None]]
+    for pid, size in enumerate(sizes):
+        for i, (start, block_size, owner) in enumerate(blocks):
+            if owner is None and block_size >= size:
+                blocks[i] = [start, size, pid]
+                if block_size > size:
+                    blocks.insert(i + 1, [start + size, block_size - size, None])
+                break
+    return blocks
+
+def test_allocate_splits_blocks_like_a_block_list():
+    rng = random.Random(0)
+    sizes = [rng.randrange(1, 120) for _ in range(40)]
+    store = MemoryBlockStore(1000)
+    for pid, size in enumerate(sizes):
+        index = next(
+            (i for i in range(len(store)) if store.is_free(i) and store.sizes[i] >= size), None
+        )
+        if index is not None:
+            store.allocate(index, size, pid)
+
+    blocks = [[store.starts[i], store.sizes[i], store.owner(i)] for i in range(len(store))]
+    assert blocks == _reference_first_fit(1000, sizes)
+    assert store.free_size() == sum(size for _, size, owner in blocks if owner is None)
+
+def test_carve_drops_emptied_holes():
+    store = MemoryBlockStore(100)
+    store.carve(0, 40)
+    assert (store.starts[0], store.sizes[0]) == (40, 60)
+    store.carve(0, 60)
+    assert len(store) == 0
+
+def test_fractional_process_sizes_agree_between_simulate_and_compare():
+    allocator = ContinuousMemoryAllocator()
+    processes = [{'id': 'P1', 'size': 212.5}, {'id': 'P2', 'size': 700}, {'id': 'P3', 'size': 86.5}]
+
+    single = allocator.simulate(1000, processes, 'variable', 'first_fit')
+    compared = allocator.compare_all(1000, processes, 'variable')
+
+    assert [process['size'] for process in single['allocated']] == [213, 700, 87]
+    assert single['external_fragmentation'] == compared['first_fit']['external_fragmentation']
+
+def test_non_numeric_process_size_is_an_error_entry():
+    allocator = ContinuousMemoryAllocator()
+
+    assert allocator.simulate(1000, [{'id': 1, 'size': '10'}], 'variable', 'first_fit')['success'] is False
+    assert allocator.compare_all(1000, [{'id': 1}], 'variable')['success'] is False
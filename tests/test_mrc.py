@@ -0,0 +1,46 @@
+import random
+
+import numpy as np
+
+from modules.mrc import ShardsEstimator, StackDistanceCounter, exact_mrc
+from modules.page_replacement import PageReplacementSimulator
+
+def _trace(length, pages, seed=0):
+    rng = random.Random(seed)
+    hot = list(range(pages // 10))
+    return [rng.choice(hot) if rng.random() < 0.7 else rng.randrange(pages) for _ in range(length)]
+
+def test_stack_distances_match_an_explicit_lru_stack():
+    counter = StackDistanceCounter(capacity=16)  # small, so compaction runs often
+    stack = []
+    for page in _trace(3000, 200):
+        expected = stack.index(page) if page in stack else None
+        if expected is not None:
+            stack.remove(page)
+        stack.insert(0, page)
+        assert counter.reference(page) == expected
+
+def test_exact_curve_matches_lru_simulation():
+    trace = _trace(2000, 120, seed=1)
+    sizes = [1, 2, 5, 13, 40, 100, 200]
+    curve = exact_mrc([trace], sizes).curve()
+    simulator = PageReplacementSimulator()
+    for point in curve:
+        faults = simulator.simulate('lru', trace, point['cache_size'], keep_session=False)['page_faults']
+        assert point['miss_ratio'] == round(faults / len(trace), 6)
+
+def test_full_rate_sample_is_exact():
+    trace = np.array(_trace(5000, 500, seed=2))
+    estimator = ShardsEstimator([1, 10, 100], rate=1)
+    estimator.feed(trace)
+
+    exact = exact_mrc([trace], [1, 10, 100]).curve()
+    assert [point['miss_ratio'] for point in estimator.curve()] == [point['miss_ratio'] for point in exact]
+    assert all(point['error_bound'] == 0 for point in estimator.curve())
+
+def test_fixed_size_sample_stays_bounded():
+    estimator = ShardsEstimator(sample_size=64)
+    estimator.feed(np.arange(100000) % 20000)
+
+    assert len(estimator.counter.last) <= 64
+    assert estimator.rate < 64 / 20000 * 2
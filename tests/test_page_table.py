@@ -0,0 +1,43 @@
+import random
+
+from modules.page_table import RangePageTable
+
+def test_range_table_matches_per_page_mapping():
+    rng = random.Random(0)
+    table = RangePageTable(0, 256)
+    reference = []
+    next_frame = 0
+    for _ in range(50):
+        count = rng.randrange(1, 40)
+        if rng.random() < 0.6:
+            table.map_range(count, next_frame)
+            reference += range(next_frame, next_frame + count)
+            next_frame += count + rng.randrange(0, 5)
+        else:
+            table.map_range(count)
+            reference += [None] * count
+    table.num_pages = len(reference)
+
+    assert [table.frame_of(page) for page in range(len(reference))] == reference
+    assert table.frame_of(-1) is None and table.frame_of(len(reference)) is None
+    assert table.frames_used() == sum(frame is not None for frame in reference)
+    assert sum(run['page_count'] for run in table.ranges()) == len(reference)
+
+def test_single_page_process():
+    table = RangePageTable(1, 4096)
+    table.map_range(1, 7)
+
+    assert table.entries()[0] == {
+        'page_number': 0, 'frame_number': 7, 'valid': True, 'page_address': 0, 'physical_address': 7 * 4096
+    }
+    assert table.ranges() == [{'first_page': 0, 'page_count': 1, 'first_frame': 7, 'valid': True}]
+
+def test_entries_are_built_lazily_for_huge_tables():
+    table = RangePageTable(1 << 30, 4096)
+    table.map_range(1 << 18, 0)
+    table.map_range((1 << 30) - (1 << 18))
+
+    entries = table.entries()
+    assert len(entries) == 1 << 30
+    assert entries[(1 << 18) - 1]['frame_number'] == (1 << 18) - 1
+    assert entries[1 << 18]['valid'] is False
@@ -0,0 +1,30 @@
+import random
+
+from modules.page_table_models import PageTableModel, count_aligned_blocks
+
+def test_count_aligned_blocks_matches_enumeration():
+    rng = random.Random(0)
+    for _ in range(200):
+        starts = sorted(rng.sample(range(0, 1 << 14), 5))
+        regions = [(start, rng.randrange(1, 3000)) for start in starts]
+        span = 1 << rng.randrange(4, 12)
+        touched = {address // span for start, size in regions for address in range(start, start + size)}
+        assert count_aligned_blocks(regions, span) == len(touched)
+
+def test_single_level_table_for_a_process_within_one_page():
+    result = PageTableModel().analyze('single', 256, [{'start': 0, 'size': 200}], 4096)
+
+    assert 'error' not in result
+    assert result['virtual_address_bits'] == 9
+
+def test_default_address_space_covers_a_large_multi_level_process():
+    result = PageTableModel().analyze('two_level', 4096, [{'start': 0, 'size': 3 << 30}], 1 << 30)
+
+    assert 'error' not in result
+    assert result['virtual_address_bits'] == 32
+    assert result['levels'][1]['tables'] == (3 << 30) // (4096 * 512)
+
+def test_explicit_address_space_still_bounds_regions():
+    result = PageTableModel().analyze('two_level', 4096, [{'start': 0, 'size': 3 << 30}], 1 << 30, 30)
+
+    assert result['success'] is False
@@ -0,0 +1,50 @@
+import random
+
+from modules.continuous_allocation import ContinuousMemoryAllocator
+from modules.partition_index import FreePartitionIndex
+
+def _scan(free, size, pick):
+    fits = [(partition_size, i) for i, partition_size in free.items() if partition_size >= size]
+    if not fits:
+        return None
+    if pick == 'first':
+        return min(i for _, i in fits)
+    if pick == 'best':
+        return min(fits)[1]
+    largest = max(partition_size for partition_size, _ in fits)
+    return min(i for partition_size, i in fits if partition_size == largest)
+
+def test_fits_match_a_linear_scan():
+    rng = random.Random(0)
+    sizes = [rng.randrange(1, 64) for _ in range(37)]
+    index = FreePartitionIndex(sizes)
+    free = dict(enumerate(sizes))
+    for _ in range(300):
+        size = rng.randrange(1, 70)
+        assert index.first_fit(size) == _scan(free, size, 'first')
+        assert index.best_fit(size) == _scan(free, size, 'best')
+        assert index.worst_fit(size) == _scan(free, size, 'worst')
+        chosen = _scan(free, size, rng.choice(['first', 'best', 'worst']))
+        if chosen is not None:
+            index.remove(chosen, free.pop(chosen))
+        taken = [i for i in range(len(sizes)) if i not in free]
+        if taken and (rng.random() < 0.2 or len(free) < len(sizes) // 2):
+            released = rng.choice(taken)
+            free[released] = sizes[released]
+            index.add(released, sizes[released])
+
+def test_first_fit_with_every_partition_taken():
+    index = FreePartitionIndex([50, 50])
+    index.remove(0, 50)
+    index.remove(1, 50)
+
+    assert index.first_fit(0) is None
+    assert index.first_fit(10) is None
+
+def test_non_positive_sizes_are_rejected():
+    allocator = ContinuousMemoryAllocator()
+    processes = [{'id': 1, 'size': 50}, {'id': 2, 'size': 50}, {'id': 3, 'size': 0}]
+
+    assert allocator.simulate(100, processes, 'fixed', 'first_fit', [50, 50])['success'] is False
+    assert allocator.simulate(100, processes[:1], 'fixed', 'first_fit', [50, 0, 50])['success'] is False
+    assert allocator.compare_all(100, processes[:1], 'fixed', [-5, 50])['success'] is False
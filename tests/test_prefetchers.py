@@ -0,0 +1,53 @@
+import random
+from collections import Counter
+
+from modules.prefetchers import MarkovPrefetcher, SequentialPrefetcher, StridePrefetcher, make_prefetcher
+
+def test_sequential_run_reads_ahead_each_page_once():
+    prefetcher = SequentialPrefetcher(initial_window=2, max_window=8)
+    requested = []
+    for page in range(100, 160):
+        requested.extend(prefetcher.predict(page, page == 100))
+
+    assert len(requested) == len(set(requested))
+    # Page 101 is the demand access that starts the run
+    assert requested == list(range(102, 102 + len(requested)))
+    assert len(requested) <= 60 + 8
+    assert prefetcher.window == 8
+
+def test_stride_matches_a_history_scan():
+    rng = random.Random(0)
+    pages = []
+    for _ in range(60):
+        stride, start = rng.choice([-3, 1, 4]), rng.randrange(1000)
+        pages.extend(start + stride * k for k in range(rng.randrange(1, 8)))
+
+    prefetcher = StridePrefetcher(degree=2, threshold=2)
+    for i, page in enumerate(pages):
+        # Confidence counts the repeats of the latest non-zero stride
+        strides = [b - a for a, b in zip(pages[:i], pages[1:i + 1]) if b != a]
+        repeats = 0
+        while repeats + 1 < len(strides) and strides[-2 - repeats] == strides[-1]:
+            repeats += 1
+        expected = [page + strides[-1] * k for k in (1, 2)] if strides and pages[i - 1] != page and repeats >= 2 else []
+        assert list(prefetcher.predict(page, False)) == expected
+
+def test_markov_predicts_the_most_frequent_successor():
+    rng = random.Random(0)
+    pages = [rng.randrange(8) for _ in range(2000)]
+    prefetcher = MarkovPrefetcher(degree=1, width=8)
+    successors = {}
+    for previous, page in zip([None] + pages, pages):
+        if previous is not None and previous != page:
+            successors.setdefault(previous, Counter())[page] += 1
+        predicted = list(prefetcher.predict(page, False))
+        counts = successors.get(page)
+        if not counts:
+            assert predicted == []
+        else:
+            assert counts[predicted[0]] == max(counts.values())
+
+def test_read_ahead_window_is_capped_at_half_the_frames():
+    prefetcher = make_prefetcher({'type': 'sequential', 'initialWindow': 16, 'maxWindow': 64}, 8)
+
+    assert (prefetcher.initial_window, prefetcher.max_window) == (4, 4)
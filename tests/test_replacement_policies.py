@@ -0,0 +1,28 @@
+from modules.replacement_policies import WSClockPolicy
+from modules.vm_engine import VirtualMemoryEngine, new_page_entry
+
+def test_wsclock_schedules_write_back_of_old_dirty_page():
+    written = []
+    policy = WSClockPolicy(2, window=1, on_writeback=lambda page, entry: written.append(page))
+    page_table = {page: new_page_entry(page) for page in (0, 1)}
+
+    policy.on_load(0, page_table[0])
+    page_table[0]['dirty'] = True
+    for _ in range(3):
+        policy.on_access(0, page_table[0])
+    policy.on_load(1, page_table[1])
+    policy.on_access(1, page_table[1])
+
+    # Page 0 is old but dirty: cleaned on the first lap, evicted on the next
+    # rather than giving way to the young page 1
+    assert policy.select_victim(page_table) == 0
+    assert written == [0]
+    assert not page_table[0]['dirty']
+
+def test_wsclock_write_backs_count_as_disk_writes():
+    engine = VirtualMemoryEngine(1 << 12, 512, 256, 'wsclock', working_set_config={'window': 1})
+    for address, access_type in [(0, 'write'), (0, 'read'), (0, 'read'), (0, 'read'), (256, 'read'), (512, 'read')]:
+        engine.access(address, access_type)
+
+    assert engine.disk_writes == 1
+    assert engine.page_table[0]['valid'] is False
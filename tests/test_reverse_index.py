@@ -0,0 +1,41 @@
+import random
+
+from modules.paging_segmentation import PagingSegmentation
+from modules.reverse_index import ReverseMapIndex
+
+def test_lookups_match_a_scan_of_the_segment_table():
+    rng = random.Random(0)
+    segments = [{'name': f'S{i}', 'size': rng.randrange(1, 400)} for i in range(30)]
+    table = PagingSegmentation().simulate_segmentation(4096, segments)['segment_table']
+    index = ReverseMapIndex.from_segment_table(table)
+
+    addresses = list(range(0, 4200, 7))
+    batch = index.lookup_batch(addresses)
+    for position, address in enumerate(addresses):
+        owner = next(
+            (s for s in table if s['allocated'] and s['base_address'] <= address < s['end_address']), None
+        )
+        single = index.lookup(address)
+        assert single['found'] == (owner is not None) == bool(batch['found'][position])
+        if owner:
+            assert single['segment_number'] == owner['segment_number'] == batch['segment_numbers'][position]
+            assert single['offset'] == address - owner['base_address']
+
+def test_page_lookup_inverts_the_page_table():
+    simulator = PagingSegmentation()
+    result = simulator.simulate_paging(4096, 3000, 256)
+    index = ReverseMapIndex.from_page_ranges(result['page_table_ranges'], 256)
+
+    for entry in result['page_table']:
+        if entry['valid']:
+            found = index.lookup(entry['physical_address'] + 5)
+            assert (found['page_number'], found['offset']) == (entry['page_number'], 5)
+
+def test_stored_index_is_reused_by_session():
+    simulator = PagingSegmentation()
+    index = ReverseMapIndex.from_page_ranges(simulator.simulate_paging(4096, 1024, 256)['page_table_ranges'], 256)
+    session_id = simulator.store_reverse_index(index)
+
+    assert simulator.reverse_lookup(session_id, 300)['page_number'] == 1
+    assert simulator.reverse_lookup(session_id, physical_addresses=[0, 9999])['found_count'] == 1
+    assert simulator.reverse_lookup('unknown', 0)['success'] is False
@@ -0,0 +1,42 @@
+import random
+
+from modules.paging_segmentation import PagingSegmentation
+from modules.tlb import TLB
+from modules.virtual_memory import VirtualMemorySimulator
+
+def test_lru_sets_match_a_per_set_recency_list():
+    rng = random.Random(0)
+    tlb = TLB(entries=16, associativity=4)
+    reference = [[] for _ in range(tlb.num_sets)]
+    for _ in range(2000):
+        page, asid = rng.randrange(40), rng.randrange(2)
+        recency = reference[page % tlb.num_sets]
+        key = (page, asid)
+        frame = tlb.lookup(page, asid)
+        if key in recency:
+            assert frame == page * 10 + asid
+            recency.remove(key)
+        else:
+            assert frame is None
+            tlb.insert(page, page * 10 + asid, asid)
+            if len(recency) == 4:
+                recency.pop(0)
+        recency.append(key)
+        assert [[(e[0], e[1]) for e in tlb_set] for tlb_set in tlb.sets] == reference
+
+def test_invalidate_drops_the_page_in_every_address_space():
+    tlb = TLB(entries=8, associativity=2)
+    tlb.insert(3, 30, asid=0)
+    tlb.insert(3, 31, asid=1)
+    tlb.invalidate(3)
+
+    assert tlb.lookup(3, 0) is None
+    assert tlb.lookup(3, 1) is None
+
+def test_unknown_tlb_replacement_is_an_error_entry():
+    paging = PagingSegmentation()
+    ranges = [{'page_count': 4, 'first_frame': 0, 'valid': True}]
+
+    assert paging.simulate_tlb([0, 256], 256, ranges, {'replacement': 'fifo'})['success'] is False
+    result = VirtualMemorySimulator().simulate(4096, 1024, 256, [{'address': 0}], {'replacement': 'mru'})
+    assert result['error'] == 'Unknown TLB replacement: mru'
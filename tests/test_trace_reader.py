@@ -0,0 +1,20 @@
+from modules.session_store import unknown_session
+from modules.trace_reader import RECORD_FETCH, RECORD_READ, RECORD_WRITE, replay_trace, write_binary
+from modules.virtual_memory import VirtualMemorySimulator
+
+def test_replay_skips_instructions_and_stops_after_max_accesses(tmp_path):
+    path = tmp_path / 'trace.bin'
+    types = [RECORD_READ, RECORD_WRITE, RECORD_FETCH] * 10
+    write_binary(path, list(range(0, 30 * 64, 64)), types)
+
+    accesses = []
+    replay_trace(lambda address, access_type: accesses.append((address, access_type)), path, 'binary',
+                 include_instructions=False, max_accesses=7)
+    assert accesses == [(address, 'write' if i % 3 == 1 else 'read')
+                        for i, address in enumerate(range(0, 30 * 64, 64)) if i % 3 != 2][:7]
+
+def test_unknown_session_entries_share_one_shape():
+    simulator = VirtualMemorySimulator()
+
+    assert simulator.append('missing', []) == unknown_session('missing')
+    assert simulator.translate_session('missing', 42) == unknown_session('missing', logical_address=42)
@@ -3,15 +3,17 @@ import random
 class HelperFunctions:
     
     @staticmethod
-    def generate_sample_processes(count=5, min_size=50, max_size=300):
+    def generate_sample_processes(count=5, min_size=50, max_size=300, seed=None):
         """
         Generate sample processes for continuous memory allocation
+        (reproducible when a seed is given)
         """
+        rng = random.Random(seed) if seed is not None else random
         processes = []
         for i in range(count):
             processes.append({
                 'id': f'P{i+1}',
-                'size': random.randint(min_size, max_size)
+                'size': rng.randint(min_size, max_size)
             })
         return processes
     